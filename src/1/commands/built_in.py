@@ -5,8 +5,8 @@ def execute_built_in(parts):
     args = parts[1:]
 
     if cmd == "cd":
-        change_directory(args)
-    if cmd == "pwd":
+        return change_directory(args)
+    elif cmd == "pwd":
         print("Expected working directory:", os.getcwd())
     elif cmd == "echo":
         print(" ".join(args))
@@ -14,12 +14,16 @@ def execute_built_in(parts):
         os.system("clear")  # Use "cls" on Windows
     else:
         print(f"{cmd}: Command not recognized.")
+        return 1
+    return 0
 
 def change_directory(args):
     if not args:
         print("cd: missing argument")
-    else:
-        try:
-            os.chdir(args[0])
-        except FileNotFoundError:
-            print(f"cd: no such directory: {args[0]}")
+        return 1
+    try:
+        os.chdir(args[0])
+    except FileNotFoundError:
+        print(f"cd: no such directory: {args[0]}")
+        return 1
+    return 0
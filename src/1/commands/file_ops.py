@@ -1,73 +1,513 @@
 import os
+import sys
+import stat
+import time
+import glob
+import errno
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 def execute_file_command(parts):
     cmd = parts[0]
-    args = parts[1:]
+    args = expand_globs(parts[1:])
 
     if cmd == "ls":
-        list_files()
+        return list_files(args)
     elif cmd == "cat":
-        display_file(args)
+        return display_file(args)
     elif cmd == "mkdir":
-        create_directory(args)
+        return create_directory(args)
     elif cmd == "rmdir":
-        remove_directory(args)
+        return remove_directory(args)
     elif cmd == "rm":
-        remove_file(args)
+        return remove_file(args)
     elif cmd == "touch":
-        touch_file(args)
+        return touch_file(args)
+    elif cmd == "cp":
+        return copy_files(args)
     else:
         print(f"{cmd}: Command not recognized.")
+        return 1
 
-def list_files():
-    for item in os.listdir():
-        print(item)
+CHUNK_SIZE = 1 << 20   # Bytes per sendfile()/read() call in cat.
+LS_BATCH = 4096        # ls lines written per stdout call.
+WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Threads for bulk rm/cp/touch; the work is mostly syscalls.
+PARALLEL_THRESHOLD = 64  # Fewer paths than this are handled inline.
+BATCH_SIZE = 256         # Paths handed to a worker at a time.
+
+# --------------------------------------------
+# ls
+# --------------------------------------------
+LS_SORT_KEYS = {
+    "name": lambda entry, st: entry.name,
+    "size": lambda entry, st: (-st.st_size, entry.name),
+    "time": lambda entry, st: (-st.st_mtime, entry.name),
+}
+
+def _parse_ls_options(args):
+    options = {"long": False, "recursive": False, "sort": "name", "reverse": False}
+    paths = []
+    for arg in args:
+        if not arg.startswith("-") or arg == "-":
+            paths.append(arg)
+            continue
+        for flag in arg[1:]:
+            if flag == "l":
+                options["long"] = True
+            elif flag == "R":
+                options["recursive"] = True
+            elif flag == "S":
+                options["sort"] = "size"
+            elif flag == "t":
+                options["sort"] = "time"
+            elif flag == "U":
+                options["sort"] = None
+            elif flag == "r":
+                options["reverse"] = True
+            else:
+                raise ValueError(f"invalid option -- '{flag}'")
+    return options, paths or ["."]
+
+def _long_line(name, st):
+    mtime = time.strftime("%b %d %H:%M", time.localtime(st.st_mtime))
+    return f"{stat.filemode(st.st_mode)} {st.st_nlink:>3} {st.st_size:>10} {mtime} {name}"
+
+def _write_lines(lines):
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.write("\n")
+
+def _list_directory(path, options):
+    """List one directory; returns the subdirectories to visit for -R."""
+    long_format = options["long"]
+    sort = options["sort"]
+    subdirs = []
+    with os.scandir(path) as entries:
+        if sort is None and not options["recursive"] and not long_format:
+            # -U: print in directory order as entries arrive, without holding them all.
+            batch = []
+            for entry in entries:
+                batch.append(entry.name)
+                if len(batch) >= LS_BATCH:
+                    _write_lines(batch)
+                    batch = []
+            if batch:
+                _write_lines(batch)
+            return subdirs
+        rows = []
+        for entry in entries:
+            # DirEntry caches its stat() result, so sorting and -l share one syscall per entry.
+            st = entry.stat(follow_symlinks=False) if long_format or sort in ("size", "time") else None
+            rows.append((entry, st))
+    if sort is not None:
+        rows.sort(key=lambda row: LS_SORT_KEYS[sort](*row), reverse=options["reverse"])
+    elif options["reverse"]:
+        rows.reverse()
+    lines = []
+    for entry, st in rows:
+        lines.append(_long_line(entry.name, st) if long_format else entry.name)
+        if len(lines) >= LS_BATCH:
+            _write_lines(lines)
+            lines = []
+        if options["recursive"] and entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+    if lines:
+        _write_lines(lines)
+    return subdirs
+
+def list_files(args=()):
+    """ls [-l] [-R] [-S | -t | -U] [-r] [path ...]"""
+    try:
+        options, paths = _parse_ls_options(args)
+    except ValueError as e:
+        print(f"ls: {e}")
+        return 2
+    status = 0
+    # Paths are visited depth first, in listing order, like ls -R.
+    pending = list(reversed(paths))
+    show_headers = len(paths) > 1 or options["recursive"]
+    first = True
+    while pending:
+        path = pending.pop()
+        try:
+            if not os.path.isdir(path):
+                st = os.lstat(path)
+                print(_long_line(path, st) if options["long"] else path)
+                continue
+            if show_headers:
+                if not first:
+                    print()
+                print(f"{path}:")
+            first = False
+            subdirs = _list_directory(path, options)
+        except OSError as e:
+            print(f"ls: {path}: {e.strerror}")
+            status = 2
+            continue
+        pending.extend(reversed(subdirs))
+    sys.stdout.flush()
+    return status
+
+# --------------------------------------------
+# cat
+# --------------------------------------------
+def _stdout_fd():
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None  # stdout was replaced by an object without a file descriptor.
+
+def _copy_to_stdout(fd):
+    """Stream an open file to stdout in the kernel when possible, else in chunks."""
+    out_fd = _stdout_fd()
+    if out_fd is not None and hasattr(os, "sendfile"):
+        sys.stdout.flush()
+        offset = 0
+        try:
+            while True:
+                sent = os.sendfile(out_fd, fd, offset, CHUNK_SIZE)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError as e:
+            # sendfile() refuses some pairs of files up front (EINVAL, or ESPIPE for a
+            # pipe or FIFO source); copy the rest by hand. Only a seekable source can have
+            # been partly sent, so only then does the read position need to catch up.
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ESPIPE):
+                raise
+            if offset > 0:
+                os.lseek(fd, offset, os.SEEK_SET)
+    while True:
+        data = os.read(fd, CHUNK_SIZE)
+        if not data:
+            return
+        if out_fd is not None:
+            sys.stdout.buffer.write(data)
+        else:
+            sys.stdout.write(data.decode(errors="replace"))
 
 def display_file(args):
+    """cat file ...: copy each file to stdout byte for byte, in constant memory."""
     if not args:
         print("cat: missing filename")
-    else:
+        return 1
+    status = 0
+    for name in args:
+        try:
+            fd = os.open(name, os.O_RDONLY)
+        except FileNotFoundError:
+            print(f"cat: {name}: No such file or directory")
+            status = 1
+            continue
+        except OSError as e:
+            print(f"cat: {name}: {e.strerror}")
+            status = 1
+            continue
+        try:
+            _copy_to_stdout(fd)
+        except IsADirectoryError:
+            print(f"cat: {name}: Is a directory")
+            status = 1
+        finally:
+            os.close(fd)
+    sys.stdout.flush()
+    return status
+
+# --------------------------------------------
+# Bulk and recursive operations
+# --------------------------------------------
+def expand_globs(args):
+    """Expand *, ? and [...] in arguments like a shell; a pattern with no match is kept as typed.
+
+    Arguments the user quoted or escaped (marked with `quoted` by the parser) are left alone.
+    """
+    expanded = []
+    for arg in args:
+        if not getattr(arg, "quoted", False) and not arg.startswith("-") and glob.has_magic(arg):
+            matches = sorted(glob.glob(arg))
+            expanded.extend(matches or [arg])
+        else:
+            expanded.append(arg)
+    return expanded
+
+def _split_flags(args, allowed):
+    """Separate single-letter flags (e.g. -rf) from operands; returns (flags, operands)."""
+    flags = set()
+    operands = []
+    for arg in args:
+        if arg.startswith("-") and len(arg) > 1 and not operands:
+            for flag in arg[1:]:
+                if flag not in allowed:
+                    raise ValueError(f"invalid option -- '{flag}'")
+                flags.add(flag)
+        else:
+            operands.append(arg)
+    return flags, operands
+
+def _run_parallel(func, items):
+    """Call func(item) for every item, on a thread pool when there are many; returns the error messages."""
+    errors = []
+    if len(items) < PARALLEL_THRESHOLD:
+        for item in items:
+            error = func(item)
+            if error:
+                errors.append(error)
+        return errors
+    batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+
+    def run_batch(batch):
+        return [error for error in map(func, batch) if error]
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        for batch_errors in pool.map(run_batch, batches):
+            errors.extend(batch_errors)
+    return errors
+
+def _walk(top):
+    """Return (directories top-down, other entries) under `top`, without following symlinks."""
+    directories = [top]
+    others = []
+    index = 0
+    while index < len(directories):
+        with os.scandir(directories[index]) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                else:
+                    others.append(entry.path)
+        index += 1
+    return directories, others
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return f"{path}: {e.strerror}"
+    return None
+
+def _remove_tree(path):
+    """Delete a directory tree: files in parallel, then directories deepest first."""
+    directories, others = _walk(path)
+    errors = _run_parallel(_unlink, others)
+    for directory in reversed(directories):
         try:
-            with open(args[0], 'r') as file:
-                print(file.read())
+            os.rmdir(directory)
         except FileNotFoundError:
-            print(f"cat: {args[0]}: No such file or directory")
+            pass
+        except OSError as e:
+            errors.append(f"{directory}: {e.strerror}")
+    return errors
+
+def _copy_data(src_fd, dst_fd, size):
+    """Copy `size` bytes in the kernel: copy_file_range, then sendfile, then plain reads."""
+    copied = 0
+    for name in ("copy_file_range", "sendfile"):
+        call = getattr(os, name, None)
+        if call is None:
+            continue
+        try:
+            while copied < size:
+                if name == "copy_file_range":
+                    sent = call(src_fd, dst_fd, min(CHUNK_SIZE, size - copied))
+                else:
+                    sent = call(dst_fd, src_fd, None, min(CHUNK_SIZE, size - copied))
+                if sent == 0:
+                    break
+                copied += sent
+            return
+        except OSError as e:
+            # Cross-filesystem or unsupported files fail before copying anything new; try the next call.
+            if e.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+    while True:
+        data = os.read(src_fd, CHUNK_SIZE)
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view):]
+
+def _copy_file(pair):
+    src, dst = pair
+    try:
+        st = os.lstat(src)
+        # Opening the destination truncates it, so a file copied onto itself must be caught first.
+        try:
+            dst_st = os.stat(dst) if not stat.S_ISLNK(st.st_mode) else os.lstat(dst)
+        except FileNotFoundError:
+            dst_st = None
+        if dst_st is not None and os.path.samestat(st if stat.S_ISLNK(st.st_mode) else os.stat(src), dst_st):
+            return f"'{src}' and '{dst}' are the same file"
+        if stat.S_ISLNK(st.st_mode):
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            os.symlink(os.readlink(src), dst)
+            return None
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IMODE(st.st_mode))
+            try:
+                _copy_data(src_fd, dst_fd, st.st_size)
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    except OSError as e:
+        return f"{src}: {e.strerror}"
+    return None
+
+def _copy_tree(src, dst):
+    """Copy a directory tree: create directories first, then copy files in parallel."""
+    directories, others = _walk(src)
+    errors = []
+    for directory in directories:
+        target = os.path.join(dst, os.path.relpath(directory, src))
+        try:
+            os.makedirs(target, exist_ok=True)
+            shutil.copymode(directory, target)
+        except OSError as e:
+            errors.append(f"{target}: {e.strerror}")
+    pairs = [(path, os.path.join(dst, os.path.relpath(path, src))) for path in others]
+    return errors + _run_parallel(_copy_file, pairs)
+
+def _report(command, errors):
+    for error in errors:
+        print(f"{command}: {error}")
+    return 1 if errors else 0
 
 def create_directory(args):
-    if not args:
+    """mkdir [-p] directory ..."""
+    try:
+        flags, names = _split_flags(args, "p")
+    except ValueError as e:
+        print(f"mkdir: {e}")
+        return 1
+    if not names:
         print("mkdir: missing directory name")
-    else:
+        return 1
+    status = 0
+    for name in names:
         try:
-            os.mkdir(args[0])
+            if "p" in flags:
+                os.makedirs(name, exist_ok=True)
+            else:
+                os.mkdir(name)
         except FileExistsError:
-            print(f"mkdir: {args[0]}: Directory already exists")
+            print(f"mkdir: {name}: Directory already exists")
+            status = 1
+        except OSError as e:
+            print(f"mkdir: {name}: {e.strerror}")
+            status = 1
+    return status
 
 def remove_directory(args):
     if not args:
         print("rmdir: missing directory name")
-    else:
+        return 1
+    status = 0
+    for name in args:
         try:
-            os.rmdir(args[0])
+            os.rmdir(name)
         except FileNotFoundError:
-            print(f"rmdir: {args[0]}: No such directory")
+            print(f"rmdir: {name}: No such directory")
+            status = 1
         except OSError:
-            print(f"rmdir: {args[0]}: Directory not empty")
+            print(f"rmdir: {name}: Directory not empty")
+            status = 1
+    return status
 
 def remove_file(args):
-    if not args:
+    """rm [-r] [-f] path ...; directory trees are deleted by a thread pool."""
+    try:
+        flags, names = _split_flags(args, "rRf")
+    except ValueError as e:
+        print(f"rm: {e}")
+        return 1
+    if not names:
+        if "f" in flags:
+            return 0
         print("rm: missing filename")
-    else:
+        return 1
+    recursive = "r" in flags or "R" in flags
+    errors = []
+    files = []
+    for name in names:
+        # Like GNU rm: never empty the current, parent or root directory.
+        if os.path.basename(name.rstrip(os.sep)) in (".", ".."):
+            errors.append(f"refusing to remove '.' or '..' directory: skipping '{name}'")
+            continue
+        if os.path.realpath(name) == os.sep:
+            errors.append(f"it is dangerous to operate recursively on '{name}'")
+            continue
+        if os.path.isdir(name) and not os.path.islink(name):
+            if not recursive:
+                errors.append(f"{name}: Is a directory")
+                continue
+            try:
+                errors.extend(_remove_tree(name))
+            except OSError as e:
+                errors.append(f"{name}: {e.strerror}")
+        elif not os.path.lexists(name):
+            if "f" not in flags:
+                errors.append(f"{name}: No such file")
+        else:
+            files.append(name)
+    errors.extend(_run_parallel(_unlink, files))
+    return _report("rm", errors)
+
+def _touch(name):
+    try:
+        fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_NONBLOCK, 0o666)
         try:
-            os.remove(args[0])
-        except FileNotFoundError:
-            print(f"rm: {args[0]}: No such file")
+            os.utime(fd)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        return f"{name}: {e.strerror}"
+    return None
 
 def touch_file(args):
+    """touch file ...: create missing files and update timestamps."""
     if not args:
         print("touch: missing filename")
-    else:
-        try:
-            with open(args[0], 'a'):
-                os.utime(args[0], None)
-        except Exception as e:
-            print(f"touch: {e}")
+        return 1
+    return _report("touch", _run_parallel(_touch, args))
+
+def copy_files(args):
+    """cp [-r] source ... destination"""
+    try:
+        flags, names = _split_flags(args, "rR")
+    except ValueError as e:
+        print(f"cp: {e}")
+        return 1
+    if len(names) < 2:
+        print("cp: missing destination file operand")
+        return 1
+    *sources, destination = names
+    into_directory = os.path.isdir(destination)
+    if len(sources) > 1 and not into_directory:
+        print(f"cp: target '{destination}' is not a directory")
+        return 1
+    recursive = "r" in flags or "R" in flags
+    errors = []
+    files = []
+    for source in sources:
+        target = os.path.join(destination, os.path.basename(source.rstrip(os.sep))) if into_directory else destination
+        if os.path.isdir(source) and not os.path.islink(source):
+            if not recursive:
+                errors.append(f"-r not specified; omitting directory '{source}'")
+                continue
+            if os.path.abspath(target).startswith(os.path.abspath(source) + os.sep):
+                errors.append(f"cannot copy a directory, '{source}', into itself")
+                continue
+            try:
+                errors.extend(_copy_tree(source, target))
+            except OSError as e:
+                errors.append(f"{source}: {e.strerror}")
+        elif not os.path.lexists(source):
+            errors.append(f"{source}: No such file or directory")
+        else:
+            files.append((source, target))
+    errors.extend(_run_parallel(_copy_file, files))
+    return _report("cp", errors)
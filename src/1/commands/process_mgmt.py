@@ -1,64 +1,337 @@
 import os
-import subprocess
+import sys
 import signal
+import itertools
+import subprocess
+
+from utils.error_handling import handle_invalid_command
+from utils.path_cache import path_cache
+
+RUNNING, STOPPED, DONE = "Running", "Stopped", "Done"
+
+
+class Job:
+    def __init__(self, job_id, process, command):
+        self.job_id = job_id
+        self.process = process      # subprocess.Popen; its pid is also the job's process group.
+        self.pid = process.pid
+        self.command = command
+        self.state = RUNNING
+        self.returncode = None
+        self.foreground = False     # The reaper leaves foreground jobs to their waiter.
+
+    def status(self):
+        if self.state != DONE:
+            return self.state
+        if self.returncode is None or self.returncode == 0:
+            return DONE
+        if self.returncode < 0:
+            return f"Terminated ({signal.Signals(-self.returncode).name})"
+        return f"Exit {self.returncode}"
+
+    def describe(self):
+        return f"[{self.job_id}] {self.pid} {self.status():<12} {self.command}"
+
+    @property
+    def exit_status(self):
+        """The shell's view of returncode: 128 + N for a job killed by signal N."""
+        if self.returncode is None:
+            return 0
+        return 128 - self.returncode if self.returncode < 0 else self.returncode
+
+
+background_jobs = {}             # job_id -> Job, in launch order
+_job_ids = itertools.count(1)    # Job IDs only grow, so they are never reused after fg/Done.
+_by_pid = {}                     # pid -> Job, for the reaper
 
-background_jobs = {}  # Dictionary to store background jobs with job_id as key
 
 def execute_process_command(parts):
+    """Run a job-control builtin or an external command; returns its exit status."""
     cmd = parts[0]
     args = parts[1:]
 
     if cmd == "kill":
-        kill_process(args)
+        return kill_process(args)
     elif cmd == "jobs":
-        list_jobs()
+        return list_jobs()
     elif cmd == "fg":
-        bring_to_foreground(args)
+        return bring_to_foreground(args)
     elif cmd == "bg":
-        resume_in_background(args)
-    elif "&" in " ".join(parts):
-        run_background_command(parts)
+        return resume_in_background(args)
+    elif is_background(parts):
+        return run_background_command(parts[:-1])
+    else:
+        return run_foreground_command(parts)
+
+# --------------------------------------------
+# Terminal and signal setup
+# --------------------------------------------
+def _interactive():
+    return sys.stdin.isatty()
+
+
+def init_job_control():
+    """Reap children on SIGCHLD and, on a terminal, keep the shell itself from being stopped."""
+    signal.signal(signal.SIGCHLD, _on_sigchld)
+    if _interactive():
+        for sig in (signal.SIGTSTP, signal.SIGTTOU, signal.SIGTTIN):
+            signal.signal(sig, signal.SIG_IGN)
+
+
+def _child_setup():
+    """Runs in the child before exec: own process group, default job-control signals."""
+    os.setpgid(0, 0)
+    for sig in (signal.SIGTSTP, signal.SIGTTOU, signal.SIGTTIN, signal.SIGINT, signal.SIGQUIT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+
+
+def _give_terminal(pgid):
+    if not _interactive():
+        return
+    handler = signal.signal(signal.SIGTTOU, signal.SIG_IGN)
+    try:
+        os.tcsetpgrp(sys.stdin.fileno(), pgid)
+    except OSError:
+        pass
+    finally:
+        signal.signal(signal.SIGTTOU, handler)
+
+# --------------------------------------------
+# Reaping
+# --------------------------------------------
+def _update(job, status):
+    if os.WIFSTOPPED(status):
+        job.state = STOPPED
+    elif os.WIFCONTINUED(status):
+        job.state = RUNNING
     else:
-        run_foreground_command(parts)
+        job.state = DONE
+        job.returncode = os.waitstatus_to_exitcode(status)
+        job.process.returncode = job.returncode
+        _by_pid.pop(job.pid, None)
+
+
+def _reap_pid(job):
+    try:
+        pid, status = os.waitpid(job.pid, os.WNOHANG | os.WUNTRACED | os.WCONTINUED)
+    except ChildProcessError:
+        return False
+    if pid:
+        _update(job, status)
+    return bool(pid)
+
+
+def reap_jobs():
+    """Collect every state change of background jobs without blocking."""
+    flags = os.WEXITED | os.WSTOPPED | os.WCONTINUED | os.WNOHANG | os.WNOWAIT
+    while _by_pid:
+        # Peek at the next changed child; reap it only if it is one of ours, so a
+        # foreground subprocess keeps its exit status for its own waiter.
+        try:
+            info = os.waitid(os.P_ALL, 0, flags)
+        except ChildProcessError:
+            return
+        if info is None:
+            return
+        job = _by_pid.get(info.si_pid)
+        if job is None or job.foreground or not _reap_pid(job):
+            break
+    # Something else is first in line; check our jobs one by one.
+    for job in list(_by_pid.values()):
+        if not job.foreground:
+            while _reap_pid(job) and job.state != DONE:
+                pass
+
+
+def _on_sigchld(signum, frame):
+    reap_jobs()
+
+
+def notify_finished():
+    """Report and forget finished jobs, as a shell does before each prompt."""
+    reap_jobs()
+    for job_id, job in list(background_jobs.items()):
+        if job.state == DONE:
+            print(job.describe())
+            del background_jobs[job_id]
+
+# --------------------------------------------
+# Launching
+# --------------------------------------------
+def _launch(parts):
+    # Resolve through the PATH cache; a stale entry (program removed) is retried once.
+    for _ in range(2):
+        executable = path_cache.lookup(parts[0])
+        if executable is None:
+            break
+        try:
+            return subprocess.Popen(parts, executable=executable, preexec_fn=_child_setup)
+        except FileNotFoundError:
+            path_cache.forget(parts[0])
+        except PermissionError:
+            print(f"{parts[0]}: permission denied")
+            return None
+    handle_invalid_command(parts[0])
+    return None
+
+
+def _add_job(process, parts):
+    job = Job(next(_job_ids), process, " ".join(parts))
+    background_jobs[job.job_id] = job
+    _by_pid[job.pid] = job
+    return job
+
+
+def is_background(parts):
+    """True if the command ends with an unquoted `&`, which the parser always emits as its own word."""
+    return parts[-1] == "&" and not getattr(parts[-1], "quoted", False)
+
 
 def run_background_command(parts):
+    if not parts:
+        print("syntax error near unexpected token '&'")
+        return 2
+    process = _launch(parts)
+    if process is None:
+        return 127
+    job = _add_job(process, parts)
+    print(f"[{job.job_id}] {job.pid}")
+    return 0
+
+
+def _wait_foreground(job):
+    """Wait for `job` while it owns the terminal; returns once it exits or stops."""
+    job.foreground = True
+    _give_terminal(job.pid)
     try:
-        process = subprocess.Popen(parts[:-1])
-        job_id = len(background_jobs) + 1
-        background_jobs[job_id] = process
-        print(f"[{job_id}] {process.pid}")
-    except FileNotFoundError:
-        print(f"{parts[0]}: command not found")
+        while job.state == RUNNING:
+            try:
+                _, status = os.waitpid(job.pid, os.WUNTRACED)
+            except ChildProcessError:
+                job.state = DONE
+                break
+            _update(job, status)
+    finally:
+        _give_terminal(os.getpgrp())
+        job.foreground = False
+
 
 def run_foreground_command(parts):
-    try:
-        subprocess.run(parts)
-    except FileNotFoundError:
-        print(f"{parts[0]}: command not found")
+    process = _launch(parts)
+    if process is None:
+        return 127
+    job = Job(None, process, " ".join(parts))
+    _wait_foreground(job)
+    if job.state == STOPPED:
+        # Ctrl-Z: keep it as a stopped background job.
+        job.job_id = next(_job_ids)
+        background_jobs[job.job_id] = job
+        _by_pid[job.pid] = job
+        print(f"\n{job.describe()}")
+        return 128 + signal.SIGTSTP
+    return job.exit_status
 
+# --------------------------------------------
+# Job control builtins
+# --------------------------------------------
 def list_jobs():
-    for job_id, process in background_jobs.items():
-        print(f"[{job_id}] {process.pid} Running")
+    reap_jobs()
+    for job_id, job in list(background_jobs.items()):
+        print(job.describe())
+        if job.state == DONE:
+            del background_jobs[job_id]
+    return 0
 
-def bring_to_foreground(args):
+
+def _find_job(name, args):
+    """Resolve `%N`, `N` or (with no argument) the most recent job."""
     if not args:
-        print("fg: missing job ID")
-        return
-    job_id = int(args[0])
-    if job_id not in background_jobs:
-        print(f"fg: no such job {job_id}")
-        return
-    process = background_jobs.pop(job_id)
-    process.wait()
-    print(f"[{job_id}] {process.pid} Done")
+        if not background_jobs:
+            print(f"{name}: no current job")
+            return None
+        return background_jobs[next(reversed(background_jobs))]
+    spec = args[0].lstrip("%")
+    if not spec.isdigit() or int(spec) not in background_jobs:
+        print(f"{name}: no such job {args[0]}")
+        return None
+    return background_jobs[int(spec)]
+
+
+def bring_to_foreground(args):
+    reap_jobs()
+    job = _find_job("fg", args)
+    if job is None:
+        return 1
+    if job.state == DONE:
+        del background_jobs[job.job_id]
+        print(job.describe())
+        return job.exit_status
+    print(job.command)
+    job.state = RUNNING
+    job.foreground = True
+    try:
+        os.killpg(job.pid, signal.SIGCONT)
+    except ProcessLookupError:
+        pass
+    _wait_foreground(job)
+    if job.state == DONE:
+        del background_jobs[job.job_id]
+        print(f"[{job.job_id}] {job.pid} Done")
+        return job.exit_status
+    print(f"\n{job.describe()}")
+    return 128 + signal.SIGTSTP
+
 
 def resume_in_background(args):
+    reap_jobs()
+    job = _find_job("bg", args)
+    if job is None:
+        return 1
+    if job.state != STOPPED:
+        print(f"bg: job {job.job_id} already in background")
+        return 0
+    try:
+        os.killpg(job.pid, signal.SIGCONT)
+    except ProcessLookupError:
+        pass
+    job.state = RUNNING
+    print(f"[{job.job_id}] {job.pid} Resumed")
+    return 0
+
+
+def kill_process(args):
+    """kill [-SIGNAL] <pid | %job> ..."""
+    sig = signal.SIGTERM
+    if args and args[0].startswith("-") and len(args) > 1:
+        name = args.pop(0)[1:].upper()
+        try:
+            sig = signal.Signals(int(name)) if name.isdigit() else signal.Signals[name if name.startswith("SIG") else "SIG" + name]
+        except (KeyError, ValueError):
+            print(f"kill: invalid signal {name}")
+            return 1
     if not args:
-        print("bg: missing job ID")
-        return
-    job_id = int(args[0])
-    if job_id not in background_jobs:
-        print(f"bg: no such job {job_id}")
-        return
-    process = background_jobs[job_id]
-    print(f"[{job_id}] {process.pid} Resumed")
+        print("kill: missing process ID")
+        return 1
+    status = 0
+    for target in args:
+        try:
+            if target.startswith("%"):
+                job = _find_job("kill", [target])
+                if job is None:
+                    status = 1
+                    continue
+                os.killpg(job.pid, sig)
+                if sig in (signal.SIGTERM, signal.SIGKILL, signal.SIGHUP, signal.SIGINT):
+                    os.killpg(job.pid, signal.SIGCONT)  # A stopped job must run to act on it.
+            else:
+                os.kill(int(target), sig)
+        except ValueError:
+            print(f"kill: invalid process ID {target}")
+            status = 1
+        except ProcessLookupError:
+            print(f"kill: ({target}) - No such process")
+            status = 1
+        except PermissionError:
+            print(f"kill: ({target}) - Operation not permitted")
+            status = 1
+    return status
@@ -1,42 +1,195 @@
 import os
 import sys
+import shlex
+import argparse
 from commands.built_in import execute_built_in
 from commands.file_ops import execute_file_command
-from commands.process_mgmt import execute_process_command
-from utils.error_handling import handle_invalid_command
+from commands.process_mgmt import execute_process_command, init_job_control, notify_finished, is_background
+from utils.path_cache import hash_command
+from utils.history import History, setup_readline, history_command
+
+HISTORY_FILE = os.path.expanduser("~/.custom_shell_history")
+history = History(HISTORY_FILE)  # Loaded and recorded only by the interactive shell.
+
+class ExitShell(Exception):
+    """Raised by `exit [n]` to leave the shell with status n."""
+    def __init__(self, status=0):
+        super().__init__(status)
+        self.status = status
 
 def shell():
+    init_job_control()
+    setup_readline(history, COMMANDS.keys)
+    status = 0
     while True:
         try:
+            notify_finished()
             current_dir = os.getcwd()
             command = input(f"{current_dir} $ ").strip()
 
             if not command:
                 continue
 
-            if command == "exit":
-                print("Exiting the shell.")
-                break
-
-            execute_command(command)
+            history.add(command)
+            status = run_command_line(command)
+        except ExitShell as e:
+            print("Exiting the shell.")
+            return e.status
+        except EOFError:
+            print()
+            return status
         except KeyboardInterrupt:
             print("\nUse 'exit' to quit the shell.")
         except Exception as e:
             print(f"Error: {e}")
+            status = 1
+
+def run_script(lines):
+    """Run commands from an iterable of lines without prompts; returns the last exit status."""
+    init_job_control()
+    status = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            status = run_command_line(line)
+        except ExitShell as e:
+            return e.status
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            status = 1
+        notify_finished()
+    return status
+
+def exit_command(parts):
+    try:
+        status = int(parts[1]) if len(parts) > 1 else 0
+    except ValueError:
+        print(f"exit: {parts[1]}: numeric argument required")
+        status = 2
+    raise ExitShell(status & 0xFF)
+
+# Command name -> handler(parts). Anything not registered runs as an external program.
+COMMANDS = {}
+
+def register_command(name, handler):
+    """Add or replace a command; `handler` receives the split command line."""
+    COMMANDS[name] = handler
+
+for name in ["cd", "pwd", "echo", "clear"]:
+    register_command(name, execute_built_in)
+for name in ["ls", "cat", "mkdir", "rmdir", "rm", "touch", "cp"]:
+    register_command(name, execute_file_command)
+for name in ["kill", "jobs", "fg", "bg"]:
+    register_command(name, execute_process_command)
+register_command("hash", hash_command)
+register_command("exit", exit_command)
+register_command("history", lambda parts: history_command(history, parts[1:]))
+
+SEPARATORS = {";", "&", "&&", "||"}
 
-def execute_command(command):
-    parts = command.split()
-    cmd = parts[0]
+class Word(str):
+    """A command-line word; `quoted` is True if any of it was quoted or escaped, which disables globbing."""
+    quoted = False
 
-    # Delegate command execution
-    if cmd in ["cd", "pwd", "echo", "clear"]:
-        execute_built_in(parts)
-    elif cmd in ["ls", "cat", "mkdir", "rmdir", "rm", "touch"]:
-        execute_file_command(parts)
-    elif cmd in ["kill", "jobs", "fg", "bg"]:
-        execute_process_command(parts)
-    else:
-        handle_invalid_command(cmd)
+class _Lexer(shlex.shlex):
+    """shlex that records whether each token it returns contained a quoted or escaped character."""
+    def __init__(self, line):
+        super().__init__(line, posix=True, punctuation_chars=";&|")
+        self.whitespace_split = True
+        self.commenters = ""
+        self.quoted = False
+        read = self.instream.read
+
+        def tracking_read(size=-1):
+            # shlex reads one character at a time, so the state seen here is the one the previous character left.
+            if self.state and self.state in self.quotes + self.escape:
+                self.quoted = True
+            return read(size)
+
+        self.instream.read = tracking_read
+
+    def read_token(self):
+        self.quoted = False
+        return super().read_token()
+
+def parse_command_line(line):
+    """Split a line into (operator, parts) pairs, operator being the ;, && or || before the command.
+
+    Quoting follows the shell: `echo "a;b"` is one command. A trailing `&`
+    stays on its command's parts (as the token "&") and also ends it.
+    Parts are Word strings, so later stages can tell `'*'` from `*`.
+    """
+    lexer = _Lexer(line)
+    commands = []
+    operator = ";"
+    parts = []
+    for token in lexer:
+        if lexer.quoted or token not in SEPARATORS:
+            if not lexer.quoted and set(token) <= set(";&|"):
+                raise ValueError(f"syntax error near unexpected token '{token}'")
+            word = Word(token)
+            word.quoted = lexer.quoted
+            parts.append(word)
+            continue
+        if not parts:
+            raise ValueError(f"syntax error near unexpected token '{token}'")
+        if token == "&":
+            parts.append("&")
+            token = ";"
+        commands.append((operator, parts))
+        operator = token
+        parts = []
+    if parts:
+        commands.append((operator, parts))
+    elif operator in ("&&", "||"):
+        raise ValueError(f"syntax error: expected a command after '{operator}'")
+    return commands
+
+def run_command_line(line):
+    """Run every command of `line` in order, honouring && and ||; returns the last exit status."""
+    try:
+        commands = parse_command_line(line)
+    except ValueError as e:
+        print(e)
+        return 2
+    status = 0
+    for operator, parts in commands:
+        if (operator == "&&" and status != 0) or (operator == "||" and status == 0):
+            continue
+        status = execute_command(parts)
+    return status
+
+def execute_command(parts):
+    if isinstance(parts, str):
+        parts = shlex.split(parts)
+
+    # Delegate command execution; background (&) and external commands go to process management.
+    handler = COMMANDS.get(parts[0], execute_process_command)
+    if is_background(parts) and handler is not execute_process_command:
+        handler = execute_process_command
+    status = handler(parts)
+    return 0 if status is None else status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Custom shell.")
+    parser.add_argument("-c", dest="command", help="run COMMAND and exit")
+    parser.add_argument("script", nargs="?", help="file of commands to run instead of prompting")
+    args = parser.parse_args(argv)
+
+    if args.command is not None:
+        return run_script(args.command.splitlines())
+    if args.script is not None:
+        try:
+            with open(args.script) as script:
+                return run_script(script)
+        except OSError as e:
+            print(f"shell.py: {args.script}: {e.strerror}", file=sys.stderr)
+            return 127
+    if not sys.stdin.isatty():
+        return run_script(sys.stdin)
+    return shell()
 
 if __name__ == "__main__":
-    shell()
+    sys.exit(main())
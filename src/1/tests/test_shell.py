@@ -42,6 +42,12 @@ def test_built_in_commands():
     assert test_dir in stdout, "cd command failed"
     os.rmdir(test_dir)  # Clean up
 
+    # Test `hash`: external commands are remembered with their full path
+    commands = "true\nhash\nhash -r\nhash\nexit\n"
+    stdout, stderr = run_shell_command(commands)
+    assert "/true" in stdout, "hash did not remember the command path"
+    assert "hash table empty" in stdout, "hash -r did not clear the table"
+
     print("Built-in commands passed all tests!")
 
 def test_file_operations():
@@ -67,6 +73,60 @@ def test_file_operations():
     stdout, stderr = run_shell_command(commands)
     assert "to_remove.txt" not in stdout, "rm command failed"
 
+    # Test `cat` with several files (copied byte for byte) and `ls -lR`
+    os.makedirs("test_tree/sub")
+    with open("test_tree/a.txt", "w") as f:
+        f.write("first\n")
+    with open("test_tree/sub/b.txt", "w") as f:
+        f.write("second")
+    stdout, stderr = run_shell_command("cat test_tree/a.txt test_tree/sub/b.txt\nls -lR test_tree\nexit\n")
+    assert "first\nsecond" in stdout, "cat of several files failed"
+    assert "test_tree/sub:" in stdout and "b.txt" in stdout, "ls -R failed"
+    assert "-rw" in stdout, "ls -l failed"
+    for name in ["test_tree/sub/b.txt", "test_tree/a.txt"]:
+        os.remove(name)
+    os.rmdir("test_tree/sub")
+    os.rmdir("test_tree")
+
+    # Test `mkdir -p`, `touch` with several files, `cp -r`, globs and `rm -r`
+    commands = "mkdir -p bulk/a/b\ntouch bulk/a/1.txt bulk/a/b/2.txt\ncp -r bulk/a bulk/copy\nls -R bulk/copy\nrm -r bulk/*\nls bulk\nexit\n"
+    stdout, stderr = run_shell_command(commands)
+    assert "bulk/copy/b:" in stdout and "2.txt" in stdout, "cp -r failed"
+    assert os.listdir("bulk") == [], "rm -r with a glob failed"
+    os.rmdir("bulk")
+
+    # Test that copying a file onto itself is refused instead of truncating it
+    with open("same.txt", "w") as f:
+        f.write("keep me")
+    stdout, stderr = run_shell_command("cp same.txt .\ncp same.txt same.txt\nexit\n")
+    assert "are the same file" in stdout, "cp onto itself not reported"
+    with open("same.txt") as f:
+        assert f.read() == "keep me", "cp onto itself destroyed the file"
+    os.remove("same.txt")
+
+    # Test `cat` on a pipe, which sendfile() cannot read from
+    process = subprocess.run(["python3", "shell.py", "-c", "cat /dev/stdin"], input="from a pipe\n",
+                             text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert process.stdout == "from a pipe\n" and process.returncode == 0, "cat of a pipe failed"
+
+    # Test that quoted or escaped globs are not expanded
+    os.mkdir("globs")
+    for name in ("globs/*", "globs/a.txt", "globs/b.txt"):
+        open(name, "w").close()
+    stdout, stderr = run_shell_command("rm 'globs/*'\nls globs\nrm globs/\\*.txt\nls globs\nrm globs/*.txt\nls globs\nexit\n")
+    assert os.listdir("globs") == [], "unquoted glob not expanded"
+    assert "a.txt" in stdout and "No such file" in stdout, "quoted glob was expanded"
+    os.rmdir("globs")
+
+    # Test that `rm -r` refuses `.` and `..`
+    os.makedirs("guard/inner")
+    open("guard/inner/keep.txt", "w").close()
+    stdout, stderr = run_shell_command("cd guard/inner\nrm -r . ..\nexit\n")
+    assert "refusing to remove" in stdout, "rm -r . not refused"
+    assert os.path.exists("guard/inner/keep.txt"), "rm -r . deleted files"
+    os.remove("guard/inner/keep.txt")
+    os.removedirs("guard/inner")
+
     print("File operations passed all tests!")
 
 def test_process_management():
@@ -78,14 +138,48 @@ def test_process_management():
     stdout, stderr = run_shell_command(commands)
     assert "Running" in stdout, "jobs command failed"
 
+    # Test that finished jobs are reported as Done and job IDs are not reused
+    commands = "true &\nsleep 0.5\njobs\nsleep 1 &\njobs\nkill %2\nexit\n"
+    stdout, stderr = run_shell_command(commands)
+    assert "[1]" in stdout and "Done" in stdout, "finished job not reported as Done"
+    assert "[2]" in stdout, "job ID was reused"
+
+    # Test that a quoted or escaped `&` is an argument, not a background job
+    stdout, stderr = run_shell_command('echo "a&"\necho b\\&\nexit\n')
+    assert "a&" in stdout and "b&" in stdout and "[1]" not in stdout, "quoted & started a background job"
+
+    # Test that a command killed by a signal exits with 128 + the signal number
+    process = subprocess.run(["python3", "shell.py", "-c", 'sh -c "kill -TERM $$"'], stdout=subprocess.PIPE)
+    assert process.returncode == 143, "signal exit status not mapped to 128 + N"
+
     print("Process management passed all tests!")
 
+def test_command_lists():
+    """Test -c mode, ;, && and || and exit statuses."""
+    print("Testing command lists...")
+
+    process = subprocess.run(
+        ["python3", "shell.py", "-c", "true && echo yes || echo no; false || echo recovered; echo 'a;b'"],
+        text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    assert process.stdout.split() == ["yes", "recovered", "a;b"], "command list failed"
+    assert process.returncode == 0, "wrong exit status"
+
+    process = subprocess.run(["python3", "shell.py", "-c", "false"], stdout=subprocess.PIPE)
+    assert process.returncode == 1, "exit status of the last command not returned"
+
+    stdout, stderr = run_shell_command("echo before\nexit 3\necho after\n")
+    assert "before" in stdout and "after" not in stdout, "exit did not stop the script"
+
+    print("Command lists passed all tests!")
+
 def main():
     """Run all tests."""
     print("Starting tests for shell...")
     test_built_in_commands()
     test_file_operations()
     test_process_management()
+    test_command_lists()
     print("All tests completed successfully!")
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+"""
+Persistent command history and tab completion for the interactive shell.
+
+- History is kept in an append-only file: each command is written (and
+  flushed) as soon as it is entered, so several shells can share one file
+  without overwriting each other.
+- Prefix search goes through a sorted index of distinct commands. bisect
+  finds the first match, so lookup cost depends on the number of matches,
+  not on the size of the history.
+- Completion offers builtins and PATH executables for the first word, and
+  file names after that. Directory listings are cached and rescanned only
+  when the directory's mtime changes.
+
+readline is optional; without it the shell still records history.
+"""
+
+import os
+import re
+import bisect
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+READLINE_SIZE = 10000  # Most recent commands loaded into readline's own (linear) history.
+
+
+def _prefix_range(sorted_items, prefix):
+    """Items of a sorted list that start with `prefix`, found by binary search."""
+    start = bisect.bisect_left(sorted_items, prefix)
+    # Every string starting with `prefix` sorts below prefix + U+10FFFF.
+    end = bisect.bisect_left(sorted_items, prefix + "\U0010ffff", start)
+    return sorted_items[start:end]
+
+
+class History:
+    def __init__(self, path):
+        self.path = path
+        self.entries = []      # Every command, oldest first.
+        self.index = []        # Distinct commands, sorted, for prefix search.
+        self.last_seen = {}    # command -> position of its latest use in entries
+        self.file = None
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as file:
+                self.entries = [line.rstrip("\n") for line in file if line.strip()]
+        except FileNotFoundError:
+            self.entries = []
+        self.last_seen = {command: position for position, command in enumerate(self.entries)}
+        self.index = sorted(self.last_seen)
+        if readline is not None:
+            for command in self.entries[-READLINE_SIZE:]:
+                readline.add_history(command)
+        return self
+
+    def add(self, command):
+        """Record `command` in memory and append it to the history file."""
+        command = command.strip()
+        if not command:
+            return
+        if self.entries and self.entries[-1] == command:
+            return  # Like HISTCONTROL=ignoredups.
+        if command not in self.last_seen:
+            bisect.insort(self.index, command)
+        self.last_seen[command] = len(self.entries)
+        self.entries.append(command)
+        try:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(command + "\n")
+            self.file.flush()
+        except OSError:
+            pass  # A read-only home directory should not break the shell.
+
+    def search(self, prefix, limit=None):
+        """Distinct commands starting with `prefix`, most recently used first."""
+        matches = _prefix_range(self.index, prefix)
+        matches.sort(key=self.last_seen.__getitem__, reverse=True)
+        return matches[:limit] if limit else matches
+
+    def recent(self, count=None):
+        """(number, command) pairs for the last `count` commands (all by default)."""
+        start = 0 if count is None else max(0, len(self.entries) - count)
+        return [(number + 1, self.entries[number]) for number in range(start, len(self.entries))]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class DirectoryCache:
+    """Sorted directory listings, rescanned only when a directory's mtime changes."""
+
+    def __init__(self):
+        self.listings = {}     # directory -> (mtime_ns, sorted names, directory names, executable names)
+
+    def listing(self, directory):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self.listings.pop(directory, None)
+            return [], set(), set()
+        cached = self.listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1:]
+        names, directories, executables = [], set(), set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    names.append(entry.name)
+                    try:
+                        if entry.is_dir():
+                            directories.add(entry.name)
+                        elif entry.is_file() and os.access(entry.path, os.X_OK):
+                            executables.add(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            return [], set(), set()
+        names.sort()
+        self.listings[directory] = (mtime, names, directories, executables)
+        return names, directories, executables
+
+    def matching(self, directory, prefix):
+        """Names in `directory` starting with `prefix`, plus its sets of directories and executables."""
+        names, directories, executables = self.listing(directory)
+        return _prefix_range(names, prefix), directories, executables
+
+
+class Completer:
+    def __init__(self, builtins):
+        self.builtins = builtins   # Callable or collection of builtin command names.
+        self.cache = DirectoryCache()
+        self.matches = []
+
+    def _builtin_names(self):
+        return self.builtins() if callable(self.builtins) else self.builtins
+
+    def command_names(self, prefix):
+        found = {name for name in self._builtin_names() if name.startswith(prefix)}
+        for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+            names, _, executables = self.cache.matching(directory or ".", prefix)
+            found.update(name for name in names if name in executables)
+        return sorted(found)
+
+    def file_names(self, text):
+        directory, prefix = os.path.split(text)
+        names, directories, _ = self.cache.matching(os.path.expanduser(directory) or ".", prefix)
+        if not prefix.startswith("."):
+            names = [name for name in names if not name.startswith(".")]
+        return [os.path.join(directory, name) + ("/" if name in directories else "") for name in names]
+
+    def candidates(self, line, text):
+        """Completions for `text`, the word being typed at the end of `line`."""
+        # The first word of the line, or of a command after ;, &&, || or |, is a command name.
+        first_word = not re.split(r"[;&|]", line[:len(line) - len(text)])[-1].strip()
+        if first_word and "/" not in text:
+            return self.command_names(text)
+        return self.file_names(text)
+
+    def complete(self, text, state):
+        """readline completer protocol: return the state-th candidate, or None."""
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            self.matches = self.candidates(line, text)
+        return self.matches[state] if state < len(self.matches) else None
+
+
+def setup_readline(history, builtins):
+    """Load `history` and turn on tab completion for `builtins` (names or a callable returning them)."""
+    history.load()
+    if readline is not None:
+        completer = Completer(builtins)
+        readline.set_completer(completer.complete)
+        readline.set_completer_delims(" \t\n;&|<>")
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+            # Up/Down recall earlier commands starting with what is already typed.
+            readline.parse_and_bind('"\\e[A": history-search-backward')
+            readline.parse_and_bind('"\\e[B": history-search-forward')
+    return history
+
+
+def history_command(history, args):
+    """history [N] | history -s PREFIX: list the last N commands, or search by prefix."""
+    if args and args[0] == "-s":
+        if len(args) < 2:
+            print("history: -s requires a prefix")
+            return 2
+        for command in history.search(" ".join(args[1:])):
+            print(command)
+        return 0
+    try:
+        count = int(args[0]) if args else None
+    except ValueError:
+        print(f"history: {args[0]}: numeric argument required")
+        return 2
+    for number, command in history.recent(count):
+        print(f"{number:>5}  {command}")
+    return 0
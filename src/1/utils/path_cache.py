@@ -0,0 +1,111 @@
+import os
+import time
+
+RECHECK_INTERVAL = 1.0  # Seconds between stat() checks of the PATH directories.
+
+
+class PathCache:
+    """Remembers where each external command was found on PATH, like bash's `hash`.
+
+    The cache is dropped when PATH changes, or when a PATH directory's mtime
+    changes (a program was added, removed or renamed). Directories are
+    re-stat'ed at most once per `recheck_interval` seconds, so a burst of
+    commands costs one dict lookup each.
+    """
+
+    def __init__(self, recheck_interval=RECHECK_INTERVAL):
+        self.recheck_interval = recheck_interval
+        self.table = {}        # name -> [path, hits]
+        self.path = None       # PATH value the table was built for.
+        self.dirs = []
+        self.mtimes = {}       # directory -> mtime when last checked
+        self.checked = 0.0
+
+    def _dir_mtimes(self):
+        mtimes = {}
+        for directory in self.dirs:
+            try:
+                mtimes[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtimes[directory] = None
+        return mtimes
+
+    def _validate(self):
+        path = os.environ.get("PATH", os.defpath)
+        now = time.monotonic()
+        if path != self.path:
+            self.path = path
+            self.dirs = [d or "." for d in path.split(os.pathsep)]
+            self.mtimes = self._dir_mtimes()
+            self.table.clear()
+            self.checked = now
+        elif now - self.checked >= self.recheck_interval:
+            self.checked = now
+            mtimes = self._dir_mtimes()
+            if mtimes != self.mtimes:
+                self.mtimes = mtimes
+                self.table.clear()
+
+    def _search(self, name):
+        for directory in self.dirs:
+            candidate = os.path.join(directory, name)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+        return None
+
+    def lookup(self, name):
+        """Full path of `name` on PATH (None if not found); names containing a slash are returned as-is."""
+        if os.sep in name:
+            return name
+        self._validate()
+        entry = self.table.get(name)
+        if entry is None:
+            found = self._search(name)
+            if found is None:
+                return None
+            entry = self.table[name] = [found, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def forget(self, name=None):
+        """Drop one entry (e.g. its program vanished) or, with no name, the whole table."""
+        if name is None:
+            self.table.clear()
+        else:
+            self.table.pop(name, None)
+
+    def remember(self, name):
+        """Look `name` up now without counting a hit; returns False if it is not on PATH."""
+        self._validate()
+        found = self._search(name)
+        if found is None:
+            return False
+        self.table[name] = [found, 0]
+        return True
+
+
+path_cache = PathCache()
+
+
+def hash_command(parts):
+    """hash [-r] [name ...]: show, reset or pre-load the PATH lookup table."""
+    args = parts[1:]
+    if args and args[0] == "-r":
+        path_cache.forget()
+        args = args[1:]
+        if not args:
+            return 0
+    status = 0
+    for name in args:
+        if not path_cache.remember(name):
+            print(f"hash: {name}: not found")
+            status = 1
+    if args:
+        return status
+    if not path_cache.table:
+        print("hash: hash table empty")
+        return 0
+    print("hits\tcommand")
+    for path, hits in path_cache.table.values():
+        print(f"{hits:>4}\t{path}")
+    return 0
@@ -0,0 +1,300 @@
+"""
+Vectorized batch evaluation of scheduling policies with NumPy.
+
+Instead of building one `Process` object per job and stepping the simulation
+engine, workloads are described by parallel arrays (burst times, priorities,
+arrival times) and completion times are computed with array operations:
+
+- FCFS:      closed form, also with arbitrary arrival times.
+- SJF:       stable sort by burst + cumulative sum (all jobs arriving together).
+- Priority:  stable sort by priority + cumulative sum (all jobs arriving together).
+- RR:        one vectorized pass per distinct number of rounds a job needs.
+
+When SJF, Priority or RR jobs arrive at different times there is no closed
+form; those cases fall back to an event loop over plain arrays that produces
+the same schedule as `process_scheduling.simulate`. That loop is pure Python
+(about a second for 2*10^5 jobs), so only same-arrival workloads and FCFS
+scale to millions of jobs.
+"""
+
+import heapq
+import time
+import argparse
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("batch_scheduling.py needs NumPy: pip install -r requirements.txt") from None
+
+POLICIES = ("FCFS", "SJF", "PRIORITY", "RR")
+
+
+def arrays_from_processes(processes):
+    """Convert a list of `Process` objects into (bursts, priorities, arrivals) arrays."""
+    bursts = np.fromiter((p.execution_time for p in processes), dtype=np.int64, count=len(processes))
+    priorities = np.fromiter((p.priority for p in processes), dtype=np.int64, count=len(processes))
+    arrivals = np.fromiter((p.arrival_time for p in processes), dtype=np.int64, count=len(processes))
+    return bursts, priorities, arrivals
+
+
+def synthetic_workload(n, max_burst=100, max_priority=10, arrival_span=0, seed=None):
+    """Random bursts/priorities/arrivals for capacity-planning runs."""
+    rng = np.random.default_rng(seed)
+    bursts = rng.integers(1, max_burst + 1, size=n, dtype=np.int64)
+    priorities = rng.integers(0, max_priority, size=n, dtype=np.int64)
+    if arrival_span:
+        arrivals = rng.integers(0, arrival_span, size=n, dtype=np.int64)
+    else:
+        arrivals = np.zeros(n, dtype=np.int64)
+    return bursts, priorities, arrivals
+
+
+def _result(bursts, arrivals, completion, start):
+    turnaround = completion - arrivals
+    return {
+        "completion": completion,
+        "turnaround": turnaround,
+        "waiting": turnaround - bursts,
+        "response": start - arrivals,
+    }
+
+
+def _same_arrival(arrivals):
+    return arrivals.size == 0 or bool((arrivals == arrivals[0]).all())
+
+
+def _run_in_order(bursts, arrivals, order):
+    """Non-preemptive schedule of jobs that all arrive together, in `order`."""
+    completion = np.empty_like(bursts)
+    completion[order] = np.cumsum(bursts[order])
+    if arrivals.size:
+        completion += arrivals[0]
+    return _result(bursts, arrivals, completion, completion - bursts)
+
+
+def fcfs(bursts, arrivals=None):
+    bursts = np.asarray(bursts, dtype=np.int64)
+    arrivals = np.zeros_like(bursts) if arrivals is None else np.asarray(arrivals, dtype=np.int64)
+    if _same_arrival(arrivals):
+        return _run_in_order(bursts, arrivals, np.arange(bursts.size))
+    order = np.argsort(arrivals, kind="stable")
+    a = arrivals[order]
+    b = bursts[order]
+    finished = np.cumsum(b)
+    # C_i = max over j <= i of (a_j + b_j + ... + b_i): the CPU restarts at the
+    # latest arrival that found it idle.
+    completion = np.empty_like(bursts)
+    completion[order] = finished + np.maximum.accumulate(a - (finished - b))
+    return _result(bursts, arrivals, completion, completion - bursts)
+
+
+def sjf(bursts, arrivals=None):
+    bursts = np.asarray(bursts, dtype=np.int64)
+    arrivals = np.zeros_like(bursts) if arrivals is None else np.asarray(arrivals, dtype=np.int64)
+    if _same_arrival(arrivals):
+        return _run_in_order(bursts, arrivals, np.argsort(bursts, kind="stable"))
+    return _nonpreemptive_loop(bursts, arrivals, bursts)
+
+
+def priority(bursts, priorities, arrivals=None):
+    bursts = np.asarray(bursts, dtype=np.int64)
+    priorities = np.asarray(priorities, dtype=np.int64)
+    arrivals = np.zeros_like(bursts) if arrivals is None else np.asarray(arrivals, dtype=np.int64)
+    if _same_arrival(arrivals):
+        return _run_in_order(bursts, arrivals, np.argsort(priorities, kind="stable"))
+    return _preemptive_priority_loop(bursts, priorities, arrivals)
+
+
+def round_robin(bursts, time_quantum, arrivals=None):
+    if time_quantum <= 0:
+        raise ValueError("Time quantum must be positive.")
+    bursts = np.asarray(bursts, dtype=np.int64)
+    arrivals = np.zeros_like(bursts) if arrivals is None else np.asarray(arrivals, dtype=np.int64)
+    if not _same_arrival(arrivals):
+        return _round_robin_loop(bursts, time_quantum, arrivals)
+
+    q = time_quantum
+    rounds = -(-bursts // q)  # Turns each job needs.
+    completion = np.empty_like(bursts)
+    alive = np.arange(bursts.size)
+    sorted_bursts = np.sort(bursts)
+    prefix = np.concatenate(([0], np.cumsum(sorted_bursts)))
+    for k in np.unique(rounds):
+        alive = alive[rounds[alive] >= k]
+        # Work finished by everyone before round k starts: sum of min(burst, (k-1)q).
+        cap = (k - 1) * q
+        shorter = np.searchsorted(sorted_bursts, cap, side="right")
+        before = prefix[shorter] + (bursts.size - shorter) * cap
+        # Slices handed out in round k, in queue order.
+        slices = np.minimum(bursts[alive], k * q) - (k - 1) * q
+        ends = before + np.cumsum(slices)
+        done = rounds[alive] == k
+        completion[alive[done]] = ends[done]
+
+    # Each job's first turn starts after everyone ahead of it had one slice.
+    first = np.minimum(bursts, q)
+    start = np.cumsum(first) - first
+    if arrivals.size:
+        completion += arrivals[0]
+        start += arrivals[0]
+    return _result(bursts, arrivals, completion, start)
+
+
+# --------------------------------------------
+# Fallbacks for staggered arrivals
+# --------------------------------------------
+def _nonpreemptive_loop(bursts, arrivals, keys):
+    order = np.argsort(arrivals, kind="stable").tolist()
+    arrival_list = arrivals.tolist()
+    burst_list = bursts.tolist()
+    key_list = keys.tolist()
+    start = [0] * len(order)
+    completion = [0] * len(order)
+    ready = []
+    clock = 0
+    index = 0
+    total = len(order)
+    while index < total or ready:
+        while index < total and arrival_list[order[index]] <= clock:
+            i = order[index]
+            heapq.heappush(ready, (key_list[i], arrival_list[i], index, i))
+            index += 1
+        if not ready:
+            clock = arrival_list[order[index]]
+            continue
+        i = heapq.heappop(ready)[-1]
+        start[i] = clock
+        clock += burst_list[i]
+        completion[i] = clock
+    return _result(bursts, arrivals, np.array(completion, dtype=np.int64), np.array(start, dtype=np.int64))
+
+
+def _preemptive_priority_loop(bursts, priorities, arrivals):
+    order = np.argsort(arrivals, kind="stable").tolist()
+    arrival_list = arrivals.tolist()
+    remaining = bursts.tolist()
+    priority_list = priorities.tolist()
+    start = [-1] * len(order)
+    completion = [0] * len(order)
+    ready = []
+    counter = 0
+    clock = 0
+    index = 0
+    total = len(order)
+    while index < total or ready:
+        while index < total and arrival_list[order[index]] <= clock:
+            i = order[index]
+            heapq.heappush(ready, (priority_list[i], arrival_list[i], counter, i))
+            counter += 1
+            index += 1
+        if not ready:
+            clock = arrival_list[order[index]]
+            continue
+        i = heapq.heappop(ready)[-1]
+        units = remaining[i]
+        if index < total:
+            units = min(units, arrival_list[order[index]] - clock)
+        if start[i] < 0:
+            start[i] = clock
+        clock += units
+        remaining[i] -= units
+        if remaining[i]:
+            while index < total and arrival_list[order[index]] <= clock:
+                j = order[index]
+                heapq.heappush(ready, (priority_list[j], arrival_list[j], counter, j))
+                counter += 1
+                index += 1
+            heapq.heappush(ready, (priority_list[i], arrival_list[i], counter, i))
+            counter += 1
+        else:
+            completion[i] = clock
+    return _result(bursts, arrivals, np.array(completion, dtype=np.int64), np.array(start, dtype=np.int64))
+
+
+def _round_robin_loop(bursts, time_quantum, arrivals):
+    order = np.argsort(arrivals, kind="stable").tolist()
+    arrival_list = arrivals.tolist()
+    remaining = bursts.tolist()
+    start = [-1] * len(order)
+    completion = [0] * len(order)
+    ready = deque()
+    clock = 0
+    index = 0
+    total = len(order)
+    while index < total or ready:
+        while index < total and arrival_list[order[index]] <= clock:
+            ready.append(order[index])
+            index += 1
+        if not ready:
+            clock = arrival_list[order[index]]
+            continue
+        i = ready.popleft()
+        units = min(time_quantum, remaining[i])
+        if start[i] < 0:
+            start[i] = clock
+        clock += units
+        remaining[i] -= units
+        while index < total and arrival_list[order[index]] <= clock:
+            ready.append(order[index])
+            index += 1
+        if remaining[i]:
+            ready.append(i)
+        else:
+            completion[i] = clock
+    return _result(bursts, arrivals, np.array(completion, dtype=np.int64), np.array(start, dtype=np.int64))
+
+
+# --------------------------------------------
+# Entry points
+# --------------------------------------------
+def evaluate(policy, bursts, priorities=None, arrivals=None, time_quantum=None):
+    """Evaluate one of POLICIES over array inputs; returns a dict of per-job arrays."""
+    policy = policy.upper()
+    if policy == "FCFS":
+        return fcfs(bursts, arrivals)
+    if policy == "SJF":
+        return sjf(bursts, arrivals)
+    if policy == "PRIORITY":
+        if priorities is None:
+            raise ValueError("Priority scheduling needs a priorities array.")
+        return priority(bursts, priorities, arrivals)
+    if policy == "RR":
+        if time_quantum is None:
+            raise ValueError("Round-Robin scheduling needs a time quantum.")
+        return round_robin(bursts, time_quantum, arrivals)
+    raise ValueError(f"Unsupported policy. Use one of {', '.join(POLICIES)}.")
+
+
+def summarize(result):
+    """Averages over a batch result, matching `process_scheduling.summarize`."""
+    count = result["completion"].size
+    if not count:
+        return {"processes": 0}
+    makespan = int(result["completion"].max())
+    return {
+        "processes": count,
+        "avg_waiting": float(result["waiting"].mean()),
+        "avg_turnaround": float(result["turnaround"].mean()),
+        "avg_response": float(result["response"].mean()),
+        "makespan": makespan,
+        "throughput": count / makespan if makespan else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch-evaluate scheduling policies on a synthetic workload.")
+    parser.add_argument("-n", "--jobs", type=int, default=1_000_000, help="number of synthetic jobs")
+    parser.add_argument("--quantum", type=int, default=4, help="Round-Robin time quantum")
+    parser.add_argument("--arrival-span", type=int, default=0, help="spread arrivals over [0, span)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bursts, priorities, arrivals = synthetic_workload(args.jobs, arrival_span=args.arrival_span, seed=args.seed)
+    for policy in POLICIES:
+        started = time.perf_counter()
+        result = evaluate(policy, bursts, priorities, arrivals, args.quantum)
+        elapsed = time.perf_counter() - started
+        summary = summarize(result)
+        print(f"{policy:<9} {elapsed:8.3f}s  avg waiting {summary['avg_waiting']:.1f}  "
+              f"avg turnaround {summary['avg_turnaround']:.1f}  makespan {summary['makespan']}")
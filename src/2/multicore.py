@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Multi-core scheduling simulation with per-core run queues.
+
+The discrete-event engine in process_scheduling.py models a single CPU.
+Here K cores share one virtual clock, and each core owns a run queue of any
+single-core policy (RR, PRIORITY, MLFQ or CFS, built with sweep.make_policy).
+
+Arriving processes are placed on a core allowed by their affinity, either
+round-robin or on the least loaded core. Balancing moves queued (never
+running) processes between cores. It takes the least urgent process (the
+tail of the source queue) with the policy's steal(), so the source keeps
+its next process and its queue order:
+
+- none:   processes stay where they were placed.
+- push:   every `balance_interval` units, the busiest queue pushes work to the
+          least loaded one until they differ by at most one process.
+- pull:   a core that runs out of work pulls from the busiest queue.
+- steal:  a core that runs out of work steals from a random non-empty queue.
+
+A migrated process is enqueued on its new core like a new arrival; CFS
+re-bases its virtual runtime on the new queue, as Linux does. Each migration
+can cost `migration_cost` extra units of run time (a cold cache). That
+overhead shows up as waiting time in the metrics.
+
+Reports per-core utilization and migrations, makespan, and the usual
+per-process metrics. `sweep_cores` repeats a workload over several core
+counts, to find how many cores reach a target.
+
+Example:
+    python3 multicore.py --workload random:2000:1:5000 --cores 1 2 4 8 16 --balancing steal --target 200
+"""
+
+import random
+import argparse
+
+from process_scheduling import Process, collect_metrics, summarize
+from sweep import POLICIES, load_workload, make_policy
+
+BALANCING = ("none", "push", "pull", "steal")
+PLACEMENT = ("round_robin", "least_loaded")
+
+
+class Core:
+    def __init__(self, index, queue):
+        self.index = index
+        self.queue = queue          # Single-core ready-queue policy.
+        self.process = None         # Process currently running.
+        self.slice_start = 0
+        self.slice_end = 0
+        self.busy = 0               # Time spent running processes.
+        self.migrations_in = 0
+        self.migrations_out = 0
+        self.completed = 0
+
+    def load(self):
+        return len(self.queue) + (self.process is not None)
+
+
+def _allowed(affinity, process, core):
+    cores = affinity.get(process.pid)
+    return cores is None or core.index in cores
+
+
+def _take(source, target, affinity):
+    """Remove the least urgent process queued on `source` that may run on `target`.
+
+    The policy's steal() leaves the other queued processes, and its own state, untouched.
+    """
+    return source.queue.steal(lambda process: _allowed(affinity, process, target))
+
+
+def _migrate(source, target, affinity, now, migration_cost, migrations):
+    process = _take(source, target, affinity)
+    if process is None:
+        return False
+    process.remaining_time += migration_cost
+    migrations[process.pid] = migrations.get(process.pid, 0) + 1
+    source.migrations_out += 1
+    target.migrations_in += 1
+    target.queue.add(process, now)
+    return True
+
+
+def _push_balance(cores, affinity, now, migration_cost, migrations):
+    while True:
+        busiest = max(cores, key=lambda c: len(c.queue))
+        idlest = min(cores, key=Core.load)
+        if busiest is idlest or len(busiest.queue) - idlest.load() <= 1:
+            return
+        if not _migrate(busiest, idlest, affinity, now, migration_cost, migrations):
+            return
+
+
+def simulate_multicore(processes, cores=4, policy="RR", quantum=4, balancing="steal", affinity=None,
+                       placement="round_robin", balance_interval=10, migration_cost=0, seed=0):
+    """Run `processes` on `cores` cores; returns (per-process metrics, per-core stats, migrations by pid).
+
+    `affinity` maps pid -> collection of allowed core indexes (default: any core).
+    """
+    if balancing not in BALANCING:
+        raise ValueError(f"Unsupported balancing {balancing}. Use one of {', '.join(BALANCING)}.")
+    if placement not in PLACEMENT:
+        raise ValueError(f"Unsupported placement {placement}. Use one of {', '.join(PLACEMENT)}.")
+    affinity = {pid: set(allowed) for pid, allowed in (affinity or {}).items()}
+    for pid, allowed in affinity.items():
+        if not any(0 <= index < cores for index in allowed):
+            raise ValueError(f"Process {pid} has no allowed core among 0..{cores - 1}.")
+
+    pending = sorted(processes, key=lambda p: p.arrival_time)
+    for process in pending:
+        process.reset()
+    cpus = [Core(index, make_policy(policy, quantum)) for index in range(cores)]
+    rng = random.Random(seed)
+    migrations = {}
+    next_placement = 0
+    next_balance = balance_interval if balancing == "push" else None
+
+    clock = 0
+    index = 0
+    total = len(pending)
+    finished = 0
+    while finished < total:
+        # End every slice that expires now.
+        expired = []
+        for core in cpus:
+            if core.process is not None and core.slice_end == clock:
+                ran = clock - core.slice_start
+                core.busy += ran
+                core.process.remaining_time -= ran
+                expired.append((core, core.process, ran))
+                core.process = None
+
+        # Arrivals queue up ahead of processes whose slice just ended.
+        while index < total and pending[index].arrival_time <= clock:
+            process = pending[index]
+            allowed = [core for core in cpus if _allowed(affinity, process, core)]
+            if placement == "least_loaded":
+                target = min(allowed, key=Core.load)
+            else:
+                target = allowed[next_placement % len(allowed)]
+                next_placement += 1
+            target.queue.add(process, clock)
+            index += 1
+
+        for core, process, ran in expired:
+            if process.remaining_time > 0:
+                core.queue.requeue(process, ran, clock)
+            else:
+                process.completion_time = clock
+                core.completed += 1
+                finished += 1
+
+        if next_balance is not None and clock >= next_balance:
+            _push_balance(cpus, affinity, clock, migration_cost, migrations)
+            while next_balance <= clock:
+                next_balance += balance_interval
+
+        # Idle cores pick their next process, pulling or stealing work first if their queue is empty.
+        for core in cpus:
+            if core.process is not None:
+                continue
+            if not len(core.queue) and balancing in ("pull", "steal"):
+                victims = [other for other in cpus if other is not core and len(other.queue)]
+                if balancing == "pull":
+                    victims.sort(key=lambda other: len(other.queue), reverse=True)
+                else:
+                    rng.shuffle(victims)
+                for victim in victims:
+                    if _migrate(victim, core, affinity, clock, migration_cost, migrations):
+                        break
+            if not len(core.queue):
+                continue
+            process = core.queue.pop(clock)
+            units = process.remaining_time
+            time_slice = core.queue.time_slice(process)
+            if time_slice is not None:
+                units = min(units, time_slice)
+            if core.queue.preemptive and index < total:
+                units = min(units, pending[index].arrival_time - clock)
+            if process.start_time is None:
+                process.start_time = clock
+            core.process = process
+            core.slice_start = clock
+            core.slice_end = clock + units
+
+        # Advance to the next event.
+        events = [core.slice_end for core in cpus if core.process is not None]
+        if index < total:
+            events.append(pending[index].arrival_time)
+        if next_balance is not None and any(len(core.queue) for core in cpus):
+            events.append(next_balance)
+        if not events:
+            break
+        clock = min(events)
+
+    metrics = collect_metrics(pending)
+    makespan = max((m["completion"] for m in metrics.values()), default=0)
+    core_stats = [{
+        "core": core.index,
+        "busy": core.busy,
+        "utilization": core.busy / makespan if makespan else 0.0,
+        "completed": core.completed,
+        "migrations_in": core.migrations_in,
+        "migrations_out": core.migrations_out,
+    } for core in cpus]
+    return metrics, core_stats, migrations
+
+
+def summarize_multicore(metrics, core_stats, migrations):
+    summary = summarize(metrics)
+    summary["cores"] = len(core_stats)
+    summary["avg_utilization"] = sum(c["utilization"] for c in core_stats) / len(core_stats) if core_stats else 0.0
+    summary["migrations"] = sum(migrations.values())
+    return summary
+
+
+def sweep_cores(rows, core_counts, **options):
+    """Simulate the (pid, burst, priority, arrival) `rows` once per core count; returns one summary per count."""
+    results = []
+    for cores in core_counts:
+        processes = [Process(pid, burst, priority, arrival) for pid, burst, priority, arrival in rows]
+        results.append(summarize_multicore(*simulate_multicore(processes, cores, **options)))
+    return results
+
+
+def cores_needed(results, target):
+    """Smallest core count whose average turnaround is at most `target`, or None."""
+    for row in sorted(results, key=lambda r: r["cores"]):
+        if row["avg_turnaround"] <= target:
+            return row["cores"]
+    return None
+
+
+def print_core_stats(core_stats):
+    print(f"{'Core':>5} {'Busy':>10} {'Util':>7} {'Done':>6} {'In':>6} {'Out':>6}")
+    for c in core_stats:
+        print(f"{c['core']:>5} {c['busy']:>10} {c['utilization']:>7.1%} {c['completed']:>6} "
+              f"{c['migrations_in']:>6} {c['migrations_out']:>6}")
+
+
+def print_sweep(results):
+    print(f"{'Cores':>5} {'Makespan':>10} {'Avg wait':>10} {'Avg turnaround':>15} {'Avg response':>13} {'Util':>7} {'Migrations':>11}")
+    for r in results:
+        print(f"{r['cores']:>5} {r['makespan']:>10} {r['avg_waiting']:>10.2f} {r['avg_turnaround']:>15.2f} "
+              f"{r['avg_response']:>13.2f} {r['avg_utilization']:>7.1%} {r['migrations']:>11}")
+
+
+def parse_affinity(specs):
+    """Turn `PID=CORE[,CORE...]` strings into an affinity dict."""
+    affinity = {}
+    for spec in specs or []:
+        pid, _, cores = spec.partition("=")
+        affinity[int(pid) if pid.isdigit() else pid] = {int(core) for core in cores.split(",")}
+    return affinity
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-core scheduling with per-core run queues and load balancing.")
+    parser.add_argument("--workload", default="random:1000:1:2000", help="CSV file or random:<jobs>:<seed>[:<arrival_span>]")
+    parser.add_argument("--cores", type=int, nargs="+", default=[4], help="core counts (several values sweep them)")
+    parser.add_argument("--policy", default="RR", type=str.upper, choices=list(POLICIES))
+    parser.add_argument("--quantum", type=int, default=4)
+    parser.add_argument("--balancing", default="steal", choices=BALANCING)
+    parser.add_argument("--placement", default="round_robin", choices=PLACEMENT)
+    parser.add_argument("--balance-interval", type=int, default=10, help="push balancing period")
+    parser.add_argument("--migration-cost", type=int, default=0, help="extra run time per migration")
+    parser.add_argument("--affinity", nargs="*", metavar="PID=CORES", help="e.g. 3=0,1 pins process 3 to cores 0 and 1")
+    parser.add_argument("--target", type=float, help="report the fewest cores with average turnaround <= target")
+    parser.add_argument("--seed", type=int, default=0, help="victim selection seed for work stealing")
+    args = parser.parse_args()
+
+    options = {
+        "policy": args.policy,
+        "quantum": args.quantum,
+        "balancing": args.balancing,
+        "affinity": parse_affinity(args.affinity),
+        "placement": args.placement,
+        "balance_interval": args.balance_interval,
+        "migration_cost": args.migration_cost,
+        "seed": args.seed,
+    }
+    rows = list(load_workload(args.workload))
+    if len(args.cores) == 1:
+        processes = [Process(pid, burst, priority, arrival) for pid, burst, priority, arrival in rows]
+        metrics, core_stats, migrations = simulate_multicore(processes, args.cores[0], **options)
+        print_core_stats(core_stats)
+        print_sweep([summarize_multicore(metrics, core_stats, migrations)])
+    else:
+        results = sweep_cores(rows, args.cores, **options)
+        print_sweep(results)
+        if args.target is not None:
+            needed = cores_needed(results, args.target)
+            print(f"Cores needed for average turnaround <= {args.target}: {needed if needed else 'more than swept'}")
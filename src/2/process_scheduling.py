@@ -1,53 +1,428 @@
-
 import time
 import heapq
+import argparse
 from collections import deque
 
 class Process:
-    def __init__(self, pid, execution_time, priority=0):
+    def __init__(self, pid, execution_time, priority=0, arrival_time=0):
         self.pid = pid
         self.execution_time = execution_time
         self.remaining_time = execution_time
         self.priority = priority
+        self.arrival_time = arrival_time
+        self.start_time = None       # First time the process got the CPU.
+        self.completion_time = None  # Time the process finished.
 
     def __lt__(self, other):
         return self.priority < other.priority
 
-# Updated Round-Robin Scheduling with user-configurable time quantum
-def round_robin(processes, time_quantum):
-    queue = deque(processes)
-    while queue:
-        process = queue.popleft()
-        execution_time = min(time_quantum, process.remaining_time)
-        print(f"Process {process.pid} running for {execution_time} units.")
-        process.remaining_time -= execution_time
-        time.sleep(execution_time / 10)  # Simulate execution
+    def reset(self):
+        """Clear run state so the same process list can be simulated again."""
+        self.remaining_time = self.execution_time
+        self.start_time = None
+        self.completion_time = None
+
+# --------------------------------------------
+# Ready-queue policies for the simulation engine
+# --------------------------------------------
+def _heap_remove(heap, position):
+    """Remove and return heap[position], keeping the heap invariant."""
+    entry = heap[position]
+    last = heap.pop()
+    if position < len(heap):
+        heap[position] = last
+        heapq.heapify(heap)
+    return entry
+
+
+class RoundRobinQueue:
+    """FIFO ready queue; every process gets at most `time_quantum` units per turn."""
+    preemptive = False
+
+    def __init__(self, time_quantum):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive.")
+        self.time_quantum = time_quantum
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, process, now):
+        self.queue.append(process)
+
+    def requeue(self, process, ran, now):
+        self.queue.append(process)
+
+    def pop(self, now):
+        return self.queue.popleft()
+
+    def steal(self, predicate):
+        """Remove and return the last queued process matching `predicate`, or None; the rest keep their order."""
+        for position in range(len(self.queue) - 1, -1, -1):
+            if predicate(self.queue[position]):
+                process = self.queue[position]
+                del self.queue[position]
+                return process
+        return None
+
+    def time_slice(self, process):
+        return self.time_quantum
+
+    def describe(self, process, units):
+        return f"Process {process.pid} running for {units} units."
+
+
+class PriorityQueue:
+    """Lowest priority number runs first; ties are served first-come, first-served.
+
+    A newly arrived process with a better priority preempts the running one.
+    """
+    preemptive = True
+
+    def __init__(self):
+        self.heap = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, process, now):
+        heapq.heappush(self.heap, (process.priority, process.arrival_time, self.counter, process))
+        self.counter += 1
+
+    def requeue(self, process, ran, now):
+        self.add(process, now)
+
+    def pop(self, now):
+        return heapq.heappop(self.heap)[-1]
+
+    def steal(self, predicate):
+        """Remove and return the least urgent queued process matching `predicate`, or None."""
+        candidates = [position for position, entry in enumerate(self.heap) if predicate(entry[-1])]
+        if not candidates:
+            return None
+        position = max(candidates, key=lambda position: self.heap[position][:-1])
+        return _heap_remove(self.heap, position)[-1]
+
+    def time_slice(self, process):
+        return None  # Run until completion or preemption.
+
+    def describe(self, process, units):
+        return f"Executing Process {process.pid} with priority {process.priority} for {units} units."
+
+
+class MLFQQueue:
+    """Multilevel feedback queue.
+
+    New processes enter the top level. A process that uses up its level's
+    quantum (its allotment) drops one level; one that is preempted by an arrival
+    keeps its place at the head of its level with the allotment it has left.
+    Higher levels always run first, and every `boost_interval` time units all
+    processes move back to the top so long jobs cannot starve.
+    """
+    preemptive = True
+
+    def __init__(self, quanta=(2, 4, 8), boost_interval=50):
+        if not quanta or any(q <= 0 for q in quanta):
+            raise ValueError("Every level needs a positive time quantum.")
+        self.quanta = tuple(quanta)
+        self.boost_interval = boost_interval
+        self.next_boost = boost_interval
+        self.levels = [deque() for _ in self.quanta]
+        self.level = {}   # process -> current level
+        self.used = {}    # process -> time used of its current level's allotment
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _boost(self, now):
+        """Move every queued process to the top level if a boost is due; returns True if one was."""
+        if not self.boost_interval or now < self.next_boost:
+            return False
+        while self.next_boost <= now:
+            self.next_boost += self.boost_interval
+        top = self.levels[0]
+        for queue in self.levels[1:]:
+            top.extend(queue)
+            queue.clear()
+        for process in top:
+            self.level[process] = 0
+            self.used[process] = 0
+        return True
+
+    def add(self, process, now):
+        self.level[process] = 0
+        self.used[process] = 0
+        self.levels[0].append(process)
+        self.count += 1
+
+    def requeue(self, process, ran, now):
+        # The running process is not queued, so a boost that came due while it ran is applied to it here.
+        if self._boost(now):
+            self.level[process] = 0
+            self.used[process] = 0
+            self.levels[0].append(process)
+            self.count += 1
+            return
+        level = self.level[process]
+        self.used[process] += ran
+        if self.used[process] >= self.quanta[level]:
+            level = min(level + 1, len(self.quanta) - 1)
+            self.level[process] = level
+            self.used[process] = 0
+            self.levels[level].append(process)
+        else:
+            self.levels[level].appendleft(process)  # Preempted: resume first at its level.
+        self.count += 1
+
+    def pop(self, now):
+        self._boost(now)
+        self.count -= 1
+        for queue in self.levels:
+            if queue:
+                return queue.popleft()
+
+    def steal(self, predicate):
+        """Remove and return the last matching process of the lowest level, or None.
+
+        Unlike pop(), this neither boosts nor changes any other process's level.
+        """
+        for queue in reversed(self.levels):
+            for position in range(len(queue) - 1, -1, -1):
+                if predicate(queue[position]):
+                    process = queue[position]
+                    del queue[position]
+                    del self.level[process], self.used[process]
+                    self.count -= 1
+                    return process
+        return None
+
+    def time_slice(self, process):
+        return self.quanta[self.level[process]] - self.used[process]
+
+    def describe(self, process, units):
+        return f"Process {process.pid} running at level {self.level[process]} for {units} units."
+
+
+class CFSQueue:
+    """Completely Fair Scheduler-style queue ordered by virtual runtime.
+
+    Each process's priority is used as a nice value (-20..19) and turned into a
+    weight as in Linux (1024 at nice 0, about 1.25x per step). Running for t
+    units advances virtual runtime by t * 1024 / weight, and the process with
+    the smallest virtual runtime runs next, so CPU time is shared in proportion
+    to weight. A slice is the process's weighted share of `target_latency`,
+    but never less than `min_granularity`. Arrivals start at the current minimum
+    virtual runtime and preempt the running process.
+    """
+    preemptive = True
+    NICE_0_WEIGHT = 1024
+
+    def __init__(self, target_latency=6, min_granularity=1):
+        if target_latency <= 0 or min_granularity <= 0:
+            raise ValueError("Target latency and minimum granularity must be positive.")
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+        self.heap = []
+        self.counter = 0
+        self.vruntime = {}
+        self.min_vruntime = 0
+        self.queued_weight = 0  # Total weight of the processes waiting in the heap.
+
+    def __len__(self):
+        return len(self.heap)
+
+    @classmethod
+    def weight(cls, process):
+        nice = max(-20, min(19, process.priority))
+        return max(1, round(cls.NICE_0_WEIGHT / 1.25 ** nice))
+
+    def _push(self, process):
+        heapq.heappush(self.heap, (self.vruntime[process], self.counter, process))
+        self.counter += 1
+        self.queued_weight += self.weight(process)
+
+    def add(self, process, now):
+        self.vruntime[process] = max(self.vruntime.get(process, 0), self.min_vruntime)
+        self._push(process)
+
+    def requeue(self, process, ran, now):
+        self.vruntime[process] += ran * self.NICE_0_WEIGHT / self.weight(process)
+        self._push(process)
+
+    def pop(self, now):
+        vruntime, _, process = heapq.heappop(self.heap)
+        self.queued_weight -= self.weight(process)
+        self.min_vruntime = max(self.min_vruntime, vruntime)
+        return process
+
+    def steal(self, predicate):
+        """Remove and return the matching process with the largest virtual runtime, or None.
+
+        min_vruntime is left alone: a migrated process never ran here.
+        """
+        candidates = [position for position, entry in enumerate(self.heap) if predicate(entry[-1])]
+        if not candidates:
+            return None
+        position = max(candidates, key=lambda position: self.heap[position][:-1])
+        _, _, process = _heap_remove(self.heap, position)
+        self.queued_weight -= self.weight(process)
+        del self.vruntime[process]
+        return process
+
+    def time_slice(self, process):
+        weight = self.weight(process)
+        share = self.target_latency * weight // (self.queued_weight + weight)
+        return max(self.min_granularity, share)
+
+    def describe(self, process, units):
+        return f"Process {process.pid} running for {units} units (vruntime {self.vruntime[process]:.2f})."
+
+# --------------------------------------------
+# Discrete-event simulation engine
+# --------------------------------------------
+def simulate(processes, policy, realtime=False, verbose=True):
+    """Run `processes` through `policy` on a virtual clock.
+
+    The clock jumps straight from one event (arrival, end of a slice) to the
+    next, so no real time passes unless `realtime` is set, in which case each
+    slice sleeps for units / 10 seconds like the original demo.
+
+    Returns a dict mapping pid -> per-process metrics.
+    """
+    pending = sorted(processes, key=lambda p: p.arrival_time)
+    for process in pending:
+        process.reset()
+
+    clock = 0
+    index = 0
+    total = len(pending)
+    while index < total or len(policy):
+        # Admit everything that has arrived by now.
+        while index < total and pending[index].arrival_time <= clock:
+            policy.add(pending[index], clock)
+            index += 1
+
+        if not len(policy):
+            # CPU idle: jump to the next arrival.
+            next_arrival = pending[index].arrival_time
+            if realtime:
+                time.sleep((next_arrival - clock) / 10)
+            clock = next_arrival
+            continue
+
+        process = policy.pop(clock)
+        units = process.remaining_time
+        time_slice = policy.time_slice(process)
+        if time_slice is not None:
+            units = min(units, time_slice)
+        if policy.preemptive and index < total:
+            units = min(units, pending[index].arrival_time - clock)
+
+        if process.start_time is None:
+            process.start_time = clock
+        if verbose:
+            print(policy.describe(process, units))
+        if realtime:
+            time.sleep(units / 10)  # Simulate execution
+        clock += units
+        process.remaining_time -= units
+
+        # Arrivals during the slice queue up ahead of the preempted process.
+        while index < total and pending[index].arrival_time <= clock:
+            policy.add(pending[index], clock)
+            index += 1
 
         if process.remaining_time > 0:
-            queue.append(process)  # Re-add to queue if not finished
+            policy.requeue(process, units, clock)  # Re-add to queue if not finished
         else:
-            print(f"Process {process.pid} completed execution.")
+            process.completion_time = clock
+            if verbose:
+                print(f"Process {process.pid} completed execution.")
 
-# Updated Priority-Based Scheduling with Preemption
-def priority_scheduling(processes):
-    priority_queue = []
+    return collect_metrics(pending)
+
+def collect_metrics(processes):
+    """Waiting, turnaround and response time for every finished process."""
+    metrics = {}
     for process in processes:
-        heapq.heappush(priority_queue, (process.priority, process))
+        turnaround = process.completion_time - process.arrival_time
+        metrics[process.pid] = {
+            "arrival": process.arrival_time,
+            "burst": process.execution_time,
+            "priority": process.priority,
+            "completion": process.completion_time,
+            "turnaround": turnaround,
+            "waiting": turnaround - process.execution_time,
+            "response": process.start_time - process.arrival_time,
+        }
+    return metrics
+
+def summarize(metrics):
+    """Average waiting/turnaround/response times, makespan and throughput."""
+    count = len(metrics)
+    if not count:
+        return {"processes": 0}
+    makespan = max(m["completion"] for m in metrics.values())
+    return {
+        "processes": count,
+        "avg_waiting": sum(m["waiting"] for m in metrics.values()) / count,
+        "avg_turnaround": sum(m["turnaround"] for m in metrics.values()) / count,
+        "avg_response": sum(m["response"] for m in metrics.values()) / count,
+        "makespan": makespan,
+        "throughput": count / makespan if makespan else 0.0,
+    }
 
-    while priority_queue:
-        _, process = heapq.heappop(priority_queue)
-        print(f"Executing Process {process.pid} with priority {process.priority} for {process.execution_time} units.")
-        time.sleep(process.execution_time / 10)
+def print_metrics(metrics):
+    print(f"{'PID':>5} {'Arrival':>8} {'Burst':>6} {'Waiting':>8} {'Turnaround':>11} {'Response':>9}")
+    for pid, m in metrics.items():
+        print(f"{pid:>5} {m['arrival']:>8} {m['burst']:>6} {m['waiting']:>8} {m['turnaround']:>11} {m['response']:>9}")
+    summary = summarize(metrics)
+    print(f"Average waiting: {summary['avg_waiting']:.2f}, "
+          f"turnaround: {summary['avg_turnaround']:.2f}, "
+          f"response: {summary['avg_response']:.2f}")
+
+# Updated Round-Robin Scheduling with user-configurable time quantum
+def round_robin(processes, time_quantum, realtime=False, verbose=True):
+    return simulate(processes, RoundRobinQueue(time_quantum), realtime, verbose)
+
+# Updated Priority-Based Scheduling with Preemption
+def priority_scheduling(processes, realtime=False, verbose=True):
+    return simulate(processes, PriorityQueue(), realtime, verbose)
+
+def mlfq_scheduling(processes, quanta=(2, 4, 8), boost_interval=50, realtime=False, verbose=True):
+    return simulate(processes, MLFQQueue(quanta, boost_interval), realtime, verbose)
+
+def cfs_scheduling(processes, target_latency=6, min_granularity=1, realtime=False, verbose=True):
+    return simulate(processes, CFSQueue(target_latency, min_granularity), realtime, verbose)
 
 # Example Usage with User Input for Time Quantum
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-Robin and Priority scheduling simulation.")
+    parser.add_argument("--quantum", type=int, help="Round-Robin time quantum (prompted if omitted)")
+    parser.add_argument("--realtime", action="store_true", help="replay slices in real time for demos")
+    parser.add_argument("--mlfq-quanta", type=int, nargs="+", default=[2, 4, 8], help="MLFQ quantum per level, top first")
+    parser.add_argument("--boost", type=int, default=50, help="MLFQ priority boost interval (0 disables)")
+    parser.add_argument("--latency", type=int, default=6, help="CFS target latency")
+    args = parser.parse_args()
+
     processes = [Process(1, 5, 2), Process(2, 8, 1), Process(3, 3, 3)]
 
     # Get user input for time quantum
-    time_quantum = int(input("Enter time quantum for Round-Robin Scheduling: "))
+    time_quantum = args.quantum
+    if time_quantum is None:
+        time_quantum = int(input("Enter time quantum for Round-Robin Scheduling: "))
 
     print("\nExecuting Round-Robin Scheduling:")
-    round_robin(processes.copy(), time_quantum)
+    print_metrics(round_robin(processes, time_quantum, realtime=args.realtime))
 
     print("\nExecuting Priority-Based Scheduling with Preemption:")
-    priority_scheduling(processes.copy())
+    print_metrics(priority_scheduling(processes, realtime=args.realtime))
+
+    print("\nExecuting Multilevel Feedback Queue Scheduling:")
+    print_metrics(mlfq_scheduling(processes, args.mlfq_quanta, args.boost, realtime=args.realtime))
+
+    print("\nExecuting CFS-style Fair Scheduling:")
+    print_metrics(cfs_scheduling(processes, args.latency, realtime=args.realtime))
@@ -0,0 +1,97 @@
+"""
+Parallel parameter sweeps over scheduling policies.
+
+Every (policy x time quantum x workload) combination is simulated in a
+ProcessPoolExecutor worker and written as one row of a CSV table. Rows are
+appended as soon as they finish, so an interrupted sweep can be re-run with the
+same output file and only the missing configurations are simulated.
+
+Workloads are either CSV files with `pid,burst,priority,arrival` columns or
+synthetic specs of the form `random:<jobs>:<seed>[:<arrival_span>]`.
+
+Example:
+    python3 sweep.py --policies RR PRIORITY --quanta 1 2 4 8 \\
+        --workloads random:1000:1 random:1000:2 --output results.csv
+"""
+
+import csv
+import random
+import argparse
+import itertools
+
+from sweep_runner import run_sweep
+from process_scheduling import Process, RoundRobinQueue, PriorityQueue, MLFQQueue, CFSQueue, simulate, summarize
+
+
+def mlfq_from_quantum(quantum):
+    """Three-level MLFQ whose quanta double from `quantum` at the top level."""
+    return MLFQQueue((quantum, 2 * quantum, 4 * quantum))
+
+
+# Policies that take a time quantum; the others are swept once per workload.
+QUANTUM_POLICIES = {"RR": RoundRobinQueue, "MLFQ": mlfq_from_quantum}
+POLICIES = {"RR": RoundRobinQueue, "PRIORITY": PriorityQueue, "MLFQ": mlfq_from_quantum, "CFS": CFSQueue}
+
+FIELDS = ["policy", "quantum", "workload", "processes", "avg_waiting",
+          "avg_turnaround", "avg_response", "makespan", "throughput"]
+KEY_FIELDS = ("policy", "quantum", "workload")
+
+
+def load_workload(spec):
+    """Yield (pid, burst, priority, arrival) rows for a workload spec.
+
+    Rows are generated afresh on every call rather than cached, so a worker
+    process never holds more than the workload it is simulating.
+    """
+    if spec.startswith("random:"):
+        fields = spec.split(":")[1:]
+        jobs, seed = int(fields[0]), int(fields[1])
+        arrival_span = int(fields[2]) if len(fields) > 2 else 0
+        rng = random.Random(seed)
+        for pid in range(1, jobs + 1):
+            yield pid, rng.randint(1, 100), rng.randint(0, 9), rng.randint(0, arrival_span) if arrival_span else 0
+        return
+    with open(spec, newline="") as file:
+        for row in csv.DictReader(file):
+            yield row["pid"], int(row["burst"]), int(row.get("priority") or 0), int(row.get("arrival") or 0)
+
+
+def make_policy(name, quantum):
+    if name in QUANTUM_POLICIES:
+        return QUANTUM_POLICIES[name](quantum)
+    return POLICIES[name]()
+
+
+def run_config(config):
+    """Simulate a single configuration; runs inside a worker process."""
+    processes = [Process(pid, burst, priority, arrival) for pid, burst, priority, arrival in load_workload(config["workload"])]
+    metrics = simulate(processes, make_policy(config["policy"], config["quantum"]), verbose=False)
+    row = dict(config)
+    row.update(summarize(metrics))
+    return row
+
+
+def build_grid(policies, quanta, workloads):
+    configs = []
+    for policy, workload in itertools.product(policies, workloads):
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported policy {policy}. Use one of {', '.join(POLICIES)}.")
+        if policy in QUANTUM_POLICIES:
+            configs.extend({"policy": policy, "quantum": q, "workload": workload} for q in quanta)
+        else:
+            configs.append({"policy": policy, "quantum": "", "workload": workload})
+    return configs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep scheduling policies over quanta and workloads.")
+    parser.add_argument("--policies", nargs="+", default=["RR", "PRIORITY"], type=str.upper)
+    parser.add_argument("--quanta", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--workloads", nargs="+", default=["random:1000:1"])
+    parser.add_argument("--output", default="sweep_results.csv")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    grid = build_grid(args.policies, args.quanta, args.workloads)
+    written = run_sweep(grid, args.output, run_config, FIELDS, KEY_FIELDS, args.workers)
+    print(f"[Sweep] {len(grid)} configurations, {written} simulated, {len(grid) - written} already in {args.output}")
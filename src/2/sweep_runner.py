@@ -0,0 +1,51 @@
+"""
+Resumable parallel sweeps for sweep.py.
+
+The page replacement sweep in src/3 keeps an identical copy of this module,
+so each deliverable runs on its own; change both together.
+
+A sweep is a list of configuration dicts. Each one is run in a
+ProcessPoolExecutor worker and written as one row of a CSV table as soon as
+it finishes. The `key_fields` of a configuration identify it, so re-running
+with the same output file only runs the configurations that are missing.
+"""
+
+import os
+import csv
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def config_key(row, key_fields):
+    return tuple(str(row[field]) for field in key_fields)
+
+
+def completed_keys(output, key_fields):
+    """Keys of configurations already present in a previous (partial) run."""
+    if not os.path.exists(output):
+        return set()
+    with open(output, newline="") as file:
+        return {config_key(row, key_fields) for row in csv.DictReader(file)}
+
+
+def run_sweep(configs, output, worker, fields, key_fields, workers=None):
+    """Run `worker(config)` for each of `configs` across a process pool, appending one CSV row per result.
+
+    Configurations already in `output` are skipped. Returns the number of rows written.
+    """
+    done = completed_keys(output, key_fields)
+    todo = [config for config in configs if config_key(config, key_fields) not in done]
+    if not todo:
+        return 0
+
+    write_header = not os.path.exists(output) or os.path.getsize(output) == 0
+    written = 0
+    with open(output, "a", newline="") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+        if write_header:
+            writer.writeheader()
+        futures = [executor.submit(worker, config) for config in todo]
+        for future in as_completed(futures):
+            writer.writerow(future.result())
+            file.flush()  # Keep finished rows if the sweep is interrupted.
+            written += 1
+    return written
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+High-throughput bounded buffer for the Producer-Consumer problem.
+
+The demo ProducerConsumer in main.py moves one item at a time through a list
+guarded by two semaphores and a mutex, and sleeps between items. RingBuffer
+keeps the same blocking semantics (producers wait while full, consumers wait
+while empty) but:
+
+- stores items in a preallocated circular array, so nothing is shifted on get;
+- moves whole batches with put_many/get_many, so one lock acquisition and one
+  wake-up are amortized over many items;
+- supports any number of producers and consumers, and close() for shutdown.
+
+`run_benchmark` drives N producers and M consumers through the buffer and
+reports items/second and end-to-end latency percentiles.
+
+Example:
+    python3 bounded_buffer.py --items 2000000 --producers 2 --consumers 2 --batch 256
+"""
+
+import time
+import queue
+import argparse
+import threading
+
+
+class BufferClosed(Exception):
+    """Raised by put/put_many after close()."""
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0       # Index of the oldest item.
+        self.count = 0      # Items currently buffered.
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self):
+        return self.count
+
+    def put_many(self, items):
+        """Append every item, blocking while the buffer is full."""
+        slots, capacity = self.slots, self.capacity
+        offset, total = 0, len(items)
+        while offset < total:
+            with self.not_full:
+                while self.count == capacity and not self.closed:
+                    self.not_full.wait()
+                if self.closed:
+                    raise BufferClosed()
+                take = min(capacity - self.count, total - offset)
+                tail = (self.head + self.count) % capacity
+                first = min(take, capacity - tail)
+                slots[tail:tail + first] = items[offset:offset + first]
+                if take > first:
+                    slots[:take - first] = items[offset + first:offset + take]
+                self.count += take
+                offset += take
+                if take > 1:
+                    self.not_empty.notify_all()
+                else:
+                    self.not_empty.notify()
+
+    def get_many(self, max_items):
+        """Remove up to `max_items`, blocking while empty; returns [] once closed and drained."""
+        slots, capacity = self.slots, self.capacity
+        with self.not_empty:
+            while self.count == 0:
+                if self.closed:
+                    return []
+                self.not_empty.wait()
+            take = min(max_items, self.count)
+            head = self.head
+            first = min(take, capacity - head)
+            items = slots[head:head + first]
+            slots[head:head + first] = [None] * first
+            if take > first:
+                items += slots[:take - first]
+                slots[:take - first] = [None] * (take - first)
+            self.head = (head + take) % capacity
+            self.count -= take
+            if take > 1:
+                self.not_full.notify_all()
+            else:
+                self.not_full.notify()
+            return items
+
+    def put(self, item):
+        self.put_many([item])
+
+    def get(self):
+        items = self.get_many(1)
+        if not items:
+            raise BufferClosed()
+        return items[0]
+
+    def close(self):
+        """Wake everyone; consumers drain what is left and then get []."""
+        with self.lock:
+            self.closed = True
+            self.not_empty.notify_all()
+            self.not_full.notify_all()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _report(mode, items, elapsed, latencies):
+    latencies.sort()
+    return {
+        "mode": mode,
+        "items": items,
+        "elapsed": elapsed,
+        "items_per_sec": items / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p95_us": percentile(latencies, 0.95) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+    }
+
+
+def _split(total, parts):
+    share, extra = divmod(total, parts)
+    return [share + (1 if i < extra else 0) for i in range(parts)]
+
+
+def run_benchmark(items=1_000_000, producers=1, consumers=1, batch_size=256, capacity=4096):
+    """Move `items` through a RingBuffer; each item is its enqueue timestamp (ns)."""
+    buffer = RingBuffer(capacity)
+    results = [[] for _ in range(consumers)]
+    clock = time.perf_counter_ns
+
+    def producer(count):
+        while count > 0:
+            size = min(batch_size, count)
+            buffer.put_many([clock()] * size)
+            count -= size
+
+    def consumer(latencies):
+        record = latencies.extend
+        while True:
+            batch = buffer.get_many(batch_size)
+            if not batch:
+                return
+            now = clock()
+            record([now - stamp for stamp in batch])
+
+    prod_threads = [threading.Thread(target=producer, args=(n,)) for n in _split(items, producers)]
+    cons_threads = [threading.Thread(target=consumer, args=(results[i],)) for i in range(consumers)]
+    started = time.perf_counter()
+    for thread in cons_threads + prod_threads:
+        thread.start()
+    for thread in prod_threads:
+        thread.join()
+    buffer.close()
+    for thread in cons_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return _report(f"ring x{batch_size}", items, elapsed, [lat for part in results for lat in part])
+
+
+def run_queue_benchmark(items=1_000_000, producers=1, consumers=1, capacity=4096):
+    """Same workload through queue.Queue, one item per put/get, for comparison."""
+    buffer = queue.Queue(maxsize=capacity)
+    results = [[] for _ in range(consumers)]
+    clock = time.perf_counter_ns
+    done = object()
+
+    def producer(count):
+        put = buffer.put
+        for _ in range(count):
+            put(clock())
+
+    def consumer(latencies):
+        get, record = buffer.get, latencies.append
+        while True:
+            stamp = get()
+            if stamp is done:
+                return
+            record(clock() - stamp)
+
+    prod_threads = [threading.Thread(target=producer, args=(n,)) for n in _split(items, producers)]
+    cons_threads = [threading.Thread(target=consumer, args=(results[i],)) for i in range(consumers)]
+    started = time.perf_counter()
+    for thread in cons_threads + prod_threads:
+        thread.start()
+    for thread in prod_threads:
+        thread.join()
+    for _ in cons_threads:
+        buffer.put(done)
+    for thread in cons_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return _report("queue.Queue", items, elapsed, [lat for part in results for lat in part])
+
+
+def print_report(report):
+    print(f"{report['mode']:<14} {report['items_per_sec']:>14,.0f} items/s   "
+          f"p50 {report['p50_us']:>10.1f}us  p95 {report['p95_us']:>10.1f}us  p99 {report['p99_us']:>10.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Producer-Consumer throughput benchmark.")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--producers", type=int, default=1)
+    parser.add_argument("--consumers", type=int, default=1)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16, 256], help="batch sizes to compare")
+    parser.add_argument("--capacity", type=int, default=4096, help="buffer slots")
+    args = parser.parse_args()
+
+    print(f"{args.items} items, {args.producers} producer(s), {args.consumers} consumer(s), capacity {args.capacity}")
+    print_report(run_queue_benchmark(args.items, args.producers, args.consumers, args.capacity))
+    for batch_size in args.batch:
+        print_report(run_benchmark(args.items, args.producers, args.consumers, batch_size, args.capacity))
@@ -0,0 +1,184 @@
+"""
+Event sinks for MemoryManager and ProducerConsumer.
+
+The simulations report what happens (page hits, faults, replacements,
+produced and consumed items) by calling a sink method with the raw values.
+Only the sink decides whether and how to format them, so a NullSink or
+CounterSink keeps string formatting out of the hot path entirely.
+
+- NullSink:        drop everything.
+- CounterSink:     count events by name.
+- RingBufferSink:  keep the last N events as tuples.
+- JsonLinesSink:   write one JSON object per event to a file.
+- RichSink:        the original colored console output (plain print without rich).
+"""
+
+import json
+import time
+from collections import Counter, deque
+
+_console_print = None
+
+
+def rprint(*args):
+    """Print with rich markup, importing rich on first use (plain print without it)."""
+    global _console_print
+    if _console_print is None:
+        try:
+            from rich import print as console_print
+        except ImportError:
+            console_print = print
+        _console_print = console_print
+    _console_print(*args)
+
+
+class NullSink:
+    """Discards every event."""
+
+    def page_hit(self, process_id, page):
+        pass
+
+    def page_fault(self, process_id, page):
+        pass
+
+    def page_replaced(self, algorithm, process_id, page):
+        pass
+
+    def process_deallocated(self, process_id):
+        pass
+
+    def produced(self, item, buffer):
+        pass
+
+    def consumed(self, item, buffer):
+        pass
+
+    def close(self):
+        pass
+
+
+class CounterSink(NullSink):
+    """Counts events by name in `self.counts`."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def page_hit(self, process_id, page):
+        self.counts["page_hit"] += 1
+
+    def page_fault(self, process_id, page):
+        self.counts["page_fault"] += 1
+
+    def page_replaced(self, algorithm, process_id, page):
+        self.counts["page_replaced"] += 1
+
+    def process_deallocated(self, process_id):
+        self.counts["process_deallocated"] += 1
+
+    def produced(self, item, buffer):
+        self.counts["produced"] += 1
+
+    def consumed(self, item, buffer):
+        self.counts["consumed"] += 1
+
+
+class RingBufferSink(NullSink):
+    """Keeps the most recent `capacity` events as (event, *fields) tuples."""
+
+    def __init__(self, capacity=1024):
+        self.events = deque(maxlen=capacity)
+
+    def page_hit(self, process_id, page):
+        self.events.append(("page_hit", process_id, page))
+
+    def page_fault(self, process_id, page):
+        self.events.append(("page_fault", process_id, page))
+
+    def page_replaced(self, algorithm, process_id, page):
+        self.events.append(("page_replaced", algorithm, process_id, page))
+
+    def process_deallocated(self, process_id):
+        self.events.append(("process_deallocated", process_id))
+
+    def produced(self, item, buffer):
+        self.events.append(("produced", item, len(buffer)))
+
+    def consumed(self, item, buffer):
+        self.events.append(("consumed", item, len(buffer)))
+
+
+class JsonLinesSink(NullSink):
+    """Writes each event as a JSON object on its own line."""
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def _write(self, record):
+        record["time"] = time.time()
+        self.file.write(json.dumps(record) + "\n")
+
+    def page_hit(self, process_id, page):
+        self._write({"event": "page_hit", "process": process_id, "page": page})
+
+    def page_fault(self, process_id, page):
+        self._write({"event": "page_fault", "process": process_id, "page": page})
+
+    def page_replaced(self, algorithm, process_id, page):
+        self._write({"event": "page_replaced", "algorithm": algorithm, "process": process_id, "page": page})
+
+    def process_deallocated(self, process_id):
+        self._write({"event": "process_deallocated", "process": process_id})
+
+    def produced(self, item, buffer):
+        self._write({"event": "produced", "item": item, "buffered": len(buffer)})
+
+    def consumed(self, item, buffer):
+        self._write({"event": "consumed", "item": item, "buffered": len(buffer)})
+
+    def close(self):
+        self.file.close()
+
+
+class RichSink(NullSink):
+    """Colored console output; falls back to plain print when rich is not installed."""
+
+    def __init__(self):
+        self.print = rprint
+
+    def page_hit(self, process_id, page):
+        self.print(f"[green][Process {process_id}][/green] Page {page} accessed (in memory).")
+
+    def page_fault(self, process_id, page):
+        self.print(f"[red][Process {process_id}][/red] *** Page {page} fault! ***")
+
+    def page_replaced(self, algorithm, process_id, page):
+        self.print(f"[bold yellow][{algorithm}][/bold yellow] Replacing: Removed page {page} from process {process_id}")
+
+    def process_deallocated(self, process_id):
+        self.print(f"[blue][Process {process_id}][/blue] Deallocating all pages.")
+
+    def produced(self, item, buffer):
+        self.print(f"[bold green][Producer][/bold green] Produced {item}. Buffer: {buffer}")
+
+    def consumed(self, item, buffer):
+        self.print(f"[bold blue][Consumer][/bold blue] Consumed {item}. Buffer: {buffer}")
+
+
+SINKS = {
+    "rich": RichSink,
+    "null": NullSink,
+    "counters": CounterSink,
+    "ring": RingBufferSink,
+    "jsonl": JsonLinesSink,
+}
+
+
+def make_sink(name, path=None):
+    """Build a sink by name; `jsonl` writes to `path`."""
+    if name not in SINKS:
+        raise ValueError(f"Unsupported sink. Use one of {', '.join(SINKS)}.")
+    if name == "jsonl":
+        if path is None:
+            raise ValueError("The jsonl sink needs an output path.")
+        return JsonLinesSink(path)
+    return SINKS[name]()
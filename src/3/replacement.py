@@ -0,0 +1,439 @@
+"""
+Page replacement policies for MemoryManager.
+
+Every policy tracks the set of resident keys (here `(process_id, page)`
+tuples) and decides which one to evict. MemoryManager drives a policy through
+four calls:
+
+- `hit(key)`:     a resident key was accessed.
+- `insert(key)`:  a page fault loads `key`; returns the evicted key, or None
+                  if a free frame was available.
+- `remove(key)`:  a resident key was freed (process deallocation).
+- `len(policy)`:  number of resident keys.
+
+All online policies run in O(1) per access. OPT (Belady) is an offline
+baseline: it is built from the whole reference string and looks up each
+page's next use in a precomputed index.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+
+
+class ReplacementPolicy(ABC):
+    """Base class for page replacement policies."""
+    name = None
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+
+    @abstractmethod
+    def __len__(self):
+        """Number of pages resident."""
+
+    @abstractmethod
+    def __contains__(self, key):
+        """True if `key` is resident."""
+
+    @abstractmethod
+    def hit(self, key):
+        """Record an access to the resident page `key`."""
+
+    @abstractmethod
+    def insert(self, key):
+        """Load `key`; returns the evicted page, or None if there was room."""
+
+    @abstractmethod
+    def remove(self, key):
+        """Drop the resident page `key`, e.g. when its process is deallocated."""
+
+
+class FIFOPolicy(ReplacementPolicy):
+    """Evict the page that was loaded first."""
+    name = 'FIFO'
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.queue = OrderedDict()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __contains__(self, key):
+        return key in self.queue
+
+    def hit(self, key):
+        pass
+
+    def insert(self, key):
+        victim = None
+        if len(self.queue) >= self.capacity:
+            victim, _ = self.queue.popitem(last=False)
+        self.queue[key] = None
+        return victim
+
+    def remove(self, key):
+        del self.queue[key]
+
+
+class LRUPolicy(FIFOPolicy):
+    """Evict the least recently used page; hits move a page to the back of the queue."""
+    name = 'LRU'
+
+    def hit(self, key):
+        self.queue.move_to_end(key)
+
+
+class SecondChancePolicy(ReplacementPolicy):
+    """FIFO with a reference bit: a referenced page is re-queued once instead of evicted."""
+    name = 'SECOND_CHANCE'
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.queue = OrderedDict()  # key -> reference bit
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __contains__(self, key):
+        return key in self.queue
+
+    def hit(self, key):
+        self.queue[key] = True
+
+    def insert(self, key):
+        victim = None
+        if len(self.queue) >= self.capacity:
+            while True:
+                candidate, referenced = self.queue.popitem(last=False)
+                if not referenced:
+                    victim = candidate
+                    break
+                self.queue[candidate] = False  # Second chance: clear the bit and re-queue.
+        self.queue[key] = False
+        return victim
+
+    def remove(self, key):
+        del self.queue[key]
+
+
+class ClockPolicy(ReplacementPolicy):
+    """Second chance over a fixed circular array of frames swept by a clock hand."""
+    name = 'CLOCK'
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.slots = []        # Frame -> key (None once freed).
+        self.referenced = []   # Frame -> reference bit.
+        self.slot_of = {}      # key -> frame
+        self.free = []         # Frames freed by remove().
+        self.hand = 0
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, key):
+        return key in self.slot_of
+
+    def hit(self, key):
+        self.referenced[self.slot_of[key]] = True
+
+    def insert(self, key):
+        victim = None
+        if self.free:
+            slot = self.free.pop()
+        elif len(self.slots) < self.capacity:
+            slot = len(self.slots)
+            self.slots.append(None)
+            self.referenced.append(False)
+        else:
+            slots, referenced = self.slots, self.referenced
+            hand = self.hand
+            while referenced[hand]:
+                referenced[hand] = False
+                hand = (hand + 1) % self.capacity
+            slot = hand
+            victim = slots[slot]
+            del self.slot_of[victim]
+            self.hand = (hand + 1) % self.capacity
+        self.slots[slot] = key
+        self.referenced[slot] = False
+        self.slot_of[key] = slot
+        return victim
+
+    def remove(self, key):
+        slot = self.slot_of.pop(key)
+        self.slots[slot] = None
+        self.referenced[slot] = False
+        self.free.append(slot)
+
+
+class LFUPolicy(ReplacementPolicy):
+    """Evict the least frequently used page (LRU among ties) using O(1) frequency buckets."""
+    name = 'LFU'
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.frequency = {}   # key -> access count
+        self.buckets = {}     # access count -> OrderedDict of keys, oldest first
+        self.min_frequency = 0
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def __contains__(self, key):
+        return key in self.frequency
+
+    def _unlink(self, key, count):
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+
+    def hit(self, key):
+        count = self.frequency[key]
+        self._unlink(key, count)
+        if count == self.min_frequency and count not in self.buckets:
+            self.min_frequency = count + 1
+        self.frequency[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def insert(self, key):
+        victim = None
+        if len(self.frequency) >= self.capacity:
+            if self.min_frequency not in self.buckets:
+                # Only stale after remove(); recompute from the remaining buckets.
+                self.min_frequency = min(self.buckets)
+            bucket = self.buckets[self.min_frequency]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_frequency]
+            del self.frequency[victim]
+        self.frequency[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_frequency = 1
+        return victim
+
+    def remove(self, key):
+        self._unlink(key, self.frequency.pop(key))
+
+
+class ARCPolicy(ReplacementPolicy):
+    """Adaptive Replacement Cache (Megiddo & Modha).
+
+    T1 holds pages seen once recently, T2 pages seen at least twice; B1 and B2
+    remember keys recently evicted from each. Ghost hits shift the target size
+    `p` of T1 towards whichever list would have kept the page.
+    """
+    name = 'ARC'
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+    def __contains__(self, key):
+        return key in self.t1 or key in self.t2
+
+    def hit(self, key):
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+        self.t2[key] = None
+
+    def _replace(self, in_b2):
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return None
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p)):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = None
+        return victim
+
+    def insert(self, key):
+        c = self.capacity
+        if key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            victim = self._replace(False)
+            del self.b1[key]
+            self.t2[key] = None
+            return victim
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            victim = self._replace(True)
+            del self.b2[key]
+            self.t2[key] = None
+            return victim
+
+        victim = None
+        l1 = len(self.t1) + len(self.b1)
+        total = l1 + len(self.t2) + len(self.b2)
+        if l1 >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                victim = self._replace(False)
+            else:
+                victim, _ = self.t1.popitem(last=False)
+        elif total >= c:
+            if total >= 2 * c:
+                self.b2.popitem(last=False)
+            victim = self._replace(False)
+        self.t1[key] = None
+        return victim
+
+    def remove(self, key):
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+
+
+class TwoQPolicy(ReplacementPolicy):
+    """2Q (Johnson & Shasha): new pages wait in a FIFO (A1in) and are promoted
+    to the LRU main queue (Am) only if re-referenced after leaving it (A1out ghost).
+    """
+    name = '2Q'
+
+    def __init__(self, capacity, kin=0.25, kout=0.5):
+        super().__init__(capacity)
+        self.kin = max(1, int(capacity * kin))
+        self.kout = max(1, int(capacity * kout))
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def __len__(self):
+        return len(self.a1in) + len(self.am)
+
+    def __contains__(self, key):
+        return key in self.am or key in self.a1in
+
+    def hit(self, key):
+        if key in self.am:
+            self.am.move_to_end(key)
+        # Hits in A1in deliberately do nothing (correlated references).
+
+    def _reclaim(self):
+        if len(self.a1in) + len(self.am) < self.capacity:
+            return None
+        if len(self.a1in) > self.kin or not self.am:
+            victim, _ = self.a1in.popitem(last=False)
+            self.a1out[victim] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+        else:
+            victim, _ = self.am.popitem(last=False)
+        return victim
+
+    def insert(self, key):
+        victim = self._reclaim()
+        if key in self.a1out:
+            del self.a1out[key]
+            self.am[key] = None
+        else:
+            self.a1in[key] = None
+        return victim
+
+    def remove(self, key):
+        if key in self.am:
+            del self.am[key]
+        else:
+            del self.a1in[key]
+
+
+class OPTPolicy(ReplacementPolicy):
+    """Belady's optimal policy: evict the page whose next use is furthest away.
+
+    `trace` is the full sequence of keys that will be accessed, in order. It is
+    scanned once to build a next-use index, so every hit and insert must follow
+    the trace exactly.
+    """
+    name = 'OPT'
+    NEVER = 2 ** 62
+
+    def __init__(self, capacity, trace):
+        super().__init__(capacity)
+        self.next_use = array('q')
+        last_seen = {}
+        for position, key in enumerate(trace):
+            previous = last_seen.get(key)
+            if previous is not None:
+                self.next_use[previous] = position
+            last_seen[key] = position
+            self.next_use.append(self.NEVER)
+        self.position = 0
+        self.resident = {}  # key -> position of its next use
+        self.heap = []      # (-next use, key); entries go stale when the key moves on
+
+    def __len__(self):
+        return len(self.resident)
+
+    def __contains__(self, key):
+        return key in self.resident
+
+    def _advance(self, key):
+        if self.position >= len(self.next_use):
+            raise IndexError("OPT policy accessed past the end of its trace.")
+        upcoming = self.next_use[self.position]
+        self.position += 1
+        self.resident[key] = upcoming
+        heapq.heappush(self.heap, (-upcoming, key))
+        if len(self.heap) > 4 * self.capacity + 64:
+            # Drop stale entries so the heap stays proportional to the frames.
+            self.heap = [(-nxt, k) for k, nxt in self.resident.items()]
+            heapq.heapify(self.heap)
+
+    def hit(self, key):
+        self._advance(key)
+
+    def insert(self, key):
+        victim = None
+        if len(self.resident) >= self.capacity:
+            while True:
+                upcoming, candidate = heapq.heappop(self.heap)
+                if self.resident.get(candidate) == -upcoming:
+                    break
+            del self.resident[candidate]
+            victim = candidate
+        self._advance(key)
+        return victim
+
+    def remove(self, key):
+        del self.resident[key]
+
+
+POLICIES = {
+    'FIFO': FIFOPolicy,
+    'LRU': LRUPolicy,
+    'SECOND_CHANCE': SecondChancePolicy,
+    'CLOCK': ClockPolicy,
+    'LFU': LFUPolicy,
+    'ARC': ARCPolicy,
+    '2Q': TwoQPolicy,
+    'OPT': OPTPolicy,
+}
+
+
+def make_policy(name, capacity, trace=None):
+    """Build a policy by name; OPT additionally needs the full key `trace`."""
+    name = name.upper()
+    if name not in POLICIES:
+        raise ValueError(f"Unsupported algorithm. Use one of {', '.join(POLICIES)}.")
+    if name == 'OPT':
+        if trace is None:
+            raise ValueError("OPT needs the full page reference trace.")
+        return OPTPolicy(capacity, trace)
+    return POLICIES[name](capacity)
@@ -0,0 +1,157 @@
+"""
+Headless chart rendering for the memory management simulation.
+
+matplotlib is imported only when a chart is drawn, and always with the
+non-interactive Agg backend, so batch jobs never open (or block on) a GUI
+window. Long series are decimated before plotting: min-max decimation keeps
+every spike in each bucket, LTTB (largest triangle three buckets) keeps the
+visually most significant point per bucket. Several charts can be rendered in
+parallel worker processes with `render_charts`.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+OUTPUT_DIR = os.path.join("graphs", "3")
+MAX_POINTS = 2000  # Points actually drawn for a long series.
+
+
+def _pyplot():
+    """Import pyplot on first use, forcing a non-interactive backend."""
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _save(plt, name, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    save_path = os.path.join(output_dir, name)
+    plt.tight_layout()
+    plt.savefig(save_path)
+    plt.close()
+    return save_path
+
+
+# --------------------------------------------
+# Decimation
+# --------------------------------------------
+def min_max_decimate(values, max_points=MAX_POINTS):
+    """Reduce `values` to about `max_points` (x, y) pairs keeping each bucket's min and max.
+
+    x values are 1-based step numbers, matching the original usage plot.
+    """
+    count = len(values)
+    if count <= max_points:
+        return list(range(1, count + 1)), list(values)
+    buckets = max(1, max_points // 2)
+    size = count / buckets
+    xs, ys = [], []
+    for bucket in range(buckets):
+        start = int(bucket * size)
+        end = int((bucket + 1) * size)
+        chunk = list(values[start:end])
+        low = chunk.index(min(chunk))
+        high = chunk.index(max(chunk))
+        for offset in sorted((low, high)) if low != high else (low,):
+            xs.append(start + offset + 1)
+            ys.append(chunk[offset])
+    return xs, ys
+
+
+def lttb(values, max_points=MAX_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling to `max_points` (x, y) pairs."""
+    count = len(values)
+    if count <= max_points or max_points < 3:
+        return list(range(1, count + 1)), list(values)
+    xs, ys = [1], [values[0]]
+    size = (count - 2) / (max_points - 2)
+    previous = 0
+    for bucket in range(max_points - 2):
+        start = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        # Average of the next bucket is the third corner of the triangle.
+        next_start = end
+        next_end = min(int((bucket + 2) * size) + 1, count)
+        next_span = values[next_start:next_end] or [values[-1]]
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(next_span) / len(next_span)
+
+        px, py = previous, values[previous]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((px - avg_x) * (values[i] - py) - (px - i) * (avg_y - py))
+            if area > best_area:
+                best, best_area = i, area
+        xs.append(best + 1)
+        ys.append(values[best])
+        previous = best
+    xs.append(count)
+    ys.append(values[-1])
+    return xs, ys
+
+
+DECIMATORS = {"minmax": min_max_decimate, "lttb": lttb}
+
+
+# --------------------------------------------
+# Charts
+# --------------------------------------------
+def page_fault_chart(page_faults, algorithm, output_dir=OUTPUT_DIR):
+    plt = _pyplot()
+    processes = list(page_faults.keys())
+    faults = [page_faults[pid] for pid in processes]
+
+    plt.figure(figsize=(6, 4))
+    plt.bar([str(pid) for pid in processes], faults, color='skyblue')
+    plt.title(f"Page Faults per Process ({algorithm})")
+    plt.xlabel("Process ID")
+    plt.ylabel("Page Fault Count")
+    return _save(plt, f"page_faults_{algorithm}.png", output_dir)
+
+
+def memory_usage_chart(usage_list, algorithm, output_dir=OUTPUT_DIR, max_points=MAX_POINTS, method="minmax"):
+    plt = _pyplot()
+    steps, usage = DECIMATORS[method](usage_list, max_points)
+
+    plt.figure(figsize=(6, 4))
+    # Markers only while individual steps are still distinguishable.
+    marker = 'o' if len(usage_list) <= 100 else None
+    plt.plot(steps, usage, marker=marker, linestyle='-', color='green')
+    plt.title(f"Memory Usage Over Time ({algorithm})")
+    plt.xlabel("Step")
+    plt.ylabel("Total Pages Loaded")
+    return _save(plt, f"memory_usage_{algorithm}.png", output_dir)
+
+
+def miss_ratio_chart(curve, algorithm, output_dir=OUTPUT_DIR, max_points=MAX_POINTS):
+    plt = _pyplot()
+    frames, ratios = lttb(curve["miss_ratio"], max_points)
+
+    plt.figure(figsize=(6, 4))
+    plt.plot([curve["frames"][x - 1] for x in frames], ratios, linestyle='-', color='purple')
+    plt.title(f"Miss Ratio vs. Frames ({algorithm})")
+    plt.xlabel("Total Frames")
+    plt.ylabel("Miss Ratio")
+    plt.ylim(0, 1)
+    return _save(plt, f"miss_ratio_{algorithm}.png", output_dir)
+
+
+CHARTS = {
+    "page_faults": page_fault_chart,
+    "memory_usage": memory_usage_chart,
+    "miss_ratio": miss_ratio_chart,
+}
+
+
+def _render(job):
+    kind, args = job
+    return CHARTS[kind](*args)
+
+
+def render_charts(jobs, workers=None):
+    """Render (chart kind, args) jobs in parallel worker processes; returns saved paths in order."""
+    if len(jobs) == 1:
+        return [_render(jobs[0])]
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as executor:
+        return list(executor.map(_render, jobs))
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Process-based Producer-Consumer over a shared-memory ring.
+
+ProducerConsumer (main.py) and RingBuffer (bounded_buffer.py) are threads in
+one interpreter, so the GIL keeps them on one core. ShmRing places a bounded
+ring of fixed-size slots in a `multiprocessing.shared_memory` block, so the
+producer and consumer can run in separate processes on separate cores:
+
+- SPSC (default) is lock-free. The producer only writes `tail` and the
+  consumer only writes `head`, both as aligned 8-byte counters on their own
+  cache lines. A slot is published by advancing `tail` after its payload
+  and length are written. This relies on aligned 64-bit stores being atomic
+  and on stores becoming visible in program order, as on x86-64.
+- MPMC (`mpmc=True`) adds one lock per side, so any number of producer
+  processes and consumer processes can share the ring.
+
+Payloads are not pickled. `reserve`/`commit` let a producer build a message
+directly in its slot. `peek`/`consume` let a consumer read it in place
+through a memoryview. `put`/`get` are the copying conveniences.
+
+`run_benchmark` compares threads + queue.Queue, processes +
+multiprocessing.Queue, and processes + ShmRing for several payload sizes.
+
+The integrated shell in src/4 keeps a copy of this module; change both together.
+
+Example:
+    python3 shm_ring.py --messages 50000 --sizes 64 1024 65536
+"""
+
+import os
+import time
+import queue
+import argparse
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+# Header layout in 8-byte words; head and tail sit on separate cache lines.
+HEAD, TAIL, CLOSED, SLOTS, SLOT_SIZE = 0, 8, 16, 24, 25
+HEADER_BYTES = 256
+LENGTH_BYTES = 8
+SPIN_LIMIT = 200  # Empty polls before a waiting side starts to yield the CPU.
+
+
+def _round_up(value, multiple=8):
+    return (value + multiple - 1) // multiple * multiple
+
+
+def _attach(name):
+    """Open an existing block without taking over its cleanup.
+
+    Before Python 3.13 attaching always registers the block with the resource
+    tracker; multiprocessing children share their parent's tracker, where the
+    repeat registration is a no-op, so the creator's unlink() still settles it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _backoff(spins):
+    """Spin briefly, then yield, then sleep, so an idle side does not burn a core."""
+    if spins < SPIN_LIMIT:
+        return
+    if spins < 2 * SPIN_LIMIT:
+        os.sched_yield()
+    else:
+        time.sleep(0.0001)
+
+
+class RingClosed(Exception):
+    """Raised by put/reserve after close()."""
+
+
+class ShmRing:
+    def __init__(self, slots=1024, slot_size=4096, mpmc=False, name=None):
+        """Create a ring of `slots` messages of at most `slot_size` bytes each.
+
+        Pass `name` to attach to an existing ring instead (slots and slot_size
+        are then read from its header).
+        """
+        if name is None:
+            if slots <= 0 or slot_size <= 0:
+                raise ValueError("Slots and slot size must be positive.")
+            stride = LENGTH_BYTES + _round_up(slot_size)
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + slots * stride)
+            self.owner = True
+            header = self.shm.buf[:HEADER_BYTES].cast("Q")
+            header[HEAD] = header[TAIL] = header[CLOSED] = 0
+            header[SLOTS], header[SLOT_SIZE] = slots, slot_size
+            header.release()
+        else:
+            self.shm = _attach(name)
+            self.owner = False
+        self._map()
+        if mpmc is True:
+            mpmc = (multiprocessing.Lock(), multiprocessing.Lock())
+        self.locks = mpmc or None  # (producer lock, consumer lock) when shared by many.
+
+    def _map(self):
+        buf = self.shm.buf
+        self.ctrl = buf.cast("Q")  # Whole block as words: header fields and slot lengths.
+        self.slots = self.ctrl[SLOTS]
+        self.slot_size = self.ctrl[SLOT_SIZE]
+        stride = LENGTH_BYTES + _round_up(self.slot_size)
+        self._length_index = []
+        self._payload = []
+        for slot in range(self.slots):
+            start = HEADER_BYTES + slot * stride
+            self._length_index.append(start // 8)
+            self._payload.append(buf[start + LENGTH_BYTES:start + LENGTH_BYTES + self.slot_size])
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __len__(self):
+        return self.ctrl[TAIL] - self.ctrl[HEAD]
+
+    # Pickled as (name, locks) so a ring can be handed to multiprocessing.Process.
+    def __getstate__(self):
+        return {"name": self.shm.name, "locks": self.locks}
+
+    def __setstate__(self, state):
+        self.shm = _attach(state["name"])
+        self.owner = False
+        self._map()
+        self.locks = state["locks"]
+
+    # --------------------------------------------
+    # Producer side
+    # --------------------------------------------
+    def reserve(self):
+        """Wait for a free slot and return its writable memoryview (`slot_size` bytes)."""
+        if self.locks:
+            self.locks[0].acquire()
+        ctrl = self.ctrl
+        tail = ctrl[TAIL]
+        spins = 0
+        while tail - ctrl[HEAD] >= self.slots:
+            if ctrl[CLOSED]:
+                if self.locks:
+                    self.locks[0].release()
+                raise RingClosed()
+            spins += 1
+            _backoff(spins)
+        if ctrl[CLOSED]:
+            if self.locks:
+                self.locks[0].release()
+            raise RingClosed()
+        return self._payload[tail % self.slots]
+
+    def commit(self, size):
+        """Publish the first `size` bytes of the slot returned by reserve()."""
+        ctrl = self.ctrl
+        tail = ctrl[TAIL]
+        ctrl[self._length_index[tail % self.slots]] = size
+        ctrl[TAIL] = tail + 1  # Publish only after the payload and length are in place.
+        if self.locks:
+            self.locks[0].release()
+
+    def put(self, data):
+        """Copy a bytes-like `data` into the next slot, blocking while the ring is full."""
+        size = len(data) if isinstance(data, (bytes, bytearray)) else memoryview(data).nbytes
+        if size > self.slot_size:
+            raise ValueError(f"Message of {size} bytes exceeds the {self.slot_size}-byte slot size.")
+        self.reserve()[:size] = data
+        self.commit(size)
+
+    def close(self):
+        """Mark end of stream; consumers drain what is left and then get None."""
+        self.ctrl[CLOSED] = 1
+
+    # --------------------------------------------
+    # Consumer side
+    # --------------------------------------------
+    def peek(self):
+        """Wait for a message and return a read-only view of it in place, or None once closed and drained.
+
+        The view is valid until consume(); drop it (or copy it) before then.
+        """
+        if self.locks:
+            self.locks[1].acquire()
+        ctrl = self.ctrl
+        head = ctrl[HEAD]
+        spins = 0
+        while head == ctrl[TAIL]:
+            if ctrl[CLOSED] and head == ctrl[TAIL]:
+                if self.locks:
+                    self.locks[1].release()
+                return None
+            spins += 1
+            _backoff(spins)
+        slot = head % self.slots
+        return self._payload[slot][:ctrl[self._length_index[slot]]].toreadonly()
+
+    def consume(self):
+        """Hand the slot returned by peek() back to the producers."""
+        ctrl = self.ctrl
+        ctrl[HEAD] = ctrl[HEAD] + 1
+        if self.locks:
+            self.locks[1].release()
+
+    def get(self):
+        """Return the next message as bytes, or None once closed and drained."""
+        view = self.peek()
+        if view is None:
+            return None
+        data = bytes(view)
+        view.release()
+        self.consume()
+        return data
+
+    # --------------------------------------------
+    # Lifetime
+    # --------------------------------------------
+    def detach(self):
+        """Unmap the block in this process; every view from peek/reserve must be released first."""
+        for view in self._payload:
+            view.release()
+        self._payload = []
+        self.ctrl.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the block (creator only); other processes keep their mapping until they detach."""
+        self.detach()
+        if self.owner:
+            self.shm.unlink()
+
+
+# --------------------------------------------
+# Benchmark
+# --------------------------------------------
+def _shm_producer(ring, payload, count):
+    size = len(payload)
+    reserve, commit = ring.reserve, ring.commit
+    for _ in range(count):
+        reserve()[:size] = payload
+        commit(size)
+    ring.detach()
+
+
+def _shm_consumer(ring, results):
+    peek, consume = ring.peek, ring.consume
+    received = total = 0
+    while True:
+        view = peek()
+        if view is None:
+            break
+        received += 1
+        total += view.nbytes
+        view.release()
+        consume()
+    ring.detach()
+    results.put((received, total))
+
+
+def _queue_producer(channel, payload, count):
+    put = channel.put
+    for _ in range(count):
+        put(payload)
+
+
+def _queue_consumer(channel, results, done=None):
+    get = channel.get
+    received = total = 0
+    while True:
+        item = get()
+        if item is done:
+            break
+        received += 1
+        total += len(item)
+    results.put((received, total))
+
+
+def _split(total, parts):
+    share, extra = divmod(total, parts)
+    return [share + (1 if i < extra else 0) for i in range(parts)]
+
+
+def _run(start_workers, join_producers, finish, join_consumers, results, consumers):
+    started = time.perf_counter()
+    start_workers()
+    join_producers()
+    finish()
+    join_consumers()
+    elapsed = time.perf_counter() - started
+    counts = [results.get() for _ in range(consumers)]
+    return elapsed, sum(c for c, _ in counts), sum(b for _, b in counts)
+
+
+def bench_threads(payload, messages, producers=1, consumers=1, capacity=1024):
+    """Threads in this process, one message per queue.Queue put/get."""
+    channel, results = queue.Queue(maxsize=capacity), queue.Queue()
+    prods = [threading.Thread(target=_queue_producer, args=(channel, payload, n)) for n in _split(messages, producers)]
+    cons = [threading.Thread(target=_queue_consumer, args=(channel, results)) for _ in range(consumers)]
+    return _run(lambda: [t.start() for t in cons + prods],
+                lambda: [t.join() for t in prods],
+                lambda: [channel.put(None) for _ in cons],
+                lambda: [t.join() for t in cons],
+                results, consumers)
+
+
+def bench_mp_queue(payload, messages, producers=1, consumers=1, capacity=1024):
+    """Separate processes, payloads pickled through a multiprocessing.Queue."""
+    channel, results = multiprocessing.Queue(maxsize=capacity), multiprocessing.Queue()
+    prods = [multiprocessing.Process(target=_queue_producer, args=(channel, payload, n)) for n in _split(messages, producers)]
+    cons = [multiprocessing.Process(target=_queue_consumer, args=(channel, results)) for _ in range(consumers)]
+    return _run(lambda: [p.start() for p in cons + prods],
+                lambda: [p.join() for p in prods],
+                lambda: [channel.put(None) for _ in cons],
+                lambda: [p.join() for p in cons],
+                results, consumers)
+
+
+def bench_shm(payload, messages, producers=1, consumers=1, capacity=1024):
+    """Separate processes, payloads written and read in place in a ShmRing."""
+    mpmc = producers > 1 or consumers > 1
+    ring = ShmRing(capacity, max(1, len(payload)), mpmc=mpmc)
+    results = multiprocessing.Queue()
+    prods = [multiprocessing.Process(target=_shm_producer, args=(ring, payload, n)) for n in _split(messages, producers)]
+    cons = [multiprocessing.Process(target=_shm_consumer, args=(ring, results)) for _ in range(consumers)]
+    try:
+        return _run(lambda: [p.start() for p in cons + prods],
+                    lambda: [p.join() for p in prods],
+                    ring.close,
+                    lambda: [p.join() for p in cons],
+                    results, consumers)
+    finally:
+        ring.unlink()
+
+
+BENCHMARKS = {
+    "threads": bench_threads,
+    "mp.Queue": bench_mp_queue,
+    "shm": bench_shm,
+}
+
+
+def run_benchmark(sizes=(64, 1024, 65536), messages=50_000, producers=1, consumers=1, capacity=1024, modes=None):
+    """Time every mode for every payload size; returns a list of result dicts."""
+    rows = []
+    for size in sizes:
+        payload = os.urandom(size)
+        for mode in modes or BENCHMARKS:
+            elapsed, received, total = BENCHMARKS[mode](payload, messages, producers, consumers, capacity)
+            if received != messages or total != messages * size:
+                raise RuntimeError(f"{mode}: received {received} of {messages} messages")
+            rows.append({
+                "mode": mode,
+                "payload": size,
+                "messages": messages,
+                "elapsed": elapsed,
+                "messages_per_sec": messages / elapsed if elapsed else 0.0,
+                "mb_per_sec": total / elapsed / 1e6 if elapsed else 0.0,
+            })
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'payload':>8}  {'mode':<10} {'msgs/s':>12} {'MB/s':>10} {'elapsed':>9}")
+    for row in rows:
+        print(f"{row['payload']:>8}  {row['mode']:<10} {row['messages_per_sec']:>12,.0f} "
+              f"{row['mb_per_sec']:>10,.1f} {row['elapsed']:>8.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Threads vs multiprocessing.Queue vs shared-memory ring.")
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 1024, 65536], help="payload sizes in bytes")
+    parser.add_argument("--producers", type=int, default=1)
+    parser.add_argument("--consumers", type=int, default=1)
+    parser.add_argument("--capacity", type=int, default=1024, help="messages buffered at once")
+    parser.add_argument("--modes", nargs="+", choices=list(BENCHMARKS), help="subset of modes to run")
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, {args.producers} producer(s), {args.consumers} consumer(s), "
+          f"capacity {args.capacity}, {os.cpu_count()} CPUs")
+    print_rows(run_benchmark(args.sizes, args.messages, args.producers, args.consumers, args.capacity, args.modes))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Single-pass LRU miss-ratio curves via Mattson stack distances.
+
+LRU has the inclusion property: a memory of C frames always holds the C most
+recently used pages. An access therefore hits with C frames exactly when its
+stack distance (the number of distinct pages touched since the previous access
+to the same page, plus one) is at most C. One pass that histograms stack
+distances gives the fault count for every frame count at once, instead of one
+MemoryManager replay per frame count.
+
+Distances are computed with a Fenwick (binary indexed) tree over access
+positions: every page keeps a single mark at the position of its latest
+access, so the number of marks after a page's previous position is the number
+of distinct pages used since. Each access costs O(log n); when the position
+space fills up, the live marks are renumbered into a compact range.
+
+Example:
+    python3 stack_distance.py trace.bin --max-frames 4096 --plot
+"""
+
+import csv
+import argparse
+
+from main import plot_miss_ratio_curve
+from trace_replay import read_trace, to_pages
+
+
+class FenwickTree:
+    """Prefix sums over a fixed-size array of counts with O(log n) updates."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    @classmethod
+    def ones(cls, count, size):
+        """A tree of `size` slots whose first `count` slots hold 1, built in O(size)."""
+        tree = cls(size)
+        values = tree.tree
+        for i in range(1, count + 1):
+            values[i] += 1
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                values[parent] += values[i]
+        return tree
+
+    def add(self, index, delta):
+        tree, size = self.tree, self.size
+        index += 1
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """Sum of slots 0..index inclusive."""
+        tree = self.tree
+        total = 0
+        index += 1
+        while index:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+def stack_distance_histogram(keys, initial_size=1 << 16):
+    """Histogram LRU stack distances over an iterable of page keys.
+
+    Returns (histogram, cold_misses, accesses) where histogram[d] counts
+    re-references with stack distance d + 1, i.e. d distinct other pages in between.
+    """
+    size = initial_size
+    tree = FenwickTree(size)
+    last = {}         # key -> position of its latest access
+    histogram = []
+    cold = 0
+    accesses = 0
+    position = 0
+    for key in keys:
+        accesses += 1
+        previous = last.get(key)
+        if previous is None:
+            cold += 1
+        else:
+            # Marks after `previous` = distinct pages touched since then.
+            distance = len(last) - tree.prefix_sum(previous)
+            if distance >= len(histogram):
+                histogram.extend([0] * (distance + 1 - len(histogram)))
+            histogram[distance] += 1
+            tree.add(previous, -1)
+
+        if position == size:
+            # Renumber live marks 0..k-1 in recency order and grow if still crowded.
+            ordered = sorted(last, key=last.get)
+            if previous is None:
+                live = len(ordered)
+            else:
+                ordered.remove(key)
+                live = len(ordered)
+            size = max(size, 2 * (live + 1))
+            tree = FenwickTree.ones(live, size)
+            last = {k: i for i, k in enumerate(ordered)}
+            position = live
+
+        tree.add(position, 1)
+        last[key] = position
+        position += 1
+    return histogram, cold, accesses
+
+
+def miss_ratio_curve(histogram, cold, accesses, max_frames=None):
+    """Fault counts and miss ratios for 1..max_frames frames from a distance histogram."""
+    if max_frames is None:
+        max_frames = len(histogram) + 1
+    misses = []
+    # With C frames, re-references at distance index >= C miss.
+    remaining = sum(histogram)
+    for frames in range(1, max_frames + 1):
+        if frames - 1 < len(histogram):
+            remaining -= histogram[frames - 1]
+        misses.append(cold + remaining)
+    return {
+        "accesses": accesses,
+        "cold_misses": cold,
+        "frames": list(range(1, max_frames + 1)),
+        "page_faults": misses,
+        "miss_ratio": [m / accesses if accesses else 0.0 for m in misses],
+    }
+
+
+def lru_miss_ratio_curve(keys, max_frames=None):
+    """One pass over `keys` -> LRU miss-ratio curve for every frame count."""
+    return miss_ratio_curve(*stack_distance_histogram(keys), max_frames=max_frames)
+
+
+def write_curve_csv(curve, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["total_frames", "page_faults", "miss_ratio"])
+        writer.writerows(zip(curve["frames"], curve["page_faults"], curve["miss_ratio"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LRU miss-ratio curve for every frame count in one pass.")
+    parser.add_argument("trace", help="trace file in any format trace_replay.py reads")
+    parser.add_argument("--max-frames", type=int, help="largest frame count to report (default: until no capacity misses)")
+    parser.add_argument("--page-size", type=int, help="treat the second field as a byte address")
+    parser.add_argument("--output", help="write the full curve to a CSV file")
+    parser.add_argument("--plot", action="store_true", help="chart the curve")
+    args = parser.parse_args()
+
+    records = read_trace(args.trace)
+    if args.page_size:
+        records = to_pages(records, args.page_size)
+    curve = lru_miss_ratio_curve(((pid, page) for pid, page, op in records), args.max_frames)
+
+    print(f"Accesses: {curve['accesses']}, cold misses: {curve['cold_misses']}")
+    frames = 1
+    while frames <= len(curve["frames"]):
+        print(f"{frames:>10} frames: {curve['page_faults'][frames - 1]:>12} faults  miss ratio {curve['miss_ratio'][frames - 1]:.4f}")
+        frames *= 2
+    if args.output:
+        write_curve_csv(curve, args.output)
+    if args.plot:
+        plot_miss_ratio_curve(curve, "LRU")
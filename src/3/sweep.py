@@ -0,0 +1,83 @@
+"""
+Parallel parameter sweeps over page replacement settings.
+
+Every (algorithm x total_frames x trace) combination is replayed in a
+ProcessPoolExecutor worker and written as one row of a CSV table. Rows are
+appended as soon as they finish, so an interrupted sweep can be re-run with the
+same output file and only the missing configurations are replayed.
+
+Traces are `demo` (the built-in page requests), synthetic specs of the form
+`random:<accesses>:<pages>:<seed>[:<processes>]`, or trace files in any
+format `trace_replay.py` reads.
+
+Example:
+    python3 sweep.py --algorithms FIFO LRU --frames 4 8 16 32 \\
+        --traces demo random:100000:512:1 --output memory_results.csv
+"""
+
+import random
+import argparse
+import itertools
+
+from events import NullSink
+from main import MemoryManager, DEMO_PAGE_REQUESTS
+from replacement import POLICIES
+from sweep_runner import run_sweep
+from trace_replay import read_trace, replay
+
+ALGORITHMS = tuple(POLICIES)
+
+FIELDS = ["algorithm", "total_frames", "trace", "accesses", "page_faults", "hit_ratio", "accesses_per_sec"]
+KEY_FIELDS = ("algorithm", "total_frames", "trace")
+
+
+def open_trace(spec):
+    """Stream (pid, page, op) accesses for a trace spec; each call starts over from the beginning."""
+    if spec == "demo":
+        return ((pid, page, 0) for pid, pages in DEMO_PAGE_REQUESTS.items() for page in pages)
+    if spec.startswith("random:"):
+        fields = spec.split(":")[1:]
+        accesses, pages, seed = int(fields[0]), int(fields[1]), int(fields[2])
+        processes = int(fields[3]) if len(fields) > 3 else 1
+        rng = random.Random(seed)
+        return ((rng.randint(1, processes), rng.randrange(pages), 0) for _ in range(accesses))
+    return read_trace(spec)
+
+
+def run_config(config):
+    """Replay a single configuration; runs inside a worker process.
+
+    The trace is streamed rather than held in memory; OPT reads it twice,
+    once for its next-use index and once to replay.
+    """
+    keys = None
+    if config["algorithm"] == "OPT":
+        keys = ((pid, page) for pid, page, op in open_trace(config["trace"]))
+    manager = MemoryManager(total_frames=config["total_frames"], algorithm=config["algorithm"], sink=NullSink(), trace=keys)
+    row = dict(config)
+    row.update(replay(manager, open_trace(config["trace"])))
+    return row
+
+
+def build_grid(algorithms, frames, traces):
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm {algorithm}. Use one of {', '.join(ALGORITHMS)}.")
+    return [
+        {"algorithm": algorithm, "total_frames": total_frames, "trace": trace}
+        for algorithm, total_frames, trace in itertools.product(algorithms, frames, traces)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep page replacement algorithms over frame counts and traces.")
+    parser.add_argument("--algorithms", nargs="+", default=["FIFO", "LRU"], type=str.upper)
+    parser.add_argument("--frames", nargs="+", type=int, default=[3, 4, 5, 6])
+    parser.add_argument("--traces", nargs="+", default=["demo"])
+    parser.add_argument("--output", default="memory_sweep_results.csv")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    grid = build_grid(args.algorithms, args.frames, args.traces)
+    written = run_sweep(grid, args.output, run_config, FIELDS, KEY_FIELDS, args.workers)
+    print(f"[Sweep] {len(grid)} configurations, {written} replayed, {len(grid) - written} already in {args.output}")
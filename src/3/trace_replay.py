@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Page-reference trace replay for MemoryManager.
+
+Traces are streamed record by record through generators, so files larger than
+memory can be replayed. Two formats are supported:
+
+- Text: one access per line, `pid page [op]`, separated by whitespace or commas.
+  Numbers may be decimal or 0x-prefixed hex, `op` is R or W (default R), and
+  blank lines and lines starting with `#` are ignored. Files ending in `.gz`
+  are decompressed on the fly.
+- Binary: packed little-endian records of (uint32 pid, uint64 page, uint8 op),
+  13 bytes each, with op 0 = read and 1 = write. Files ending in `.bin`.
+
+With `--page-size`, the second field is treated as a byte address and mapped
+to its page number. Replays run with printing and sleeps disabled and report
+page faults, hit ratio and throughput in accesses per second.
+
+Examples:
+    python3 trace_replay.py trace.txt --frames 1024 --algorithm LRU
+    python3 trace_replay.py addresses.txt.gz --page-size 4096 --frames 65536
+    python3 trace_replay.py trace.txt --convert trace.bin
+"""
+
+import sys
+import gzip
+import shutil
+import tempfile
+import time
+import struct
+import argparse
+
+from events import NullSink
+from main import MemoryManager
+from replacement import POLICIES
+
+RECORD = struct.Struct("<IQB")
+READ, WRITE = 0, 1
+CHUNK_RECORDS = 65536  # Records decoded per read() of a binary trace.
+
+
+def _open_text(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path, "r")
+
+
+def read_text_trace(path):
+    """Yield (pid, page, op) tuples from a text trace."""
+    file = _open_text(path)
+    try:
+        for line in file:
+            if "," in line:
+                line = line.replace(",", " ")
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            op = WRITE if len(fields) > 2 and fields[2][0] in "Ww" else READ
+            yield int(fields[0], 0), int(fields[1], 0), op
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def read_binary_trace(path):
+    """Yield (pid, page, op) tuples from a binary trace, a chunk at a time."""
+    opener = gzip.open if path.endswith(".gz") else open
+    chunk_size = RECORD.size * CHUNK_RECORDS
+    with opener(path, "rb") as file:
+        leftover = b""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            if leftover:
+                chunk = leftover + chunk
+            usable = len(chunk) - len(chunk) % RECORD.size
+            leftover = chunk[usable:]
+            yield from RECORD.iter_unpack(memoryview(chunk)[:usable])
+        if leftover:
+            raise ValueError(f"{path}: truncated record at end of binary trace")
+
+
+def is_binary(path):
+    return path.endswith(".bin") or path.endswith(".bin.gz")
+
+
+def read_trace(path):
+    """Stream (pid, page, op) records from a text or binary trace file."""
+    if is_binary(path):
+        return read_binary_trace(path)
+    return read_text_trace(path)
+
+
+def to_pages(records, page_size):
+    """Map byte addresses in `records` to page numbers."""
+    for pid, address, op in records:
+        yield pid, address // page_size, op
+
+
+def write_binary_trace(records, path):
+    """Write (pid, page, op) records to a binary trace; returns the record count."""
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    with opener(path, "wb") as file:
+        batch = []
+        for pid, page, op in records:
+            batch.append(RECORD.pack(pid, page, op))
+            if len(batch) == CHUNK_RECORDS:
+                file.write(b"".join(batch))
+                count += len(batch)
+                batch.clear()
+        file.write(b"".join(batch))
+        count += len(batch)
+    return count
+
+
+def replay(manager, records):
+    """Feed every record to `manager.load_page`; return fault/hit/throughput stats."""
+    load_page = manager.load_page
+    accesses = faults = writes = 0
+    started = time.perf_counter()
+    for pid, page, op in records:
+        accesses += 1
+        writes += op
+        if load_page(pid, page):
+            faults += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "accesses": accesses,
+        "reads": accesses - writes,
+        "writes": writes,
+        "page_faults": faults,
+        "hits": accesses - faults,
+        "hit_ratio": (accesses - faults) / accesses if accesses else 0.0,
+        "elapsed": elapsed,
+        "accesses_per_sec": accesses / elapsed if elapsed else 0.0,
+    }
+
+
+def _records(path, page_size):
+    records = read_trace(path)
+    if page_size:
+        records = to_pages(records, page_size)
+    return records
+
+
+def replay_file(path, total_frames, algorithm="LRU", page_size=None):
+    """Replay a trace file against a quiet MemoryManager.
+
+    OPT reads the file twice: once to build its next-use index, once to replay.
+    Standard input can only be read once, so for OPT it is first spooled to a
+    temporary file.
+    """
+    if algorithm.upper() == "OPT" and path == "-":
+        with tempfile.NamedTemporaryFile("wb", suffix=".txt") as spool:
+            shutil.copyfileobj(sys.stdin.buffer, spool)
+            spool.flush()
+            return replay_file(spool.name, total_frames, algorithm, page_size)
+    trace = None
+    if algorithm.upper() == "OPT":
+        trace = ((pid, page) for pid, page, op in _records(path, page_size))
+    manager = MemoryManager(total_frames=total_frames, algorithm=algorithm, sink=NullSink(), trace=trace)
+    return replay(manager, _records(path, page_size))
+
+
+def print_stats(stats):
+    print(f"Accesses:        {stats['accesses']} ({stats['reads']} reads, {stats['writes']} writes)")
+    print(f"Page faults:     {stats['page_faults']}")
+    print(f"Hit ratio:       {stats['hit_ratio']:.4f}")
+    print(f"Elapsed:         {stats['elapsed']:.3f}s")
+    print(f"Throughput:      {stats['accesses_per_sec']:,.0f} accesses/sec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a page-reference trace against MemoryManager.")
+    parser.add_argument("trace", help="trace file (.txt, .gz, .bin, or - for stdin)")
+    parser.add_argument("--frames", type=int, default=64, help="total page frames")
+    parser.add_argument("--algorithm", default="LRU", type=str.upper, choices=list(POLICIES))
+    parser.add_argument("--page-size", type=int, help="treat the second field as a byte address")
+    parser.add_argument("--convert", metavar="OUT", help="write the trace in binary format instead of replaying")
+    args = parser.parse_args()
+
+    if args.convert:
+        count = write_binary_trace(_records(args.trace, args.page_size), args.convert)
+        print(f"Wrote {count} records to {args.convert}")
+    else:
+        print_stats(replay_file(args.trace, args.frames, args.algorithm, args.page_size))
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+asyncio Producer-Consumer and job engine, next to the threaded versions.
+
+`simulate_sync` in main.py gives every producer and consumer its own OS
+thread. That works for two actors, but a high-fan-in I/O workload (thousands
+of clients feeding a few workers) would need thousands of threads. Here each
+actor is a coroutine on one event loop:
+
+- `async_producer_consumer` connects P producer and M consumer coroutines
+  through a bounded asyncio.Queue. `await queue.put()` suspends a producer
+  while the queue is full, which is the backpressure.
+- `thread_producer_consumer` runs the same workload with threads and a
+  queue.Queue, for comparison.
+- `process_producer_consumer` runs it with one OS process per actor over a
+  shared-memory ShmRing (shm_ring.py), so producers and consumers are not
+  confined to one core by the GIL.
+- `run_jobs` is the job-engine form of the same pattern: a fixed pool of
+  worker coroutines drains a bounded queue of async jobs.
+- `context_switch_cost` ping-pongs one token between two coroutines, and
+  between two threads, to time a single hand-off.
+
+`io_delay` makes every producer wait before each item, as if reading from a
+socket. That is where coroutines pay off: a thread is parked per waiter,
+while a coroutine is just a suspended frame.
+
+Example:
+    python3 async_sync.py --producers 2000 --consumers 50 --items 200000 --io-delay 0.001
+"""
+
+import time
+import queue
+import asyncio
+import argparse
+import threading
+import multiprocessing
+
+from shm_ring import ShmRing
+
+
+def _check_counts(producers, consumers, items):
+    """Reject workloads that cannot finish: without a consumer, producers block on a full queue forever."""
+    if producers < 1 or consumers < 1:
+        raise ValueError("need at least one producer and one consumer")
+    if items < 0:
+        raise ValueError("the item count cannot be negative")
+
+
+def _split(total, parts):
+    share, extra = divmod(total, parts)
+    return [share + (1 if i < extra else 0) for i in range(parts)]
+
+
+# --------------------------------------------
+# asyncio
+# --------------------------------------------
+async def _async_run(producers, consumers, items, maxsize, io_delay, verbose):
+    buffer = asyncio.Queue(maxsize=maxsize)
+    counts = [0] * consumers
+
+    async def producer(pid, count):
+        for i in range(count):
+            if io_delay:
+                await asyncio.sleep(io_delay)
+            await buffer.put((pid, i))  # Suspends while the queue is full.
+            if verbose:
+                print(f" Producer {pid}: Produced Item{i}")
+
+    async def consumer(cid):
+        while True:
+            item = await buffer.get()
+            if item is None:
+                return
+            counts[cid] += 1
+            if verbose:
+                print(f" Consumer {cid}: Consumed Item{item[1]} from producer {item[0]}")
+
+    workers = [asyncio.create_task(consumer(c)) for c in range(consumers)]
+    await asyncio.gather(*(producer(p, n) for p, n in enumerate(_split(items, producers))))
+    for _ in workers:
+        await buffer.put(None)
+    await asyncio.gather(*workers)
+    return sum(counts)
+
+
+def async_producer_consumer(producers=1, consumers=1, items=10, maxsize=3, io_delay=0.0, verbose=False):
+    """Run P producer and M consumer coroutines; returns a throughput report."""
+    _check_counts(producers, consumers, items)
+    started = time.perf_counter()
+    consumed = asyncio.run(_async_run(producers, consumers, items, maxsize, io_delay, verbose))
+    return _report("asyncio", producers, consumers, consumed, time.perf_counter() - started)
+
+
+async def _run_jobs(jobs, concurrency):
+    pending = asyncio.Queue(maxsize=2 * concurrency)
+    results = [None] * len(jobs)
+
+    async def worker():
+        while True:
+            entry = await pending.get()
+            if entry is None:
+                return
+            index, job = entry
+            try:
+                results[index] = await job()
+            except Exception as e:
+                results[index] = e
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    for entry in enumerate(jobs):
+        await pending.put(entry)
+    for _ in workers:
+        await pending.put(None)
+    await asyncio.gather(*workers)
+    return results
+
+
+def run_jobs(jobs, concurrency=100):
+    """Await every zero-argument coroutine function in `jobs` with at most `concurrency` in flight.
+
+    Returns the results in job order; a job that raised yields its exception.
+    """
+    return asyncio.run(_run_jobs(list(jobs), max(1, concurrency)))
+
+
+# --------------------------------------------
+# Threads
+# --------------------------------------------
+def thread_producer_consumer(producers=1, consumers=1, items=10, maxsize=3, io_delay=0.0, verbose=False):
+    """The same workload with one OS thread per producer and consumer."""
+    _check_counts(producers, consumers, items)
+    buffer = queue.Queue(maxsize=maxsize)
+    counts = [0] * consumers
+
+    def producer(pid, count):
+        for i in range(count):
+            if io_delay:
+                time.sleep(io_delay)
+            buffer.put((pid, i))  # Blocks while the queue is full.
+            if verbose:
+                print(f" Producer {pid}: Produced Item{i}")
+
+    def consumer(cid):
+        while True:
+            item = buffer.get()
+            if item is None:
+                return
+            counts[cid] += 1
+            if verbose:
+                print(f" Consumer {cid}: Consumed Item{item[1]} from producer {item[0]}")
+
+    started = time.perf_counter()
+    prods = [threading.Thread(target=producer, args=(p, n)) for p, n in enumerate(_split(items, producers))]
+    cons = [threading.Thread(target=consumer, args=(c,)) for c in range(consumers)]
+    for thread in cons + prods:
+        thread.start()
+    for thread in prods:
+        thread.join()
+    for _ in cons:
+        buffer.put(None)
+    for thread in cons:
+        thread.join()
+    return _report("threads", producers, consumers, sum(counts), time.perf_counter() - started)
+
+
+# --------------------------------------------
+# Processes
+# --------------------------------------------
+def _process_producer(ring, pid, count, verbose):
+    for i in range(count):
+        ring.put(f"{pid}:{i}".encode())  # Blocks while the ring is full.
+        if verbose:
+            print(f" Producer {pid}: Produced Item{i}", flush=True)
+    ring.detach()
+
+
+def _process_consumer(ring, cid, results, verbose):
+    received = 0
+    while True:
+        item = ring.get()
+        if item is None:
+            break
+        received += 1
+        if verbose:
+            pid, i = item.decode().split(":")
+            print(f" Consumer {cid}: Consumed Item{i} from producer {pid}", flush=True)
+    ring.detach()
+    results.put(received)
+
+
+def process_producer_consumer(producers=1, consumers=1, items=10, maxsize=3, verbose=False):
+    """The same workload with one OS process per producer and consumer, over a shared-memory ring."""
+    _check_counts(producers, consumers, items)
+    ring = ShmRing(maxsize, 64, mpmc=producers > 1 or consumers > 1)
+    results = multiprocessing.Queue()
+    prods = [multiprocessing.Process(target=_process_producer, args=(ring, p, n, verbose))
+             for p, n in enumerate(_split(items, producers))]
+    cons = [multiprocessing.Process(target=_process_consumer, args=(ring, c, results, verbose)) for c in range(consumers)]
+    started = time.perf_counter()
+    try:
+        for process in cons + prods:
+            process.start()
+        for process in prods:
+            process.join()
+        ring.close()  # Consumers drain what is left, then stop.
+        consumed = sum(results.get() for _ in cons)
+        for process in cons:
+            process.join()
+    finally:
+        for process in cons + prods:
+            if process.is_alive():
+                process.terminate()
+        ring.unlink()
+    return _report("processes", producers, consumers, consumed, time.perf_counter() - started)
+
+
+# --------------------------------------------
+# Measurements
+# --------------------------------------------
+def _report(mode, producers, consumers, items, elapsed):
+    return {
+        "mode": mode,
+        "producers": producers,
+        "consumers": consumers,
+        "items": items,
+        "elapsed": elapsed,
+        "items_per_sec": items / elapsed if elapsed else 0.0,
+    }
+
+
+async def _async_ping_pong(rounds):
+    ping, pong = asyncio.Queue(maxsize=1), asyncio.Queue(maxsize=1)
+
+    async def echo():
+        for _ in range(rounds):
+            await pong.put(await ping.get())
+
+    task = asyncio.create_task(echo())
+    started = time.perf_counter()
+    for i in range(rounds):
+        await ping.put(i)
+        await pong.get()
+    elapsed = time.perf_counter() - started
+    await task
+    return elapsed
+
+
+def _thread_ping_pong(rounds):
+    ping, pong = queue.Queue(maxsize=1), queue.Queue(maxsize=1)
+
+    def echo():
+        for _ in range(rounds):
+            pong.put(ping.get())
+
+    thread = threading.Thread(target=echo)
+    thread.start()
+    started = time.perf_counter()
+    for i in range(rounds):
+        ping.put(i)
+        pong.get()
+    elapsed = time.perf_counter() - started
+    thread.join()
+    return elapsed
+
+
+def context_switch_cost(rounds=20_000):
+    """Microseconds per hand-off (two per round trip) for coroutines and for threads."""
+    return {
+        "asyncio": asyncio.run(_async_ping_pong(rounds)) / (2 * rounds) * 1e6,
+        "threads": _thread_ping_pong(rounds) / (2 * rounds) * 1e6,
+    }
+
+
+def run_benchmark(producers=1000, consumers=50, items=100_000, maxsize=256, io_delay=0.0, rounds=20_000):
+    """Throughput of both implementations on one workload, plus the hand-off cost of each."""
+    _check_counts(producers, consumers, items)
+    return {
+        "throughput": [
+            async_producer_consumer(producers, consumers, items, maxsize, io_delay),
+            thread_producer_consumer(producers, consumers, items, maxsize, io_delay),
+        ],
+        "switch_us": context_switch_cost(rounds),
+    }
+
+
+def print_benchmark(results):
+    for row in results["throughput"]:
+        print(f"{row['mode']:<8} {row['producers']:>6} producers {row['consumers']:>5} consumers  "
+              f"{row['items_per_sec']:>12,.0f} items/s  ({row['elapsed']:.3f}s)")
+    for mode, cost in results["switch_us"].items():
+        print(f"{mode:<8} context switch {cost:8.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="asyncio vs threaded Producer-Consumer.")
+    parser.add_argument("--producers", type=int, default=1000)
+    parser.add_argument("--consumers", type=int, default=50)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--maxsize", type=int, default=256, help="queue capacity (backpressure bound)")
+    parser.add_argument("--io-delay", type=float, default=0.0, help="seconds each producer waits per item")
+    parser.add_argument("--rounds", type=int, default=20_000, help="ping-pong round trips for the switch cost")
+    args = parser.parse_args()
+
+    try:
+        _check_counts(args.producers, args.consumers, args.items)
+    except ValueError as e:
+        parser.error(str(e))
+    print_benchmark(run_benchmark(args.producers, args.consumers, args.items, args.maxsize, args.io_delay, args.rounds))
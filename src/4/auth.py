@@ -0,0 +1,282 @@
+"""
+User authentication for the integrated shell.
+
+Users live in a file-backed store: users.json by default, or an SQLite
+database when the file name ends in .db/.sqlite. Passwords are stored as
+salted scrypt hashes (PBKDF2-SHA256 where hashlib has no scrypt). Each
+record keeps its own KDF parameters, so raising the cost does not break
+existing hashes; a user's hash is upgraded at their next successful login
+if the store is writable. A store named explicitly (INTEGRATED_SHELL_USERS,
+--users) is; the bundled users.json is opened read-only, so logging in never
+rewrites the tracked file (only `auth.py add` changes it).
+
+Checking a password runs the KDF on purpose, which costs tens of
+milliseconds. Scripts that log in many times can skip it with a session
+token:
+
+    export INTEGRATED_SHELL_TOKEN=$(python3 main.py --issue-token | tail -n 1)
+
+A token is 32 random bytes. Only its SHA-256 is kept in the session file,
+together with the user, an expiry time and a fingerprint of the user's
+password hash (so changing the password ends the user's sessions).
+Checking a token is one file read and one SHA-256.
+
+Usage:
+    python3 auth.py add <username> <role> [--kdf scrypt|pbkdf2_sha256] [--cost N] [--users FILE]
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import getpass
+import hashlib
+import sqlite3
+import secrets
+import argparse
+import functools
+
+DEFAULT_USERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "users.json")
+DEFAULT_SESSION_FILE = os.path.join(os.path.expanduser("~"), ".cache", "integrated_shell", "sessions.json")
+
+SCRYPT_N = 2 ** 14           # CPU/memory cost (16 MiB with r=8).
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+SESSION_TTL = 3600           # Seconds a session token stays valid.
+
+DEFAULT_KDF = "scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2_sha256"
+
+# ==============================
+# Password hashing
+# ==============================
+def _derive(password, record):
+    salt = bytes.fromhex(record["salt"])
+    if record["kdf"] == "scrypt":
+        n, r, p = record["n"], record["r"], record["p"]
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=2 * 128 * n * r + (1 << 20), dklen=32)
+    if record["kdf"] == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, record["iterations"])
+    raise ValueError(f"Unsupported KDF {record['kdf']}.")
+
+
+def _parameters(kdf, cost):
+    """A record with the KDF name, its parameters and a random salt, but no hash yet."""
+    record = {"kdf": kdf, "salt": secrets.token_hex(SALT_BYTES)}
+    if kdf == "scrypt":
+        record.update(n=cost or SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    elif kdf == "pbkdf2_sha256":
+        record["iterations"] = cost or PBKDF2_ITERATIONS
+    else:
+        raise ValueError(f"Unsupported KDF {kdf}. Use scrypt or pbkdf2_sha256.")
+    return record
+
+
+def hash_password(password, kdf=DEFAULT_KDF, cost=None):
+    """Return a password record: KDF name, its parameters, a random salt and the derived hash."""
+    record = _parameters(kdf, cost)
+    record["hash"] = _derive(password, record).hex()
+    return record
+
+
+def verify_password(password, record):
+    """True if `password` matches `record`; the comparison takes the same time wherever they differ."""
+    try:
+        derived = _derive(password, record)
+    except (KeyError, ValueError):
+        return False
+    return hmac.compare_digest(derived, bytes.fromhex(record["hash"]))
+
+
+def needs_rehash(record, kdf=DEFAULT_KDF, cost=None):
+    """True if `record` was hashed with another KDF or a lower cost than configured."""
+    if record.get("kdf") != kdf:
+        return True
+    if kdf == "scrypt":
+        return record.get("n", 0) < (cost or SCRYPT_N)
+    return record.get("iterations", 0) < (cost or PBKDF2_ITERATIONS)
+
+
+def _fingerprint(record):
+    return hashlib.sha256(record["hash"].encode()).hexdigest()[:16]
+
+# ==============================
+# User stores
+# ==============================
+class UserStore:
+    """A user database: username -> {"role": ..., plus the password record fields}."""
+
+    writable = True
+
+    def get(self, username):
+        raise NotImplementedError
+
+    def set(self, username, user):
+        raise NotImplementedError
+
+
+class JsonUserStore(UserStore):
+    def __init__(self, path, writable=True):
+        self.path = path
+        self.writable = writable
+        self.users = None
+        self.mtime = None
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self.users, self.mtime = {}, None
+            return
+        if mtime != self.mtime:
+            with open(self.path) as file:
+                self.users = json.load(file)
+            self.mtime = mtime
+
+    def get(self, username):
+        self._load()
+        return self.users.get(username)
+
+    def set(self, username, user):
+        if not self.writable:
+            raise PermissionError(f"{self.path} is opened read-only")
+        self._load()
+        self.users[username] = user
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.users, file, indent=2, sort_keys=True)
+            file.write("\n")
+        os.replace(temporary, self.path)
+        self.mtime = os.stat(self.path).st_mtime_ns
+
+
+class SqliteUserStore(UserStore):
+    def __init__(self, path, writable=True):
+        self.path = path
+        self.writable = writable
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def get(self, username):
+        row = self.db.execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, username, user):
+        if not self.writable:
+            raise PermissionError(f"{self.path} is opened read-only")
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO users (username, data) VALUES (?, ?)", (username, json.dumps(user)))
+
+
+def open_user_store(path=None, writable=None):
+    """Open the user store at `path` (default users.json next to this file); .db/.sqlite files use SQLite.
+
+    By default only an explicitly named store is writable.
+    """
+    if writable is None:
+        writable = bool(path)
+    path = path or DEFAULT_USERS_FILE
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteUserStore(path, writable)
+    return JsonUserStore(path, writable)
+
+# ==============================
+# Session tokens
+# ==============================
+class SessionCache:
+    def __init__(self, path=DEFAULT_SESSION_FILE, ttl=SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    def _read(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, sessions):
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(sessions, file)
+        os.replace(temporary, self.path)
+
+    def issue(self, username, user):
+        """Create a session for `username`; returns the token (only its hash is stored)."""
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+        sessions = {key: s for key, s in self._read().items() if s["expires"] > now}
+        sessions[hashlib.sha256(token.encode()).hexdigest()] = {
+            "username": username,
+            "expires": now + self.ttl,
+            "fingerprint": _fingerprint(user),
+        }
+        self._write(sessions)
+        return token
+
+    def check(self, token, store):
+        """Return (username, user) for a live token whose user still has the same password, else None."""
+        session = self._read().get(hashlib.sha256(token.encode()).hexdigest())
+        if session is None or session["expires"] <= time.time():
+            return None
+        user = store.get(session["username"])
+        if user is None or not hmac.compare_digest(session["fingerprint"], _fingerprint(user)):
+            return None
+        return session["username"], user
+
+# ==============================
+# Login
+# ==============================
+# Verifying against a dummy record when the user does not exist keeps failed
+# logins as slow as real ones, so timing does not reveal valid usernames. Its
+# hash is random bytes rather than derived from anything, so building it runs
+# no KDF and a miss costs exactly one verify. The default one is built at import.
+@functools.lru_cache(maxsize=None)
+def _dummy_record(kdf, cost):
+    return dict(_parameters(kdf, cost), hash=secrets.token_hex(32))
+
+_dummy_record(DEFAULT_KDF, None)
+
+def login(store, username, password, kdf=DEFAULT_KDF, cost=None):
+    """Check a username and password; returns the user's record, or None."""
+    user = store.get(username)
+    if user is None:
+        verify_password(password, _dummy_record(kdf, cost))
+        return None
+    if not verify_password(password, user):
+        return None
+    if store.writable and needs_rehash(user, kdf, cost):
+        user = dict(user, **hash_password(password, kdf, cost))
+        try:
+            store.set(username, user)
+        except OSError:
+            pass  # A read-only store still lets the user in.
+    return user
+
+
+def add_user(store, username, role, password, kdf=DEFAULT_KDF, cost=None):
+    store.set(username, dict(hash_password(password, kdf, cost), role=role))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage integrated shell users.")
+    sub = parser.add_subparsers(dest="action", required=True)
+    add = sub.add_parser("add", help="add a user or reset their password")
+    add.add_argument("username")
+    add.add_argument("role")
+    add.add_argument("--kdf", default=DEFAULT_KDF, choices=["scrypt", "pbkdf2_sha256"])
+    add.add_argument("--cost", type=int, help=f"scrypt N (default {SCRYPT_N}) or PBKDF2 iterations (default {PBKDF2_ITERATIONS})")
+    add.add_argument("--users", help="user store file (default users.json)")
+    args = parser.parse_args()
+
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Repeat password: "):
+        print("Passwords do not match.", file=sys.stderr)
+        sys.exit(1)
+    add_user(open_user_store(args.users, writable=True), args.username, args.role, password, args.kdf, args.cost)
+    print(f"Saved user {args.username} ({args.role}).")
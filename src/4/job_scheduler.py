@@ -0,0 +1,341 @@
+"""
+Real scheduling of shell commands as OS processes.
+
+Two schedulers are provided: a time-slicing round_robin() and a
+PriorityJobQueue that runs jobs concurrently in priority order.
+
+round_robin() time-slices real processes:
+
+- Every command is forked up front into its own process group. Each child
+  stops itself before exec, so all jobs exist but none has run yet.
+- The scheduler resumes one job with SIGCONT for `quantum` seconds, then
+  pauses it with SIGSTOP and resumes the next ready job.
+- No work is lost: a paused job picks up where it stopped, and every job
+  runs to completion.
+- Jobs are reaped with os.wait4, whose rusage gives each job's CPU time.
+
+Times are wall-clock seconds from submission:
+- response is the time until the job first ran;
+- turnaround is the time until it exited;
+- wait is turnaround minus the time the job held the CPU slot.
+
+PriorityJobQueue runs up to `slots` jobs at once (one per CPU by default):
+
+- Waiting jobs sit in a heap and are admitted most urgent first.
+- A lower priority number is more urgent; the number is also the job's nice
+  value, clamped to -20..19 and applied with os.setpriority before exec.
+- With `spread=True`, each job is pinned to a free CPU with
+  os.sched_setaffinity.
+- Aging lowers a waiting job's effective priority by `aging` points per
+  second. Every waiting job ages at the same rate, so the order among them
+  only depends on priority + aging * submit_time. That makes it a fixed heap
+  key, and a job submitted early eventually overtakes any stream of later,
+  more urgent jobs.
+- Jobs submitted together (as schedule_priority does) keep their order,
+  since they age alike. What aging changes for them is how they run: a job
+  starts with its aged priority as its nice value, so the longer it waited
+  for a slot, the more CPU it gets once admitted. Aging never lowers nice
+  below the shell's own value (which would need privileges) unless the job
+  asked for that itself.
+"""
+
+import os
+import sys
+import time
+import heapq
+import shlex
+import select
+import signal
+import itertools
+from collections import deque
+
+POLL_INTERVAL = 0.005  # Seconds between exit checks where pidfd_open is unavailable.
+NICE_MIN, NICE_MAX = -20, 19
+
+
+class Job:
+    def __init__(self, command, priority=0):
+        self.command = command
+        self.argv = shlex.split(command)
+        if not self.argv:
+            raise ValueError("Empty command.")
+        self.priority = priority
+        self.pid = None
+        self.submitted = time.monotonic()
+        self.cpu = None           # CPU the job is pinned to, if any.
+        self.nice = None          # Nice value it was started with, after aging.
+        self.launched = None      # time.monotonic() at fork.
+        self.first_run = None     # First SIGCONT, or the fork for jobs started running.
+        self.finished = None      # Reaped.
+        self.running = 0.0        # Wall time spent holding the CPU slot.
+        self.cpu_time = 0.0       # User + system CPU from rusage.
+        self.slices = 0
+        self.returncode = None
+
+    def metrics(self):
+        turnaround = self.finished - self.submitted
+        return {
+            "command": self.command,
+            "pid": self.pid,
+            "priority": self.priority,
+            "nice": self.nice,
+            "returncode": self.returncode,
+            "slices": self.slices,
+            "cpu": self.cpu_time,
+            "response": self.first_run - self.submitted,
+            "wait": max(0.0, turnaround - self.running),
+            "turnaround": turnaround,
+        }
+
+
+def _spawn_stopped(job):
+    """Fork `job` into its own process group, stopped just before exec."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, 0)
+            os.kill(os.getpid(), signal.SIGSTOP)
+            os.execvp(job.argv[0], job.argv)
+        except OSError as e:
+            print(f"[Scheduling] Error: {job.argv[0]}: {e.strerror}", file=sys.stderr)
+        os._exit(127)
+    # Also set the group from the parent so a signal sent right away cannot miss it.
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    os.waitpid(pid, os.WUNTRACED)
+    job.pid = pid
+    job.launched = time.monotonic()
+
+
+def _spawn(job, nice=None, cpus=None):
+    """Fork and exec `job` in its own process group with the given niceness and CPU set."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, 0)
+            if nice is not None:
+                try:
+                    os.setpriority(os.PRIO_PROCESS, 0, nice)
+                except PermissionError:
+                    print(f"[Scheduling] Warning: not permitted to set nice {nice}; "
+                          f"running at {os.getpriority(os.PRIO_PROCESS, 0)}", file=sys.stderr)
+            if cpus is not None:
+                os.sched_setaffinity(0, cpus)
+            os.execvp(job.argv[0], job.argv)
+        except OSError as e:
+            print(f"[Scheduling] Error: {job.argv[0]}: {e.strerror}", file=sys.stderr)
+        os._exit(127)
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    job.pid = pid
+    job.launched = job.first_run = time.monotonic()
+    job.slices = 1
+
+
+def _record_exit(job, status, rusage):
+    job.finished = time.monotonic()
+    job.cpu_time = rusage.ru_utime + rusage.ru_stime
+    job.returncode = os.waitstatus_to_exitcode(status)
+
+
+def _run_slice(job, quantum):
+    """Let `job` run for up to `quantum` seconds; returns True if it exited."""
+    deadline = time.monotonic() + quantum
+    pidfd = None
+    if hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(job.pid)
+        except OSError:
+            pidfd = None
+    try:
+        while True:
+            pid, status, rusage = os.wait4(job.pid, os.WNOHANG)
+            if pid:
+                _record_exit(job, status, rusage)
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if pidfd is not None:
+                select.select([pidfd], [], [], remaining)
+            else:
+                time.sleep(min(POLL_INTERVAL, remaining))
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+def _pause(job):
+    """SIGSTOP the job's group; returns True if it exited before it could be stopped."""
+    try:
+        os.killpg(job.pid, signal.SIGSTOP)
+    except ProcessLookupError:
+        pass
+    pid, status, rusage = os.wait4(job.pid, os.WUNTRACED)
+    if os.WIFSTOPPED(status):
+        return False
+    _record_exit(job, status, rusage)
+    return True
+
+
+def _kill_all(jobs):
+    for job in jobs:
+        if job.pid and job.finished is None:
+            try:
+                os.killpg(job.pid, signal.SIGKILL)
+                os.killpg(job.pid, signal.SIGCONT)
+            except ProcessLookupError:
+                pass
+            pid, status, rusage = os.wait4(job.pid, 0)
+            _record_exit(job, status, rusage)
+
+
+def round_robin(commands, quantum, verbose=True):
+    """Time-slice `commands` with SIGSTOP/SIGCONT until all exit; returns per-job metrics."""
+    jobs = [Job(command) for command in commands if command.strip()]
+    ready = deque()
+    try:
+        for job in jobs:
+            _spawn_stopped(job)
+            ready.append(job)
+            if verbose:
+                print(f"[Scheduling] Launched {job.pid} (stopped): {job.command}")
+
+        while ready:
+            job = ready.popleft()
+            if job.first_run is None:
+                job.first_run = time.monotonic()
+            job.slices += 1
+            started = time.monotonic()
+            os.killpg(job.pid, signal.SIGCONT)
+            # A job alone in the queue keeps the CPU instead of being paused and resumed.
+            exited = _run_slice(job, quantum)
+            while not exited and not ready:
+                exited = _run_slice(job, quantum)
+            if not exited:
+                exited = _pause(job)
+            job.running += time.monotonic() - started
+            if exited:
+                if verbose:
+                    print(f"[Scheduling] Process {job.pid} completed (exit {job.returncode}, "
+                          f"{job.slices} slice(s), {job.cpu_time:.3f}s CPU).")
+            else:
+                if verbose:
+                    print(f"[Scheduling] Paused process {job.pid} after its quantum: {job.command}")
+                ready.append(job)
+    finally:
+        _kill_all(jobs)
+    return [job.metrics() for job in jobs]
+
+
+class PriorityJobQueue:
+    def __init__(self, slots=None, aging=0.0, spread=False, verbose=True):
+        self.slots = max(1, slots or os.cpu_count() or 1)
+        self.aging = aging
+        self.verbose = verbose
+        self.base_nice = os.getpriority(os.PRIO_PROCESS, 0)
+        self.cpus = None
+        if spread and hasattr(os, "sched_getaffinity"):
+            self.cpus = sorted(os.sched_getaffinity(0))
+        self.waiting = []     # Heap of (aged key, sequence, job).
+        self.running = {}     # pid -> job
+        self.jobs = []
+        self._sequence = itertools.count()
+
+    def submit(self, command, priority=0):
+        """Queue `command`; a lower `priority` is more urgent and also becomes its nice value."""
+        job = Job(command, priority)
+        # Effective priority at time t is priority - aging * (t - submitted); the
+        # `- aging * t` term is shared by every waiting job, so it drops out of the order.
+        heapq.heappush(self.waiting, (priority + self.aging * job.submitted, next(self._sequence), job))
+        self.jobs.append(job)
+        return job
+
+    def _free_cpu(self):
+        busy = {job.cpu for job in self.running.values()}
+        for cpu in self.cpus:
+            if cpu not in busy:
+                return cpu
+        return None
+
+    def _admit(self):
+        while self.waiting and len(self.running) < self.slots:
+            _, _, job = heapq.heappop(self.waiting)
+            if self.cpus:
+                job.cpu = self._free_cpu()
+            nice = job.priority
+            if self.aging:
+                aged = round(job.priority - self.aging * (time.monotonic() - job.submitted))
+                nice = max(aged, min(job.priority, self.base_nice))
+            job.nice = nice = max(NICE_MIN, min(NICE_MAX, nice))
+            _spawn(job, nice, None if job.cpu is None else {job.cpu})
+            self.running[job.pid] = job
+            if self.verbose:
+                pinned = "" if job.cpu is None else f" on CPU {job.cpu}"
+                print(f"[Scheduling] Started {job.pid} (priority {job.priority}, nice {nice}{pinned}): {job.command}")
+
+    def _reap(self):
+        """Reap every finished job; returns how many were reaped."""
+        reaped = 0
+        for pid in list(self.running):
+            done, status, rusage = os.wait4(pid, os.WNOHANG)
+            if done:
+                job = self.running.pop(pid)
+                _record_exit(job, status, rusage)
+                job.running = job.finished - job.launched
+                reaped += 1
+                if self.verbose:
+                    print(f"[Scheduling] Process {pid} completed (exit {job.returncode}, {job.cpu_time:.3f}s CPU).")
+        return reaped
+
+    def _wait_any(self):
+        """Block until at least one running job exits."""
+        if hasattr(os, "pidfd_open"):
+            fds = []
+            try:
+                for pid in self.running:
+                    fds.append(os.pidfd_open(pid))
+                select.select(fds, [], [])
+            except OSError:
+                pass
+            finally:
+                for fd in fds:
+                    os.close(fd)
+        while not self._reap():
+            time.sleep(POLL_INTERVAL)
+
+    def run(self):
+        """Run every submitted job to completion; returns per-job metrics in submission order."""
+        try:
+            self._admit()
+            while self.running:
+                self._wait_any()
+                self._admit()
+        finally:
+            _kill_all(self.running.values())
+            self.running.clear()
+        return [job.metrics() for job in self.jobs if job.finished is not None]
+
+
+def priority_schedule(entries, slots=None, aging=0.0, spread=False, verbose=True):
+    """Run (priority, command) pairs through a PriorityJobQueue; returns per-job metrics."""
+    jobs = PriorityJobQueue(slots, aging, spread, verbose)
+    for priority, command in entries:
+        jobs.submit(command, priority)
+    return jobs.run()
+
+
+def print_job_table(rows):
+    if not rows:
+        return
+    print(f"{'PID':>7} {'Prio':>5} {'Exit':>5} {'Slices':>6} {'CPU':>8} {'Response':>9} {'Wait':>8} {'Turnaround':>11}  Command")
+    for row in rows:
+        print(f"{row['pid']:>7} {row['priority']:>5} {row['returncode']:>5} {row['slices']:>6} {row['cpu']:>8.3f} "
+              f"{row['response']:>9.3f} {row['wait']:>8.3f} {row['turnaround']:>11.3f}  {row['command']}")
+    count = len(rows)
+    print(f"Average wait: {sum(r['wait'] for r in rows) / count:.3f}s, "
+          f"average turnaround: {sum(r['turnaround'] for r in rows) / count:.3f}s")
@@ -4,10 +4,18 @@ import sys
 import shlex
 import subprocess
 import getpass
+import argparse
 import time
 import threading
 import queue
-import hashlib
+
+import auth
+import job_scheduler
+import pipeline
+import permissions
+from permissions import PermissionEngine
+from async_sync import async_producer_consumer, process_producer_consumer, run_benchmark as sync_benchmark, print_benchmark
+from utils.history import History, setup_readline, history_command
 
 # ==============================
 # Process Scheduling Module
@@ -16,30 +24,52 @@ class ProcessScheduling:
     @staticmethod
     def round_robin_scheduler(commands, quantum):
         print(f"[Scheduling] Running Round-Robin Scheduling (quantum = {quantum} seconds)")
-        processes = []
-        for cmd in commands:
-            print(f"[Scheduling] Executing: {cmd}")
-            try:
-                proc = subprocess.Popen(shlex.split(cmd))
-                processes.append(proc)
-                time.sleep(quantum)
-                proc.terminate()
-                print(f"[Scheduling] Terminated process: {cmd}")
-            except Exception as e:
-                print(f"[Scheduling] Error: {e}")
-        for proc in processes:
-            proc.wait()
-            print(f"[Scheduling] Process {proc.pid} completed.")
+        try:
+            rows = job_scheduler.round_robin(commands, quantum)
+        except (OSError, ValueError) as e:
+            print(f"[Scheduling] Error: {e}")
+            return 1
+        job_scheduler.print_job_table(rows)
+        return 0 if all(row["returncode"] == 0 for row in rows) else 1
 
     @staticmethod
     def priority_scheduler(command, priority):
-        print(f"[Scheduling] Running Priority Scheduling (priority = {priority})")
+        return ProcessScheduling.priority_queue_scheduler([(priority, command)])
+
+    @staticmethod
+    def priority_queue_scheduler(entries, slots=None, aging=0.0, spread=False):
+        print(f"[Scheduling] Running Priority Scheduling ({len(entries)} job(s), aging = {aging}/s)")
         try:
-            proc = subprocess.Popen(shlex.split(command))
-            proc.wait()
-            print(f"[Scheduling] Completed execution: {command}")
-        except Exception as e:
+            rows = job_scheduler.priority_schedule(entries, slots, aging, spread)
+        except (OSError, ValueError) as e:
             print(f"[Scheduling] Error: {e}")
+            return 1
+        job_scheduler.print_job_table(rows)
+        return 0 if all(row["returncode"] == 0 for row in rows) else 1
+
+def parse_priority_jobs(args):
+    """Parse `[-j N] [--aging R] [--spread] <priority> <cmd> ; <priority> <cmd> ; ...`."""
+    options = {"slots": None, "aging": 0.0, "spread": False}
+    words = args.split()
+    # A leading "-5" is a (negative) priority, not an option.
+    while words and words[0].startswith("-") and not words[0][1:].isdigit():
+        flag = words.pop(0)
+        if flag == "--spread":
+            options["spread"] = True
+        elif flag == "-j" and words:
+            options["slots"] = int(words.pop(0))
+        elif flag == "--aging" and words:
+            options["aging"] = float(words.pop(0))
+        else:
+            raise ValueError(f"unknown option {flag}")
+    entries = []
+    for segment in " ".join(words).split(';'):
+        if segment.strip():
+            priority, _, command = segment.strip().partition(" ")
+            if not command.strip():
+                raise ValueError(f"missing command after priority {priority}")
+            entries.append((int(priority), command.strip()))
+    return entries, options
 
 # ==============================
 # Memory Management Module (Improved)
@@ -92,30 +122,25 @@ def simulate_memory():
 # ==============================
 def simulate_sync():
     print("[Sync] Running Producer-Consumer simulation.")
+    # queue.Queue already locks internally and blocks put() while full and
+    # get() while empty, so it needs no extra Condition or polling.
     buffer = queue.Queue(maxsize=3)
-    condition = threading.Condition()
 
     def producer():
         for i in range(5):
-            with condition:
-                while buffer.full():
-                    print("[Sync] Buffer full, producer waiting...")
-                    condition.wait()
-                item = f"Item{i}"
-                buffer.put(item)
-                print(f" Producer: Produced {item}")
-                condition.notify()
+            item = f"Item{i}"
+            if buffer.full():
+                print("[Sync] Buffer full, producer waiting...")
+            buffer.put(item)
+            print(f" Producer: Produced {item}")
             time.sleep(0.5)
 
     def consumer():
         for _ in range(5):
-            with condition:
-                while buffer.empty():
-                    print("[Sync] Buffer empty, consumer waiting...")
-                    condition.wait()
-                item = buffer.get()
-                print(f" Consumer: Consumed {item}")
-                condition.notify()
+            if buffer.empty():
+                print("[Sync] Buffer empty, consumer waiting...")
+            item = buffer.get()
+            print(f" Consumer: Consumed {item}")
             time.sleep(0.7)
 
     t_prod = threading.Thread(target=producer)
@@ -126,116 +151,347 @@ def simulate_sync():
     t_cons.join()
     print("[Sync] Simulation completed.")
 
+def simulate_sync_async(producers=1, consumers=1, items=5):
+    print(f"[Sync] Running asyncio Producer-Consumer ({producers} producers, {consumers} consumers).")
+    report = async_producer_consumer(producers, consumers, items, maxsize=3, verbose=items <= 50)
+    print(f"[Sync] Consumed {report['items']} items in {report['elapsed']:.3f}s.")
+
+def simulate_sync_procs(producers=1, consumers=1, items=5):
+    print(f"[Sync] Running process-based Producer-Consumer ({producers} producers, {consumers} consumers) over shared memory.")
+    report = process_producer_consumer(producers, consumers, items, maxsize=3, verbose=items <= 50)
+    print(f"[Sync] Consumed {report['items']} items in {report['elapsed']:.3f}s.")
+
 # ==============================
 # Security: User Authentication and File Permissions
 # ==============================
-# Simulated user database with hashed passwords for extra refinement.
-USERS = {
-    "admin": {"password": hashlib.sha256("adminpass".encode()).hexdigest(), "role": "admin"},
-    "user": {"password": hashlib.sha256("userpass".encode()).hexdigest(), "role": "standard"}
-}
+# Users and their salted scrypt hashes live in users.json (see auth.py);
+# INTEGRATED_SHELL_USERS points at another JSON or SQLite store.
 
-FILE_PERMISSIONS = {
-    "system.txt": {"read": ["admin", "standard"], "write": ["admin"], "execute": []},
-    "user.txt": {"read": ["admin", "standard"], "write": ["admin", "standard"], "execute": []},
-}
+# File permission rules live in permissions.json (see permissions.py) and are
+# reloaded when the file changes; INTEGRATED_SHELL_POLICY points at another file.
+permission_engine = PermissionEngine(os.environ.get("INTEGRATED_SHELL_POLICY", permissions.DEFAULT_POLICY_FILE))
 
 current_user = None
+history = History(os.path.expanduser("~/.integrated_shell_history"))  # Used by the interactive shell only.
+last_pipestatus = []  # Exit status of each stage of the last pipeline, like bash's PIPESTATUS.
+
+# Credentials for non-interactive runs (scripts, -c, CI), so no terminal is needed to log in.
+USER_ENV = "INTEGRATED_SHELL_USER"
+PASSWORD_ENV = "INTEGRATED_SHELL_PASSWORD"
+TOKEN_ENV = "INTEGRATED_SHELL_TOKEN"          # Session token from --issue-token; skips the password KDF.
+USERS_ENV = "INTEGRATED_SHELL_USERS"          # User store file.
+KDF_ENV = "INTEGRATED_SHELL_KDF"              # scrypt or pbkdf2_sha256, for new and upgraded hashes.
+KDF_COST_ENV = "INTEGRATED_SHELL_KDF_COST"    # scrypt N or PBKDF2 iterations.
 
-def authenticate():
+def kdf_settings():
+    """The KDF and cost for new and upgraded hashes, from the environment; exits on invalid values."""
+    kdf = os.environ.get(KDF_ENV, auth.DEFAULT_KDF)
+    if kdf not in ("scrypt", "pbkdf2_sha256"):
+        print(f"Invalid {KDF_ENV} {kdf!r}: use scrypt or pbkdf2_sha256.", file=sys.stderr)
+        sys.exit(1)
+    cost = os.environ.get(KDF_COST_ENV)
+    if not cost:
+        return kdf, None
+    try:
+        cost = int(cost)
+    except ValueError:
+        cost = 0
+    # scrypt's N must be a power of two greater than 1.
+    if cost < 1 or (kdf == "scrypt" and (cost < 2 or cost & (cost - 1))):
+        wanted = "a power of two greater than 1" if kdf == "scrypt" else "a positive integer"
+        print(f"Invalid {KDF_COST_ENV} {os.environ[KDF_COST_ENV]!r}: {kdf} needs {wanted}.", file=sys.stderr)
+        sys.exit(1)
+    return kdf, cost
+
+def authenticate(interactive=True, prompt=None):
+    """Log in from a session token, the credential variables or a prompt; returns the user's record.
+
+    `prompt` (by default the same as `interactive`) allows asking on the
+    terminal; outside the interactive shell the questions go to stderr, so
+    stdout only carries the command's result.
+    """
     global current_user
-    print("Welcome to the Secure Integrated Shell")
-    username = input("Username: ")
-    password = getpass.getpass("Password: ")
-    hashed = hashlib.sha256(password.encode()).hexdigest()
-    if username in USERS and USERS[username]["password"] == hashed:
-        current_user = {"username": username, "role": USERS[username]["role"]}
-        print(f"Login successful. Role: {current_user['role']}\n")
-    else:
-        print("Authentication failed.")
+    store = auth.open_user_store(os.environ.get(USERS_ENV))
+    token = os.environ.get(TOKEN_ENV)
+    if token:
+        session = auth.SessionCache().check(token, store)
+        if session is not None:
+            username, user = session
+            current_user = {"username": username, "role": user["role"]}
+            return user
+        print("Session token invalid or expired; logging in with a password.", file=sys.stderr)
+    username = os.environ.get(USER_ENV)
+    password = os.environ.get(PASSWORD_ENV)
+    if username is None or password is None:
+        if not (interactive if prompt is None else prompt):
+            print(f"Authentication failed: set {USER_ENV} and {PASSWORD_ENV} (or {TOKEN_ENV}) to run non-interactively.", file=sys.stderr)
+            sys.exit(1)
+        out = sys.stdout if interactive else sys.stderr
+        print("Welcome to the Secure Integrated Shell", file=out)
+        print("Username: ", end="", file=out, flush=True)
+        username = input()
+        password = getpass.getpass("Password: ")
+    kdf, cost = kdf_settings()
+    user = auth.login(store, username, password, kdf, cost)
+    if user is None:
+        print("Authentication failed.", file=sys.stderr)
         sys.exit(1)
+    current_user = {"username": username, "role": user["role"]}
+    if interactive:
+        print(f"Login successful. Role: {current_user['role']}\n")
+    return user
 
 def check_permission(operation, filename):
-    if filename in FILE_PERMISSIONS:
-        allowed = FILE_PERMISSIONS[filename].get(operation, [])
-        return current_user["role"] in allowed
-    return True
+    return permission_engine.check(current_user["username"], current_user["role"], operation, filename)
+
+def authorize(argv):
+    """Check every path argument of `argv`; prints a message and returns False if one is denied."""
+    denied = permissions.first_denied(permission_engine, current_user["username"], current_user["role"], argv)
+    if denied is None:
+        return True
+    operation, filename = denied
+    print(f"Permission denied: You do not have {operation} access to '{filename}'.")
+    return False
+
+def authorize_commands(commands):
+    """authorize() each command string of a scheduling request."""
+    return all(authorize(shlex.split(command)) for command in commands)
+
+# ==============================
+# Command Lists (;, && and ||)
+# ==============================
+# These commands use ';' between their own jobs, so they take the rest of the line.
+LINE_COMMANDS = ("schedule_rr", "schedule_priority")
+# Shell commands offered by tab completion, besides programs on PATH.
+BUILTIN_COMMANDS = LINE_COMMANDS + ("simulate_memory", "simulate_sync", "simulate_sync_async",
+                                    "simulate_sync_procs", "bench_sync",
+                                    "pipestatus", "history", "exit")
+
+class ExitShell(Exception):
+    def __init__(self, status=0):
+        super().__init__(status)
+        self.status = status
+
+def split_command_list(line):
+    """Split `line` on ;, && and || outside quotes; returns (operator, command text) pairs.
+
+    The operator is the one before each command (';' for the first). Single
+    '|' pipes are left inside the command text for execute_command.
+    """
+    commands = []
+    operator = ";"
+    start = 0
+    quote = None
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if quote:
+            if char == "\\" and quote == '"':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char == "\\":
+            i += 1
+        elif char in "'\"":
+            quote = char
+        elif char == ";" or line.startswith("&&", i) or line.startswith("||", i):
+            text = line[start:i].strip()
+            if text.split(None, 1)[0:1] and text.split(None, 1)[0] in LINE_COMMANDS:
+                break
+            token = ";" if char == ";" else line[i:i + 2]
+            if not text:
+                raise ValueError(f"syntax error near unexpected token '{token}'")
+            commands.append((operator, text))
+            operator = token
+            i += len(token)
+            start = i
+            continue
+        i += 1
+    if quote:
+        raise ValueError("syntax error: unterminated quote")
+    text = line[start:].strip()
+    if text:
+        commands.append((operator, text))
+    elif operator != ";":
+        raise ValueError(f"syntax error: expected a command after '{operator}'")
+    return commands
+
+def run_command_line(line):
+    """Run every command of `line`, honouring && and ||; returns the last exit status."""
+    try:
+        commands = split_command_list(line)
+    except ValueError as e:
+        print(f"[Error] {e}")
+        return 2
+    status = 0
+    for operator, command in commands:
+        if (operator == "&&" and status != 0) or (operator == "||" and status == 0):
+            continue
+        status = execute_command(command)
+    return status
 
 # ==============================
 # Command Execution (Enhanced with Piping and Custom Commands)
 # ==============================
 def execute_command(command):
-    # Check for piping
+    """Run one command (possibly a pipeline); returns its exit status."""
+    # Check for piping ('|' inside quotes is not a pipe)
     if "|" in command:
-        execute_piped_commands(command)
-        return
+        try:
+            stages = pipeline.split_pipeline(command)
+        except ValueError as e:
+            print(f"[Error] {e}")
+            return 2
+        if len(stages) > 1:
+            if not all(authorize(stage) for stage in stages):
+                return 1
+            return execute_piped_commands(stages)
 
     print(f"[Execution] Received command: {command}")
     if command.startswith("schedule_rr"):
         parts = command.split()
         if len(parts) < 3:
             print("[Error] Invalid format. Usage: schedule_rr <quantum> <command1> ; <command2> ; ...")
-            return
+            return 2
         try:
             quantum = float(parts[1])
-            commands = [cmd.strip() for cmd in " ".join(parts[2:]).split(';') if cmd.strip()]
-            ProcessScheduling.round_robin_scheduler(commands, quantum)
         except ValueError:
             print("[Error] Invalid quantum value.")
+            return 2
+        commands = [cmd.strip() for cmd in " ".join(parts[2:]).split(';') if cmd.strip()]
+        if not authorize_commands(commands):
+            return 1
+        return ProcessScheduling.round_robin_scheduler(commands, quantum)
+    elif command.startswith("schedule_priority"):
+        try:
+            entries, options = parse_priority_jobs(command[len("schedule_priority"):])
+        except ValueError as e:
+            print(f"[Error] {e}. Usage: schedule_priority [-j N] [--aging R] [--spread] <priority> <command1> ; <priority> <command2> ; ...")
+            return 2
+        if not entries:
+            print("[Error] Usage: schedule_priority [-j N] [--aging R] [--spread] <priority> <command1> ; <priority> <command2> ; ...")
+            return 2
+        if not authorize_commands(command for _, command in entries):
+            return 1
+        return ProcessScheduling.priority_queue_scheduler(entries, **options)
+    elif command.split()[0] == "history":
+        return history_command(history, command.split()[1:])
+    elif command == "pipestatus":
+        print(" ".join(str(status) for status in last_pipestatus))
     elif command == "simulate_memory":
         simulate_memory()
     elif command == "simulate_sync":
         simulate_sync()
+    elif command.startswith(("simulate_sync_async", "simulate_sync_procs", "bench_sync")):
+        parts = command.split()
+        try:
+            counts = [int(value) for value in parts[1:4]]
+        except ValueError:
+            print(f"[Error] Usage: {parts[0]} [producers] [consumers] [items]")
+            return 2
+        try:
+            if parts[0] == "simulate_sync_async":
+                simulate_sync_async(*counts)
+            elif parts[0] == "simulate_sync_procs":
+                simulate_sync_procs(*counts)
+            else:
+                print_benchmark(sync_benchmark(*counts))
+        except ValueError as e:
+            print(f"[Error] {e}. Usage: {parts[0]} [producers] [consumers] [items]")
+            return 2
     else:
-        # Check for file-modifying commands and enforce permissions.
         tokens = shlex.split(command)
-        if tokens and tokens[0] in ["rm", "touch", "mkdir", "rmdir"]:
-            if len(tokens) > 1:
-                filename = tokens[1]
-                if not check_permission("write", filename):
-                    print(f"Permission denied: You do not have write access to '{filename}'.")
-                    return
+        if tokens[0] == "exit":
+            try:
+                raise ExitShell(int(tokens[1]) & 0xFF if len(tokens) > 1 else 0)
+            except ValueError:
+                print(f"exit: {tokens[1]}: numeric argument required")
+                raise ExitShell(2)
+        # Enforce file permissions on every path argument.
+        if not authorize(tokens):
+            return 1
         print(f"[Execution] Running: {command}")
-        subprocess.run(shlex.split(command))
-
-def execute_piped_commands(command_line):
-    commands = [cmd.strip() for cmd in command_line.split('|')]
-    if not commands:
-        return
-    prev_process = None
-    processes = []
-    for idx, cmd in enumerate(commands):
-        tokens = shlex.split(cmd)
-        if not tokens:
-            continue
-        if idx == 0:
-            proc = subprocess.Popen(tokens, stdout=subprocess.PIPE)
-        elif idx == len(commands) - 1:
-            proc = subprocess.Popen(tokens, stdin=prev_process.stdout)
-        else:
-            proc = subprocess.Popen(tokens, stdin=prev_process.stdout, stdout=subprocess.PIPE)
-        processes.append(proc)
-        prev_process = proc
-    processes[-1].communicate()
+        try:
+            return subprocess.run(tokens).returncode
+        except FileNotFoundError:
+            print(f"{tokens[0]}: command not found")
+            return 127
+    return 0
+
+def execute_piped_commands(stages):
+    """Run a pipeline (one argv list per stage); returns the last stage's exit status."""
+    global last_pipestatus
+    sys.stdout.flush()
+    last_pipestatus = pipeline.run_pipeline(stages)
+    return last_pipestatus[-1]
 
 # ==============================
 # Main Shell Loop
 # ==============================
-def main():
-    authenticate()
+def interactive_shell():
+    setup_readline(history, BUILTIN_COMMANDS)
+    status = 0
     while True:
         try:
             cmd_input = input(f"{current_user['username']}@integrated-shell> ")
             if not cmd_input.strip():
                 continue
-            if cmd_input.strip() == "exit":
-                print("Exiting integrated shell.")
-                break
-            execute_command(cmd_input)
+            history.add(cmd_input)
+            status = run_command_line(cmd_input)
+        except ExitShell as e:
+            print("Exiting integrated shell.")
+            return e.status
+        except EOFError:
+            print()
+            return status
         except KeyboardInterrupt:
             print("\nUse 'exit' to quit.")
         except Exception as e:
             print(f"Error: {e}")
+            status = 1
+
+def run_script(lines):
+    """Run commands from an iterable of lines without prompts; returns the last exit status."""
+    status = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            status = run_command_line(line)
+        except ExitShell as e:
+            return e.status
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            status = 1
+    return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Secure integrated shell.")
+    parser.add_argument("-c", dest="command", help="run COMMAND and exit")
+    parser.add_argument("script", nargs="?", help="file of commands to run instead of prompting")
+    parser.add_argument("--issue-token", action="store_true",
+                        help=f"log in, print a session token for {TOKEN_ENV} and exit")
+    args = parser.parse_args(argv)
+
+    interactive = args.command is None and args.script is None and sys.stdin.isatty() and not args.issue_token
+    # --issue-token still asks for a password on a terminal; the token is then the only thing on stdout.
+    user = authenticate(interactive, prompt=sys.stdin.isatty() if args.issue_token else None)
+    if args.issue_token:
+        print(auth.SessionCache().issue(current_user["username"], user))
+        return 0
+    if args.command is not None:
+        return run_script(args.command.splitlines())
+    if args.script is not None:
+        try:
+            with open(args.script) as script:
+                return run_script(script)
+        except OSError as e:
+            print(f"main.py: {args.script}: {e.strerror}", file=sys.stderr)
+            return 127
+    if not interactive:
+        return run_script(sys.stdin)
+    return interactive_shell()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -3,7 +3,7 @@
 # This script creates a Python virtual environment, installs dependencies,
 # and then demonstrates the fully integrated shell functionalities:
 # - Piping: chaining commands (e.g., ls | grep txt).
-# - User Authentication: logging in as admin and as a standard user.
+# - User Authentication: logging in as admin and as a standard user (non-interactively).
 # - File Permissions: restricting file modifications based on user roles.
 # - Process Scheduling, Memory Management, and Process Synchronization simulations.
 
@@ -27,61 +27,29 @@ fi
 # Ensure current directory is in PYTHONPATH.
 export PYTHONPATH=$(pwd)
 
-# Check if 'expect' is installed.
-if ! command -v expect &> /dev/null; then
-    echo "Expect tool is not installed. Please install it (e.g., sudo apt-get install expect) and re-run the script."
-    deactivate
-    exit 1
-fi
-
 SHELL_CMD="python3 main.py"
 
+# The shell logs in from INTEGRATED_SHELL_USER / INTEGRATED_SHELL_PASSWORD and
+# reads commands from stdin without prompts, so no terminal (or expect) is needed.
 echo "=== Admin User Demonstration ==="
-expect <<EOF
-log_user 1
-spawn $SHELL_CMD
-expect "Username: "
-send "admin\r"
-expect "Password: "
-send "adminpass\r"
-expect "admin@shell> "
-send "ls | grep txt\r"
-expect "admin@shell> "
-send "touch system.txt\r"
-expect "admin@shell> "
-send "schedule_rr 1 ls ; pwd\r"
-expect "admin@shell> "
-send "simulate_memory\r"
-expect "admin@shell> "
-send "simulate_sync\r"
-expect "admin@shell> "
-send "exit\r"
-expect eof
+INTEGRATED_SHELL_USER=admin INTEGRATED_SHELL_PASSWORD=adminpass $SHELL_CMD <<EOF
+ls | grep txt
+touch system.txt
+schedule_rr 1 ls ; pwd
+simulate_memory
+simulate_sync
+exit
 EOF
 
 echo "Admin demonstration completed."
 echo "-----------------------------------------"
 
 echo "=== Standard User Demonstration ==="
-expect <<EOF
-log_user 1
-spawn $SHELL_CMD
-expect "Username: "
-send "user\r"
-expect "Password: "
-send "userpass\r"
-expect "user@shell> "
-send "ls | grep txt\r"
-expect "user@shell> "
-send "touch system.txt\r"
-expect {
-    "Permission denied" { send_user "\nPermission restriction verified for standard user.\n" }
-    timeout { send_user "\nPermission check failed.\n" }
-}
-expect "user@shell> "
-send "exit\r"
-expect eof
-EOF
+if INTEGRATED_SHELL_USER=user INTEGRATED_SHELL_PASSWORD=userpass $SHELL_CMD -c "ls | grep txt; touch system.txt"; then
+    echo "Permission check failed."
+else
+    echo "Permission restriction verified for standard user."
+fi
 
 echo "Standard user demonstration completed."
 
@@ -0,0 +1,314 @@
+"""
+File permission policy for the integrated shell.
+
+The policy is a JSON file (permissions.json by default):
+
+    {
+      "default": "allow",
+      "groups": {"ops": ["alice", "bob"]},
+      "rules": [
+        {"path": "system.txt", "read": ["admin", "standard"], "write": ["admin"], "execute": []},
+        {"path": "logs/", "write": ["user:alice", "group:ops"]},
+        {"path": "logs/**/*.gz", "write": []},
+        {"path": "/etc", "write": ["admin"]}
+      ]
+    }
+
+- A rule's path is relative to the policy file's directory unless it is
+  absolute. Checked paths have their symlinks resolved first, so a rule
+  protects a file under any name that leads to it. Components may use glob patterns (*, ?, [...]), and `**`
+  matches any number of directories.
+- A rule covers the path and everything below it, so a rule on a directory
+  is inherited by its contents.
+- Each operation (read, write, execute) lists who may perform it: a bare
+  name is a role, and `user:NAME`, `group:NAME` and `*` are also accepted.
+  An empty list allows no one.
+- For each operation, the most specific rule that mentions it decides:
+  the rule that matches more literal (non-glob) path components wins, then
+  the one with more glob components; `**` counts for nothing, so `a/**`
+  is less specific than `a/b/**/c`. Operations no rule mentions fall back
+  to "default".
+
+Rules are compiled into a trie keyed by path component; literal components
+are dict lookups and only glob components are matched with fnmatch.
+Decisions are cached per (user, role, operation, path) in an LRU cache.
+The policy file is re-read when its mtime changes, checked at most once
+per `reload_interval` seconds.
+"""
+
+import os
+import json
+import time
+import shlex
+import shutil
+import fnmatch
+import functools
+
+DEFAULT_POLICY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "permissions.json")
+OPERATIONS = ("read", "write", "execute")
+RELOAD_INTERVAL = 1.0   # Seconds between mtime checks of the policy file.
+CACHE_SIZE = 65536      # Decisions kept in the LRU cache.
+
+# How commands use their arguments, for required_access(). cp and mv write only their last argument.
+READ_COMMANDS = {"cat", "less", "more", "head", "tail", "wc", "sort", "uniq", "grep", "ls", "file", "stat", "cut", "diff", "sed"}
+WRITE_COMMANDS = {"rm", "touch", "mkdir", "rmdir", "chmod", "chown", "truncate", "tee"}
+COPY_COMMANDS = {"cp": "read", "mv": "write", "ln": "read"}
+PATH_FREE_COMMANDS = {"echo", "printf", "true", "false", "sleep", "date", "pwd", "whoami", "id", "uname", "seq", "kill", "ps"}
+# Interpreters run code the policy cannot see, so they also need execute access to the program itself.
+INTERPRETERS = {"sh", "bash", "dash", "zsh", "python", "python3", "perl", "ruby", "node", "env", "xargs"}
+# Short options that take a value, per command; PATH_OPTIONS names the ones whose value is a file.
+OPTION_VALUES = {"head": "nc", "tail": "nc", "cut": "bcdf", "uniq": "fs", "sort": "kotS", "grep": "efmABCD", "sed": "ef", "truncate": "sr"}
+PATH_OPTIONS = {("grep", "f"): "read", ("sed", "f"): "read", ("sort", "o"): "write", ("truncate", "r"): "read"}
+# Commands whose first operand is a pattern or script rather than a path, unless one was given with -e or -f.
+SCRIPT_COMMANDS = {"grep", "sed"}
+
+class PolicyError(Exception):
+    pass
+
+
+class _Node:
+    __slots__ = ("children", "globs", "recursive", "star", "acl")
+
+    def __init__(self, star=False):
+        self.children = {}      # literal component -> _Node
+        self.globs = []         # (pattern, _Node), matched with fnmatch
+        self.recursive = None   # _Node reached through `**`
+        self.star = star        # True for a `**` node, which can absorb any number of components.
+        self.acl = {}           # operation -> frozenset of principals
+
+    def child(self, component):
+        if component == "**":
+            if self.recursive is None:
+                self.recursive = _Node(star=True)
+            return self.recursive
+        if any(char in component for char in "*?["):
+            for pattern, node in self.globs:
+                if pattern == component:
+                    return node
+            node = _Node()
+            self.globs.append((component, node))
+            return node
+        return self.children.setdefault(component, _Node())
+
+
+def _split(path):
+    return [part for part in path.split(os.sep) if part]
+
+
+class Policy:
+    """A compiled policy: a trie of ACLs plus the default decision."""
+
+    def __init__(self, rules=(), default="allow", groups=None, root="/"):
+        if default not in ("allow", "deny"):
+            raise PolicyError(f"default must be allow or deny, not {default!r}")
+        self.default = default == "allow"
+        self.groups = {name: frozenset(members) for name, members in (groups or {}).items()}
+        self.root = _Node()
+        self.rule_count = 0
+        for rule in rules:
+            self.add_rule(rule, root)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            data = json.load(file)
+        return cls(data.get("rules", []), data.get("default", "allow"), data.get("groups"),
+                   os.path.dirname(os.path.realpath(path)))
+
+    def add_rule(self, rule, root="/"):
+        try:
+            path = rule["path"]
+        except (KeyError, TypeError):
+            raise PolicyError(f"rule without a path: {rule!r}")
+        node = self.root
+        for component in _split(os.path.join(root, path)):
+            node = node.child(component)
+        for operation in OPERATIONS:
+            if operation in rule:
+                node.acl[operation] = frozenset(rule[operation])
+        self.rule_count += 1
+
+    def _principals(self, username, role):
+        principals = {"*", role, f"user:{username}", f"role:{role}"}
+        principals.update(f"group:{name}" for name, members in self.groups.items() if username in members)
+        return principals
+
+    def _best_acl(self, components, operation):
+        """Most specific ACL for `operation` on the path; returns None if no rule mentions it."""
+        best, best_rank = None, None
+        # Each state is (node, rank): the literal and glob components matched so far.
+        states = [(self.root, (0, 0))]
+        for depth in range(len(components) + 1):
+            for node, rank in states:
+                acl = node.acl.get(operation)
+                if acl is not None and (best_rank is None or rank > best_rank):
+                    best, best_rank = acl, rank
+            if depth == len(components):
+                break
+            component = components[depth]
+            next_states = []
+            for node, (literals, globs) in states:
+                # `**` may match no component, so what follows it is tried here too.
+                for candidate in (node, node.recursive):
+                    if candidate is None:
+                        continue
+                    child = candidate.children.get(component)
+                    if child is not None:
+                        next_states.append((child, (literals + 1, globs)))
+                    for pattern, child in candidate.globs:
+                        if fnmatch.fnmatchcase(component, pattern):
+                            next_states.append((child, (literals, globs + 1)))
+                if node.recursive is not None:
+                    next_states.append((node.recursive, (literals, globs)))
+                if node.star:
+                    next_states.append((node, (literals, globs)))
+            states = next_states
+            if not states:
+                break
+        return best
+
+    def allowed(self, username, role, operation, path):
+        acl = self._best_acl(_split(path), operation)
+        if acl is None:
+            return self.default
+        return not acl.isdisjoint(self._principals(username, role))
+
+
+class PermissionEngine:
+    """Answers permission checks from a policy file, reloading it when it changes."""
+
+    def __init__(self, path=DEFAULT_POLICY_FILE, reload_interval=RELOAD_INTERVAL, cache_size=CACHE_SIZE):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.cache_size = cache_size
+        self.policy = Policy()
+        self.mtime = None
+        self.checked = None
+        self._decide = functools.lru_cache(maxsize=cache_size)(self.policy.allowed)
+        self.reload()
+
+    def reload(self):
+        """Re-read the policy if its file changed; a broken file keeps the previous policy."""
+        self.checked = time.monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self.mtime:
+            return False
+        try:
+            policy = Policy.load(self.path) if mtime is not None else Policy()
+        except (OSError, ValueError, PolicyError) as e:
+            print(f"[Security] Keeping the previous policy; cannot load {self.path}: {e}")
+            self.mtime = mtime
+            return False
+        self.policy = policy
+        self.mtime = mtime
+        self._decide = functools.lru_cache(maxsize=self.cache_size)(policy.allowed)
+        return True
+
+    def check(self, username, role, operation, path):
+        if time.monotonic() - self.checked >= self.reload_interval:
+            self.reload()
+        # Resolve symlinks, so a link cannot reach a file under another name. A path
+        # that does not exist yet is resolved through its existing parent directories.
+        return self._decide(username, role, operation, os.path.realpath(path))
+
+
+def _parse_arguments(command, args):
+    """Split `args` into (single-letter flags, [(option, value)], operands) using OPTION_VALUES."""
+    takes_value = OPTION_VALUES.get(command, "")
+    flags, values, operands = set(), [], []
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if arg == "--":
+            operands.extend(args[index:])
+            break
+        if not arg.startswith("-") or arg == "-":
+            operands.append(arg)
+            continue
+        if arg.startswith("--"):
+            if "=" in arg:
+                values.append((arg[2:arg.index("=")], arg[arg.index("=") + 1:]))
+            continue
+        for position, flag in enumerate(arg[1:], 1):
+            flags.add(flag)
+            if flag in takes_value:
+                value = arg[position + 1:]
+                if not value and index < len(args):
+                    value = args[index]
+                    index += 1
+                values.append((flag, value))
+                break
+            if command == "sed" and flag == "i":
+                break  # -i takes an optional backup suffix in the same argument.
+    return flags, values, operands
+
+
+def _words(code):
+    """The words of a shell command string, without its operators (;, |, >, ...)."""
+    lexer = shlex.shlex(code, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        return [word for word in lexer if not set(word) <= set(lexer.punctuation_chars)]
+    except ValueError:
+        return code.split()
+
+
+def required_access(argv):
+    """(operation, path) pairs a command needs, for every path-like argument.
+
+    Known commands are checked only on the arguments that are paths (grep's
+    pattern, for instance, is not). Arguments of any other command might be
+    read or written, so each one needs both, and interpreters also need
+    execute access to the program they run.
+    """
+    if not argv:
+        return []
+    command = os.path.basename(argv[0])
+    if command in PATH_FREE_COMMANDS:
+        return []
+    flags, values, operands = _parse_arguments(command, argv[1:])
+    needs = []
+    if os.sep in argv[0]:
+        needs.append(("execute", argv[0]))
+    elif command in INTERPRETERS:
+        needs.append(("execute", shutil.which(argv[0]) or argv[0]))
+    if command in OPTION_VALUES:
+        needs.extend((PATH_OPTIONS[command, flag], value) for flag, value in values if (command, flag) in PATH_OPTIONS)
+        if command in SCRIPT_COMMANDS and not flags & {"e", "f"}:
+            operands = operands[1:]
+    if command in WRITE_COMMANDS:
+        needs.extend(("write", operand) for operand in operands)
+    elif command in COPY_COMMANDS and operands:
+        needs.extend((COPY_COMMANDS[command], operand) for operand in operands[:-1])
+        if command == "mv":
+            needs.extend(("read", operand) for operand in operands[:-1])
+        needs.append(("write", operands[-1]))
+    elif command == "sed" and "i" in flags:
+        needs.extend((operation, operand) for operand in operands for operation in ("read", "write"))
+    elif command in READ_COMMANDS:
+        needs.extend(("read", operand) for operand in operands)
+    elif command == "dd":
+        for operand in operands:
+            key, _, path = operand.partition("=")
+            if key in ("if", "of") and path:
+                needs.append(("read" if key == "if" else "write", path))
+    else:
+        # An unknown command: every operand, and the value of every NAME=VALUE or --option=VALUE, may be a path.
+        # An operand with spaces may be shell code (sh -c '... > file'), so each of its words is checked too.
+        paths = []
+        for argument in [operand.partition("=")[2] or operand for operand in operands] + [value for _, value in values]:
+            paths.extend(_words(argument) if any(char.isspace() for char in argument) else [argument])
+        needs.extend((operation, path) for path in paths if path for operation in ("read", "write"))
+    return needs
+
+
+def first_denied(engine, username, role, argv):
+    """The first (operation, path) the user may not perform for `argv`, or None."""
+    for operation, path in required_access(argv):
+        if not engine.check(username, role, operation, path):
+            return operation, path
+    return None
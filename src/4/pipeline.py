@@ -0,0 +1,232 @@
+"""
+Pipeline engine for the integrated shell.
+
+`ls | grep txt | wc -l` runs as a chain of stages connected by os.pipe():
+
+- The line is split on '|' outside quotes, so `grep "a|b" file | wc` is two
+  stages, not three.
+- External programs are started with subprocess.Popen on the pipe fds.
+  The parent closes its copy of every pipe end as soon as the stage that
+  owns it has started, so a reader sees EOF when its writer exits, and a
+  writer gets SIGPIPE when its reader exits early (e.g. `cat big | head`).
+- The builtins cat, echo and ls run as threads inside the shell and write
+  straight to their pipe fd. cat moves data with os.sendfile (file to pipe)
+  or os.splice (pipe to pipe), so the bytes never pass through Python.
+  Each builtin thread closes its own fds when it finishes.
+- Every stage is waited for, and run_pipeline returns one exit status per
+  stage, like bash's PIPESTATUS. The pipeline's status is the last one.
+  A stage killed by a signal reports 128 + the signal number, and a missing
+  program reports 127.
+"""
+
+import os
+import sys
+import errno
+import shlex
+import signal
+import threading
+import subprocess
+
+CHUNK_SIZE = 1 << 20  # Bytes per sendfile/splice/read call.
+UNSUPPORTED = (errno.EINVAL, errno.ESPIPE, errno.ENOSYS, errno.EOPNOTSUPP)
+
+
+class Stage:
+    def __init__(self, argv):
+        self.argv = argv
+        self.process = None     # subprocess.Popen for external programs.
+        self.thread = None      # threading.Thread for builtins.
+        self.status = None
+
+
+def split_pipeline(command_line):
+    """Split `command_line` on '|' outside quotes; returns one argv list per stage."""
+    lexer = shlex.shlex(command_line, posix=True, punctuation_chars="|")
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    stages = [[]]
+    for token in lexer:
+        if token == "|":
+            if not stages[-1]:
+                raise ValueError("syntax error near unexpected token '|'")
+            stages.append([])
+        elif set(token) == {"|"}:
+            raise ValueError(f"syntax error near unexpected token '{token}'")
+        else:
+            stages[-1].append(token)
+    if not stages[-1]:
+        raise ValueError("syntax error: missing command after '|'")
+    return stages
+
+
+def _exit_status(returncode):
+    return 128 - returncode if returncode < 0 else returncode
+
+# --------------------------------------------
+# Builtins (run as threads writing to a pipe fd)
+# --------------------------------------------
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _copy_fd(in_fd, out_fd):
+    """Copy in_fd to out_fd until EOF, in the kernel where possible."""
+    # sendfile needs a file it can mmap as the source; splice needs a pipe on one side.
+    for name in ("sendfile", "splice"):
+        call = getattr(os, name, None)
+        if call is None:
+            continue
+        try:
+            if name == "sendfile":
+                offset = os.lseek(in_fd, 0, os.SEEK_CUR)
+                while True:
+                    sent = os.sendfile(out_fd, in_fd, offset, CHUNK_SIZE)
+                    if sent == 0:
+                        return
+                    offset += sent
+            else:
+                while call(in_fd, out_fd, CHUNK_SIZE):
+                    pass
+                return
+        except OSError as e:
+            # EINVAL/ESPIPE: this pair of fds is not supported; try the next method.
+            # Nothing was copied yet in that case, because the call fails up front.
+            if isinstance(e, BrokenPipeError) or e.errno not in UNSUPPORTED:
+                raise
+    while True:
+        data = os.read(in_fd, CHUNK_SIZE)
+        if not data:
+            return
+        _write_all(out_fd, data)
+
+
+def builtin_cat(args, in_fd, out_fd):
+    status = 0
+    for name in args or ["-"]:
+        if name == "-":
+            _copy_fd(in_fd, out_fd)
+            continue
+        try:
+            fd = os.open(name, os.O_RDONLY)
+        except OSError as e:
+            print(f"cat: {name}: {e.strerror}", file=sys.stderr)
+            status = 1
+            continue
+        try:
+            _copy_fd(fd, out_fd)
+        except IsADirectoryError:
+            print(f"cat: {name}: Is a directory", file=sys.stderr)
+            status = 1
+        finally:
+            os.close(fd)
+    return status
+
+
+def builtin_echo(args, in_fd, out_fd):
+    _write_all(out_fd, (" ".join(args) + "\n").encode())
+    return 0
+
+
+def builtin_ls(args, in_fd, out_fd):
+    status = 0
+    targets = args or ["."]
+    lines = []
+    for target in targets:
+        try:
+            with os.scandir(target) as entries:
+                names = sorted(entry.name for entry in entries if not entry.name.startswith("."))
+        except NotADirectoryError:
+            names = [target]
+        except OSError as e:
+            print(f"ls: {target}: {e.strerror}", file=sys.stderr)
+            status = 2
+            continue
+        if len(targets) > 1 and names != [target]:
+            lines.append(f"{target}:")
+        lines.extend(names)
+    if lines:
+        _write_all(out_fd, ("\n".join(lines) + "\n").encode())
+    return status
+
+
+BUILTINS = {
+    "cat": builtin_cat,
+    "echo": builtin_echo,
+    "ls": builtin_ls,
+}
+
+
+def _run_builtin(stage, in_fd, out_fd, owned):
+    try:
+        stage.status = BUILTINS[stage.argv[0]](stage.argv[1:], in_fd, out_fd)
+    except BrokenPipeError:
+        # The reader went away, which is how `cat big | head` normally ends.
+        stage.status = 128 + signal.SIGPIPE
+    except OSError as e:
+        print(f"{stage.argv[0]}: {e.strerror}", file=sys.stderr)
+        stage.status = 1
+    finally:
+        for fd in owned:
+            os.close(fd)
+
+# --------------------------------------------
+# Running a pipeline
+# --------------------------------------------
+def run_pipeline(stages, stdin=0, stdout=1):
+    """Run a list of argv lists as one pipeline; returns the list of per-stage exit statuses."""
+    stages = [Stage(argv) for argv in stages]
+    in_fd = stdin
+    try:
+        for index, stage in enumerate(stages):
+            last = index == len(stages) - 1
+            if last:
+                read_end, out_fd = None, stdout
+            else:
+                read_end, out_fd = os.pipe()
+            # Pipe ends created here (not the caller's stdin/stdout) must be closed exactly once.
+            owned = [fd for fd in (in_fd, out_fd) if fd not in (stdin, stdout)]
+            try:
+                if stage.argv[0] in BUILTINS:
+                    stage.thread = threading.Thread(target=_run_builtin, args=(stage, in_fd, out_fd, owned), daemon=True)
+                    stage.thread.start()
+                else:
+                    try:
+                        stage.process = subprocess.Popen(stage.argv, stdin=in_fd, stdout=out_fd)
+                    except FileNotFoundError:
+                        print(f"{stage.argv[0]}: command not found", file=sys.stderr)
+                        stage.status = 127
+                    except PermissionError:
+                        print(f"{stage.argv[0]}: permission denied", file=sys.stderr)
+                        stage.status = 126
+                    except OSError as e:
+                        # e.g. ENOEXEC for a file that is not a valid executable.
+                        print(f"{stage.argv[0]}: {e.strerror}", file=sys.stderr)
+                        stage.status = 126
+                    # The child holds its own copies now.
+                    for fd in owned:
+                        os.close(fd)
+            except BaseException:
+                # The stage never started, so nothing else will close its pipe ends.
+                for fd in owned + ([read_end] if read_end is not None else []):
+                    os.close(fd)
+                in_fd = None
+                raise
+            in_fd = read_end
+    except BaseException:
+        if in_fd not in (None, stdin):
+            os.close(in_fd)
+        _wait_all(stages)
+        raise
+    return _wait_all(stages)
+
+
+def _wait_all(stages):
+    for stage in stages:
+        if stage.thread is not None:
+            stage.thread.join()
+        elif stage.process is not None:
+            stage.status = _exit_status(stage.process.wait())
+    return [stage.status for stage in stages]
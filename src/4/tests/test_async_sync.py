@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_sync import async_producer_consumer, thread_producer_consumer, process_producer_consumer
+
+def test_producer_consumer():
+    """Test that every implementation delivers each item exactly once."""
+    print("Testing producer-consumer implementations...")
+
+    for run in (async_producer_consumer, thread_producer_consumer, process_producer_consumer):
+        for producers, consumers, items in ((1, 1, 50), (3, 2, 1000), (2, 3, 1)):
+            report = run(producers, consumers, items, maxsize=3)
+            assert report["items"] == items, f"{report['mode']}: consumed {report['items']} of {items}"
+        try:
+            run(1, 0, 10)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{run.__name__} accepted zero consumers")
+
+    print("Producer-consumer implementations passed all tests!")
+
+def main():
+    """Run all tests."""
+    print("Starting tests for producer-consumer...")
+    test_producer_consumer()
+    print("All tests completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import auth
+
+# Low costs keep the tests fast; the checks do not depend on them.
+KDF, COST = "pbkdf2_sha256", 1000
+
+def test_password_hashing():
+    """Test hashing, verification and rehashing on a raised cost."""
+    print("Testing password hashing...")
+
+    for kdf, cost in ((KDF, COST), ("scrypt", 2 ** 4)):
+        record = auth.hash_password("secret", kdf, cost)
+        assert auth.verify_password("secret", record), f"{kdf} round trip failed"
+        assert not auth.verify_password("Secret", record), f"{kdf} accepted a wrong password"
+        assert not auth.needs_rehash(record, kdf, cost), f"{kdf} rehash at the same cost"
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = auth.open_user_store(os.path.join(directory, "users.json"))
+        auth.add_user(store, "alice", "standard", "secret", KDF, COST)
+        assert auth.login(store, "alice", "secret", KDF, COST)["iterations"] == COST
+        user = auth.login(store, "alice", "secret", KDF, 2 * COST)
+        assert user["iterations"] == 2 * COST, "login did not rehash on a raised cost"
+        assert store.get("alice")["iterations"] == 2 * COST, "rehash was not stored"
+        assert auth.login(store, "alice", "wrong", KDF, COST) is None
+        assert auth.login(store, "nobody", "secret", KDF, COST) is None
+
+    print("Password hashing passed all tests!")
+
+def test_sessions():
+    """Test session tokens and their invalidation by a password change."""
+    print("Testing sessions...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = auth.open_user_store(os.path.join(directory, "users.db"))
+        sessions = auth.SessionCache(os.path.join(directory, "cache", "sessions.json"))
+        auth.add_user(store, "alice", "admin", "secret", KDF, COST)
+        token = sessions.issue("alice", store.get("alice"))
+        username, user = sessions.check(token, store)
+        assert username == "alice" and user["role"] == "admin", "token not accepted"
+        assert sessions.check(token + "x", store) is None, "forged token accepted"
+
+        auth.add_user(store, "alice", "admin", "changed", KDF, COST)
+        assert sessions.check(token, store) is None, "token survived a password change"
+
+        expired = auth.SessionCache(sessions.path, ttl=-1)
+        assert sessions.check(expired.issue("alice", store.get("alice")), store) is None, "expired token accepted"
+
+    print("Sessions passed all tests!")
+
+def test_default_store_read_only():
+    """Test that the default user store is never rewritten."""
+    print("Testing the default user store...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "users.json")
+        with open(path, "w") as file:
+            json.dump({"alice": dict(auth.hash_password("secret", KDF, COST), role="standard")}, file)
+        before = open(path).read()
+        default, auth.DEFAULT_USERS_FILE = auth.DEFAULT_USERS_FILE, path
+        try:
+            store = auth.open_user_store()
+        finally:
+            auth.DEFAULT_USERS_FILE = default
+        assert not store.writable, "default store opened writable"
+        assert auth.login(store, "alice", "secret", KDF, 2 * COST) is not None, "read-only store refused a login"
+        assert open(path).read() == before, "login rewrote the default store"
+        try:
+            auth.add_user(store, "bob", "standard", "secret", KDF, COST)
+        except PermissionError:
+            pass
+        else:
+            raise AssertionError("read-only store accepted a new user")
+
+    print("Default user store passed all tests!")
+
+def test_invalid_kdf_cost():
+    """Test that a malformed KDF cost is reported instead of crashing."""
+    print("Testing KDF cost validation...")
+
+    shell = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    for cost in ("abc", "0", "100"):
+        env = dict(os.environ, INTEGRATED_SHELL_USER="admin", INTEGRATED_SHELL_PASSWORD="adminpass",
+                   INTEGRATED_SHELL_KDF="scrypt", INTEGRATED_SHELL_KDF_COST=cost)
+        process = subprocess.run([sys.executable, shell, "-c", "echo ok"], env=env, text=True,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        assert process.returncode == 1, f"cost {cost!r} was accepted"
+        assert "Invalid INTEGRATED_SHELL_KDF_COST" in process.stderr and "Traceback" not in process.stderr
+
+    print("KDF cost validation passed all tests!")
+
+def main():
+    """Run all tests."""
+    print("Starting tests for auth...")
+    test_password_hashing()
+    test_sessions()
+    test_default_store_read_only()
+    test_invalid_kdf_cost()
+    print("All tests completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_scheduler import PriorityJobQueue
+from main import parse_priority_jobs
+
+def test_priority_aging():
+    """Test how aging affects the order and niceness of queued jobs."""
+    print("Testing priority aging...")
+
+    # A job submitted earlier overtakes a more urgent one submitted later
+    for aging, first in ((0.0, "urgent"), (100.0, "early")):
+        queue = PriorityJobQueue(slots=1, aging=aging, verbose=False)
+        early = queue.submit("true", priority=10)
+        time.sleep(0.1)
+        urgent = queue.submit("true", priority=5)
+        queue.run()
+        expected, other = (early, urgent) if first == "early" else (urgent, early)
+        assert expected.first_run < other.first_run, f"aging={aging}: {first} job did not run first"
+
+    # Jobs submitted together keep their order, but the one that waited starts with a lower nice value
+    queue = PriorityJobQueue(slots=1, aging=10.0, verbose=False)
+    base = queue.base_nice
+    running = queue.submit("sleep 0.3", priority=base + 5)
+    waiting = queue.submit("true", priority=base + 5)
+    queue.run()
+    assert running.first_run < waiting.first_run, "jobs submitted together were reordered"
+    assert running.nice == base + 5, "a job admitted at once was aged"
+    assert base <= waiting.nice < base + 5, "waiting did not lower the job's nice value"
+
+    print("Priority aging passed all tests!")
+
+def test_parse_priority_jobs():
+    """Test parsing of schedule_priority arguments, including negative priorities."""
+    print("Testing schedule_priority parsing...")
+
+    entries, options = parse_priority_jobs(" -j 2 --aging 0.5 -5 echo hi ; 3 echo there")
+    assert entries == [(-5, "echo hi"), (3, "echo there")], f"wrong jobs {entries}"
+    assert options == {"slots": 2, "aging": 0.5, "spread": False}, f"wrong options {options}"
+    assert parse_priority_jobs("-5 true")[0] == [(-5, "true")], "leading negative priority taken as an option"
+    try:
+        parse_priority_jobs("--bogus 5 true")
+    except ValueError as e:
+        assert "unknown option" in str(e)
+    else:
+        raise AssertionError("unknown option accepted")
+
+    print("schedule_priority parsing passed all tests!")
+
+def main():
+    """Run all tests."""
+    print("Starting tests for the job scheduler...")
+    test_priority_aging()
+    test_parse_priority_jobs()
+    print("All tests completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from permissions import Policy, PermissionEngine, required_access
+
+def test_rule_specificity():
+    """Test which rule decides when several match a path."""
+    print("Testing rule specificity...")
+
+    # `**` matches directories but adds nothing to a rule's rank
+    policy = Policy([
+        {"path": "a/**", "read": ["user:x"]},
+        {"path": "a/b/**/c", "read": ["user:y"]},
+    ], default="deny", root="/r")
+    assert not policy.allowed("x", "standard", "read", "/r/a/b/k/l/c/d"), "a/** outranked a/b/**/c"
+    assert policy.allowed("y", "standard", "read", "/r/a/b/k/l/c/d"), "a/b/**/c not applied"
+    assert policy.allowed("x", "standard", "read", "/r/a/b/k/l"), "a/** not applied"
+
+    # A literal component beats a glob, and a deeper rule beats its parent
+    policy = Policy([
+        {"path": "logs", "write": ["admin"]},
+        {"path": "logs/*.gz", "write": []},
+        {"path": "logs/today.gz", "write": ["user:x"]},
+    ], root="/r")
+    assert policy.allowed("x", "standard", "write", "/r/logs/today.gz"), "literal rule not preferred"
+    assert not policy.allowed("x", "admin", "write", "/r/logs/old.gz"), "glob rule not preferred over parent"
+    assert policy.allowed("x", "admin", "write", "/r/logs/app.log"), "parent rule not inherited"
+    assert policy.allowed("x", "standard", "write", "/r/other"), "default not applied"
+
+    print("Rule specificity passed all tests!")
+
+def test_required_access():
+    """Test which arguments of a command are checked, and for what."""
+    print("Testing required access...")
+
+    # Patterns, scripts and option values of known commands are not paths
+    assert required_access(["grep", "-n", "-m", "5", "system.txt", "user.txt"]) == [("read", "user.txt")]
+    assert required_access(["sed", "s/a/b/", "in.txt"]) == [("read", "in.txt")]
+    assert required_access(["head", "-n", "5", "in.txt"]) == [("read", "in.txt")]
+    assert required_access(["echo", "system.txt"]) == []
+
+    # Files that are written are checked for write
+    assert ("write", "out.txt") in required_access(["tee", "-a", "out.txt"])
+    assert required_access(["dd", "if=in.txt", "of=out.txt", "bs=1M"]) == [("read", "in.txt"), ("write", "out.txt")]
+    assert ("write", "in.txt") in required_access(["sed", "-i.bak", "s/a/b/", "in.txt"])
+    assert ("write", "out.txt") in required_access(["sort", "-o", "out.txt", "in.txt"])
+
+    # Every argument of an unknown command, including words of inline shell code, needs read and write
+    needs = required_access(["sh", "-c", "echo hi > system.txt"])
+    assert needs[0][0] == "execute", "interpreter not checked for execute"
+    assert ("write", "system.txt") in needs, "redirection in inline code not checked"
+    assert ("write", "x.txt") in required_access(["mytool", "--out=x.txt"])
+
+    print("Required access passed all tests!")
+
+def test_symlinks():
+    """Test that a symlink does not get around a rule."""
+    print("Testing symlinks...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        policy_file = os.path.join(directory, "permissions.json")
+        with open(policy_file, "w") as file:
+            json.dump({"rules": [{"path": "system.txt", "write": ["admin"]},
+                                 {"path": "locked", "write": ["admin"]}]}, file)
+        open(os.path.join(directory, "system.txt"), "w").close()
+        os.mkdir(os.path.join(directory, "locked"))
+        os.symlink("system.txt", os.path.join(directory, "link"))
+        os.symlink("locked", os.path.join(directory, "door"))
+        engine = PermissionEngine(policy_file)
+
+        assert not engine.check("u", "standard", "write", os.path.join(directory, "link")), "symlink to a file bypassed a rule"
+        assert not engine.check("u", "standard", "write", os.path.join(directory, "door", "new.txt")), "new file behind a symlinked directory bypassed a rule"
+        assert engine.check("u", "admin", "write", os.path.join(directory, "link")), "symlink denied to an allowed role"
+        assert engine.check("u", "standard", "write", os.path.join(directory, "other.txt")), "default not applied"
+
+    print("Symlinks passed all tests!")
+
+def main():
+    """Run all tests."""
+    print("Starting tests for permissions...")
+    test_rule_specificity()
+    test_required_access()
+    test_symlinks()
+    print("All tests completed successfully!")
+
+if __name__ == "__main__":
+    main()
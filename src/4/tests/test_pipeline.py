@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import split_pipeline, run_pipeline
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+
+def _run(stages):
+    """Run a pipeline with its output in a temporary file; returns (statuses, output)."""
+    with open(os.devnull) as stdin, tempfile.TemporaryFile() as output:
+        statuses = run_pipeline(stages, stdin=stdin.fileno(), stdout=output.fileno())
+        output.seek(0)
+        return statuses, output.read().decode()
+
+def test_split_pipeline():
+    """Test splitting a command line into stages."""
+    print("Testing split_pipeline...")
+
+    assert split_pipeline("ls | grep txt") == [["ls"], ["grep", "txt"]]
+    assert split_pipeline("echo 'a|b' | cat") == [["echo", "a|b"], ["cat"]], "quoted | split the pipeline"
+    for line in ("| cat", "ls |", "ls || cat"):
+        try:
+            split_pipeline(line)
+        except ValueError:
+            continue
+        raise AssertionError(f"{line!r} was accepted")
+
+    print("split_pipeline passed all tests!")
+
+def test_run_pipeline():
+    """Test per-stage exit statuses and that no file descriptors leak."""
+    print("Testing run_pipeline...")
+
+    statuses, output = _run([["echo", "a|b"], ["cat"]])
+    assert statuses == [0, 0] and output == "a|b\n", "pipeline output wrong"
+
+    # `yes` is killed by SIGPIPE once `head` exits: 128 + 13
+    statuses, output = _run([["yes"], ["head", "-1"]])
+    assert statuses == [141, 0] and output == "y\n", f"wrong statuses {statuses}"
+
+    statuses, _ = _run([["echo", "x"], ["no-such-command-here"]])
+    assert statuses[1] == 127, "missing command not reported as 127"
+
+    # A file that exists but cannot be executed (ENOEXEC) gets 126, and its pipe ends are closed
+    with tempfile.TemporaryDirectory() as directory:
+        bad = os.path.join(directory, "bad")
+        with open(bad, "wb") as file:
+            file.write(b"\x00\x01not an executable")
+        os.chmod(bad, 0o755)
+        before = _open_fds()
+        for _ in range(5):
+            statuses, _ = _run([[bad], ["cat"]])
+            assert statuses[0] == 126, f"bad executable got {statuses[0]}"
+        assert _open_fds() == before, "pipe file descriptors leaked"
+
+    print("run_pipeline passed all tests!")
+
+def main():
+    """Run all tests."""
+    print("Starting tests for pipeline...")
+    test_split_pipeline()
+    test_run_pipeline()
+    print("All tests completed successfully!")
+
+if __name__ == "__main__":
+    main()